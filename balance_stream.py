@@ -0,0 +1,308 @@
+"""
+Balance Stream - In-memory wallet balances kept current by accountSubscribe
+SOL from the wallet account, tokens from each watched ATA; periodic RPC reconciliation
+WalletManager reads these synchronously and only falls back to RPC when they are stale
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, Optional
+
+import websockets
+from solders.pubkey import Pubkey
+
+logger = logging.getLogger(__name__)
+
+ZERO_BALANCE_PRUNE_SECONDS = 120  # Stop watching an emptied ATA after this
+
+
+class BalanceStream:
+    """accountSubscribe on our wallet + ATAs, feeding an in-memory balance cache"""
+
+    def __init__(self, wallet_manager, ws_url: str = None):
+        from config import WS_ENDPOINT
+
+        self.wallet = wallet_manager
+        self.client = wallet_manager.client
+        self.ws_url = ws_url or WS_ENDPOINT
+
+        self._ws = None
+        self._task = None
+        self._reconcile_task = None
+        self._next_id = 1
+
+        # SOL balance of the wallet
+        self.sol_lamports: Optional[int] = None
+        self.sol_verified_at = 0.0
+
+        # mint -> {'account', 'raw', 'decimals', 'verified_at', 'zero_since'}
+        self.tokens: Dict[str, dict] = {}
+
+        self._requests: Dict[int, str] = {}       # request id -> key ('sol' or mint)
+        self._subscriptions: Dict[int, str] = {}  # subscription id -> key
+
+        self.stats = {
+            'notifications': 0,
+            'reconciles': 0,
+            'drift_corrections': 0,
+            'reconnects': 0,
+            'cache_hits': 0,
+            'cache_misses': 0,
+        }
+
+    # ===== READS (sync, no RPC) =====
+
+    def _fresh(self, verified_at: float) -> bool:
+        from config import BALANCE_MAX_STALENESS
+
+        return self._ws is not None and time.time() - verified_at <= BALANCE_MAX_STALENESS
+
+    def sol_balance(self) -> Optional[float]:
+        """Streamed SOL balance, or None if stale / not yet known"""
+        if self.sol_lamports is None or not self._fresh(self.sol_verified_at):
+            self.stats['cache_misses'] += 1
+            return None
+        self.stats['cache_hits'] += 1
+        return self.sol_lamports / 1e9
+
+    def token_balance(self, mint: str) -> Optional[float]:
+        """Streamed UI token balance for a watched mint, or None if stale / not watched"""
+        entry = self.tokens.get(mint)
+        if entry is None or entry['raw'] is None or not self._fresh(entry['verified_at']):
+            self.stats['cache_misses'] += 1
+            return None
+        self.stats['cache_hits'] += 1
+        return entry['raw'] / (10 ** entry['decimals'])
+
+    def staleness(self, mint: str = None) -> Optional[float]:
+        """Seconds since the balance was last confirmed (None if never, inf if disconnected)"""
+        verified_at = self.tokens[mint]['verified_at'] if mint in self.tokens else (
+            None if mint else self.sol_verified_at or None
+        )
+        if not verified_at:
+            return None
+        if self._ws is None:
+            return float('inf')
+        return time.time() - verified_at
+
+    # ===== WRITES =====
+
+    def _set_sol(self, lamports: int):
+        self.sol_lamports = int(lamports)
+        self.sol_verified_at = time.time()
+
+    def _set_token(self, mint: str, raw: int, decimals: int = None):
+        entry = self.tokens.get(mint)
+        if entry is None:
+            return
+        entry['raw'] = int(raw)
+        if decimals is not None:
+            entry['decimals'] = int(decimals)
+        entry['verified_at'] = time.time()
+        if raw:
+            entry['zero_since'] = None
+        elif entry['zero_since'] is None:
+            entry['zero_since'] = time.time()
+
+    async def watch_mint(self, mint: str, account: Pubkey = None, decimals: int = 6):
+        """Start streaming the token balance for mint (ATA resolved if not given)"""
+        if mint in self.tokens:
+            return
+        if account is None:
+            # Token index hit is free; unindexed mints resolve in one batched read
+            account, _ = await asyncio.to_thread(self.wallet._get_token_account_for_mint, mint)
+            decimals = self.wallet.token_index.get(mint, {}).get('decimals', decimals)
+        self.tokens[mint] = {
+            'account': account,
+            'raw': None,
+            'decimals': decimals,
+            'verified_at': 0.0,
+            'zero_since': None,
+        }
+        await self._subscribe(mint)
+
+    def unwatch_mint(self, mint: str):
+        self.tokens.pop(mint, None)
+        for sub_id, key in list(self._subscriptions.items()):
+            if key == mint:
+                del self._subscriptions[sub_id]
+                asyncio.create_task(self._send("accountUnsubscribe", [sub_id]))
+
+    # ===== WEBSOCKET =====
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            self._reconcile_task = asyncio.create_task(self._reconcile_loop())
+
+    async def _send(self, method: str, params: list) -> Optional[int]:
+        if self._ws is None:
+            return None
+        request_id = self._next_id
+        self._next_id += 1
+        try:
+            await self._ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": method,
+                "params": params
+            }))
+            return request_id
+        except Exception as e:
+            logger.debug(f"{method} send failed: {e}")
+            return None
+
+    async def _subscribe(self, key: str):
+        account = self.wallet.pubkey if key == 'sol' else self.tokens[key]['account']
+        request_id = await self._send(
+            "accountSubscribe",
+            [str(account), {"encoding": "jsonParsed", "commitment": "processed"}]
+        )
+        if request_id is not None:
+            self._requests[request_id] = key
+
+    async def _run(self):
+        while True:
+            try:
+                async with websockets.connect(
+                    self.ws_url,
+                    ping_interval=20,
+                    ping_timeout=10,
+                    close_timeout=5
+                ) as websocket:
+                    self._ws = websocket
+                    self._requests.clear()
+                    self._subscriptions.clear()
+                    logger.info("👛 Balance stream connected")
+
+                    await self._subscribe('sol')
+                    for mint in list(self.tokens):
+                        await self._subscribe(mint)
+                    # Seed / re-verify everything missed while disconnected
+                    asyncio.create_task(self.reconcile())
+
+                    async for message in websocket:
+                        self._handle(json.loads(message))
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Balance stream error: {e}")
+
+            self._ws = None
+            self.stats['reconnects'] += 1
+            await asyncio.sleep(2)
+
+    def _handle(self, message: dict):
+        request_id = message.get('id')
+        if request_id is not None and request_id in self._requests:
+            key = self._requests.pop(request_id)
+            if 'result' in message:
+                self._subscriptions[message['result']] = key
+            else:
+                logger.debug(f"accountSubscribe rejected for {key}: {message.get('error')}")
+            return
+
+        if message.get('method') != 'accountNotification':
+            return
+
+        params = message.get('params', {})
+        key = self._subscriptions.get(params.get('subscription'))
+        if key is None:
+            return
+        self.stats['notifications'] += 1
+        value = params.get('result', {}).get('value')
+
+        if key == 'sol':
+            self._set_sol(value.get('lamports', 0) if value else 0)
+            return
+
+        # Closed ATA arrives as null
+        if not value:
+            self._set_token(key, 0)
+            return
+        data = value.get('data')
+        if isinstance(data, dict) and 'parsed' in data:
+            amount = data['parsed'].get('info', {}).get('tokenAmount', {})
+            self._set_token(key, int(amount.get('amount', 0)), amount.get('decimals'))
+
+    # ===== RECONCILIATION =====
+
+    def _fetch_balances(self) -> tuple:
+        from solana.rpc.commitment import Processed
+
+        # Same commitment as the stream - a finalized read is ~32 slots behind it
+        sol = self.client.get_balance(self.wallet.pubkey, commitment=Processed).value
+        # Every watched ATA in one getMultipleAccounts (missing ATA = zero)
+        tokens = self.wallet.get_token_balances_raw(list(self.tokens)) if self.tokens else {}
+        return sol, tokens
+
+    async def reconcile(self):
+        """
+        RPC read of every streamed balance - corrects drift and refreshes staleness
+        A balance notified while the read was in flight is newer than the read and is kept
+        """
+        started = time.time()
+        try:
+            sol, tokens = await asyncio.to_thread(self._fetch_balances)
+        except Exception as e:
+            logger.debug(f"Balance reconcile failed: {e}")
+            return
+
+        self.stats['reconciles'] += 1
+        if self.sol_verified_at < started:
+            if self.sol_lamports is not None and self.sol_lamports != sol:
+                self.stats['drift_corrections'] += 1
+                logger.debug(f"👛 SOL drift corrected: {self.sol_lamports} -> {sol} lamports")
+            self._set_sol(sol)
+
+        for mint, (raw, decimals) in tokens.items():
+            entry = self.tokens.get(mint)
+            if entry is None or entry['verified_at'] >= started:
+                continue
+            if entry['raw'] is not None and entry['raw'] != raw:
+                self.stats['drift_corrections'] += 1
+                logger.debug(f"👛 {mint[:8]} drift corrected: {entry['raw']} -> {raw}")
+            self._set_token(mint, raw, decimals)
+
+        # Emptied ATAs (position closed) stop being streamed
+        now = time.time()
+        for mint, entry in list(self.tokens.items()):
+            if entry['zero_since'] and now - entry['zero_since'] > ZERO_BALANCE_PRUNE_SECONDS:
+                self.unwatch_mint(mint)
+
+    async def _reconcile_loop(self):
+        from config import BALANCE_RECONCILE_SECONDS
+
+        while True:
+            await asyncio.sleep(BALANCE_RECONCILE_SECONDS)
+            await self.reconcile()
+
+    def get_stats(self) -> dict:
+        s = self.stats
+        sol_age = self.staleness()
+        reads = s['cache_hits'] + s['cache_misses']
+        return {
+            'connected': self._ws is not None,
+            'watched_mints': len(self.tokens),
+            'sol_age_s': sol_age,
+            'notifications': s['notifications'],
+            'reconciles': s['reconciles'],
+            'drift_corrections': s['drift_corrections'],
+            'reconnects': s['reconnects'],
+            'hit_rate': (s['cache_hits'] / reads) if reads else 0.0,
+        }
+
+    async def stop(self):
+        for task in (self._task, self._reconcile_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._reconcile_task = None
+        self._ws = None
@@ -45,6 +45,28 @@ JITO_ENDPOINTS = [
     "https://tokyo.mainnet.block-engine.jito.wtf/api/v1/transactions",
 ]
 
+# Bundle submission (sendBundle: swap TX + separate tip TX + optional companion TXs)
+JITO_BUNDLES_ENABLED = os.getenv('JITO_BUNDLES_ENABLED', 'false').lower() == 'true'
+# Comma-separated bundle URLs - override to point at a local stand-in block engine for testing
+JITO_BUNDLE_ENDPOINTS = [
+    ep.strip() for ep in os.getenv('JITO_BUNDLE_ENDPOINTS', '').split(',') if ep.strip()
+] or [ep.replace('/transactions', '/bundles') for ep in JITO_ENDPOINTS]
+JITO_BUNDLE_STATUS_TIMEOUT = float(os.getenv('JITO_BUNDLE_STATUS_TIMEOUT', '30'))  # Seconds to poll bundle status
+
+# Landing feedback - tips move along this ladder based on measured land rate per urgency
+LANDING_ADAPTIVE_TIPS = os.getenv('LANDING_ADAPTIVE_TIPS', 'true').lower() == 'true'
+JITO_TIP_LADDER_SOL = [float(t) for t in os.getenv('JITO_TIP_LADDER_SOL', '0.001,0.002,0.003,0.005').split(',') if t.strip()]
+LANDING_TARGET_RATE = float(os.getenv('LANDING_TARGET_RATE', '0.85'))  # Cheapest tip landing at least this often wins
+LANDING_EXPLORE_RATE = float(os.getenv('LANDING_EXPLORE_RATE', '0.1'))  # Share of sends that sample another tip level
+LANDING_DROP_TIMEOUT = float(os.getenv('LANDING_DROP_TIMEOUT', '60'))  # Seconds before an unseen signature counts as dropped
+
+# Persistent block-engine sessions (kept warm with light getTipAccounts calls)
+JITO_KEEPALIVE_INTERVAL = float(os.getenv('JITO_KEEPALIVE_INTERVAL', '15'))  # Seconds between keepalive requests
+
+# Submission mode: 'serial' = Jito then RPC fallback, 'fanout' = all routes concurrently (first accept wins)
+SUBMIT_MODE = os.getenv('SUBMIT_MODE', 'serial').lower()
+JITO_FANOUT_REGIONS = int(os.getenv('JITO_FANOUT_REGIONS', '3'))  # Top-N Jito regions used in fan-out
+
 # Jito tip accounts (pick one randomly per TX to reduce contention)
 JITO_TIP_ACCOUNTS = [
     "96gYZGLnJYVFmbjzopPSU6QiEV5fGqZNyN9nmNhvrZU5",
@@ -57,6 +79,109 @@ JITO_TIP_ACCOUNTS = [
     "3AVi9Tg9Uo68tJfuvoKvqKNWKkC5wPdSSdeBnizKZ6jT",
 ]
 
+# ============================================
+# PUMPPORTAL HEDGING (race local build against PumpPortal)
+# ============================================
+PUMPPORTAL_HEDGE_ENABLED = os.getenv('PUMPPORTAL_HEDGE_ENABLED', 'false').lower() == 'true'
+PUMPPORTAL_HEDGE_BUDGET_MS = int(os.getenv('PUMPPORTAL_HEDGE_BUDGET_MS', '400'))  # Start PumpPortal request after this
+PUMPPORTAL_HEDGE_MAX_WAIT = float(os.getenv('PUMPPORTAL_HEDGE_MAX_WAIT', '5.0'))  # Max hold of signed PumpPortal TX
+
+# ============================================
+# CONFIRMATIONS (signatureSubscribe over WS_ENDPOINT, polling fallback)
+# ============================================
+CONFIRMATION_BUY_TIMEOUT = float(os.getenv('CONFIRMATION_BUY_TIMEOUT', '5.0'))  # Max wait before reading buy fill
+FILL_EVENT_GRACE = float(os.getenv('FILL_EVENT_GRACE', '1.5'))  # Wait for our own TradeEvent after confirmation before getTransaction
+PENDING_FILL_EXIT_WAIT = float(os.getenv('PENDING_FILL_EXIT_WAIT', '3.0'))  # Exit fired before the buy fill is known - wait this long, then size from wallet balance
+
+# ============================================
+# BALANCE STREAM (accountSubscribe on wallet + position ATAs)
+# ============================================
+BALANCE_STREAM_ENABLED = os.getenv('BALANCE_STREAM_ENABLED', 'true').lower() == 'true'
+BALANCE_MAX_STALENESS = float(os.getenv('BALANCE_MAX_STALENESS', '45'))  # Older than this (or disconnected) = read via RPC
+BALANCE_RECONCILE_SECONDS = float(os.getenv('BALANCE_RECONCILE_SECONDS', '15'))  # Periodic RPC check of streamed balances
+
+# ============================================
+# CURVE STORE (TradeEvents + accountSubscribe, batched chain refresh)
+# ============================================
+CURVE_REFRESH_SECONDS = float(os.getenv('CURVE_REFRESH_SECONDS', '0.5'))  # Tick for the getMultipleAccounts refresh of stale curves
+CURVE_NEAR_ENTRY_TTL = float(os.getenv('CURVE_NEAR_ENTRY_TTL', '30'))  # Seconds a curve under evaluation stays in the refresh batch
+CURVE_IDLE_TTL = float(os.getenv('CURVE_IDLE_TTL', '120'))  # Unread entries for unheld / unwatched mints are dropped after this
+
+# ============================================
+# CURVE QUOTES (exact u64 math, fees from Global / FeeConfig)
+# ============================================
+FEE_PARAMS_REFRESH_SECONDS = float(os.getenv('FEE_PARAMS_REFRESH_SECONDS', '300'))  # Re-read Global + FeeConfig fee bps
+
+# ============================================
+# PRE-ARMED EXITS (signed full-exit TX per position, re-signed each blockhash)
+# ============================================
+EXIT_PREARM_ENABLED = os.getenv('EXIT_PREARM_ENABLED', 'true').lower() == 'true'
+EXIT_PREARM_URGENCY = os.getenv('EXIT_PREARM_URGENCY', 'emergency')  # Fee / tip level baked into the armed TX
+EXIT_PREARM_MAX_AGE = float(os.getenv('EXIT_PREARM_MAX_AGE', '20'))  # Older armed TX (blockhash refresh stalled) = build fresh
+
+# Durable nonce mode: armed exits sign once per position against a leased nonce account (/nonce setup)
+EXIT_NONCE_ENABLED = os.getenv('EXIT_NONCE_ENABLED', 'false').lower() == 'true'
+NONCE_POOL_SIZE = int(os.getenv('NONCE_POOL_SIZE', '4'))  # Seed-derived nonce accounts - one per concurrently held position
+
+# ============================================
+# REBROADCAST (same signed bytes to primary RPC + Jito until landed or blockhash expiry)
+# ============================================
+REBROADCAST_ENABLED = os.getenv('REBROADCAST_ENABLED', 'true').lower() == 'true'
+REBROADCAST_INTERVAL = float(os.getenv('REBROADCAST_INTERVAL', '0.4'))  # Status check / resend tick per TX (~1 slot)
+REBROADCAST_ROUTE_INTERVAL = float(os.getenv('REBROADCAST_ROUTE_INTERVAL', '1.0'))  # Min seconds between resends to one route (all TXs)
+REBROADCAST_RATE_LIMIT_PAUSE = float(os.getenv('REBROADCAST_RATE_LIMIT_PAUSE', '30'))  # Route gets no resends this long after a 429
+REBROADCAST_MAX_SECONDS = float(os.getenv('REBROADCAST_MAX_SECONDS', '60'))  # Hard stop (durable-nonce TXs never expire)
+BLOCKHASH_VALID_SLOTS = int(os.getenv('BLOCKHASH_VALID_SLOTS', '150'))  # Blockhash lifetime - resending past this is pointless
+
+# ============================================
+# EXIT RETRY LADDER (resubmit failed / dropped exits with escalation)
+# ============================================
+EXIT_RETRY_MAX_RUNGS = int(os.getenv('EXIT_RETRY_MAX_RUNGS', '4'))  # Resubmits after the first send
+EXIT_RETRY_BUDGET_SECONDS = float(os.getenv('EXIT_RETRY_BUDGET_SECONDS', '90'))  # Total time the ladder may keep resubmitting (covers a blockhash lifetime)
+EXIT_RETRY_FEE_STEP = float(os.getenv('EXIT_RETRY_FEE_STEP', '1.5'))  # Tip + priority fee multiplier per rung (compounds)
+EXIT_RETRY_SLIPPAGE_STEP_BPS = int(os.getenv('EXIT_RETRY_SLIPPAGE_STEP_BPS', '1000'))  # Slippage widening per rung (capped at 99%)
+
+# ============================================
+# ENDPOINT HEALTH (shared scoring for Jito / RPC / PumpPortal)
+# ============================================
+HEALTH_PENALTY_HALF_LIFE = float(os.getenv('HEALTH_PENALTY_HALF_LIFE', '30'))  # Seconds for failure penalty to halve
+HEALTH_BREAKER_FAILURES = int(os.getenv('HEALTH_BREAKER_FAILURES', '3'))  # Consecutive failures before circuit opens
+HEALTH_BREAKER_COOLDOWN = float(os.getenv('HEALTH_BREAKER_COOLDOWN', '5'))  # Base open time (doubles per repeat trip)
+HEALTH_PROBE_INTERVAL = float(os.getenv('HEALTH_PROBE_INTERVAL', '10'))  # Seconds between background RPC probes
+
+# ============================================
+# PRIORITY FEE ORACLE (getRecentPrioritizationFees, micro-lamports per CU)
+# ============================================
+PRIORITY_FEE_SAMPLE_INTERVAL = float(os.getenv('PRIORITY_FEE_SAMPLE_INTERVAL', '2'))  # Seconds between samples
+PRIORITY_FEE_WINDOW_SLOTS = int(os.getenv('PRIORITY_FEE_WINDOW_SLOTS', '150'))  # Rolling window (~60s of slots)
+PRIORITY_FEE_PERCENTILES = {
+    "buy": int(os.getenv('PRIORITY_FEE_PCT_BUY', '75')),
+    "sell": int(os.getenv('PRIORITY_FEE_PCT_SELL', '75')),
+    "emergency": int(os.getenv('PRIORITY_FEE_PCT_EMERGENCY', '95')),
+}
+PRIORITY_FEE_DEFAULT_MICROLAMPORTS = int(os.getenv('PRIORITY_FEE_DEFAULT', '10000000'))  # Used until first sample
+PRIORITY_FEE_MIN_MICROLAMPORTS = int(os.getenv('PRIORITY_FEE_MIN', '100000'))
+PRIORITY_FEE_MAX_MICROLAMPORTS = int(os.getenv('PRIORITY_FEE_MAX', '20000000'))
+PUMPPORTAL_ASSUMED_CU = int(os.getenv('PUMPPORTAL_ASSUMED_CU', '200000'))  # CU budget used to convert to SOL for PumpPortal
+
+# ============================================
+# COMPUTE UNIT PROFILE (measured CU per instruction shape)
+# ============================================
+CU_SAFETY_MARGIN = float(os.getenv('CU_SAFETY_MARGIN', '0.15'))  # Limit = max recent consumption * (1 + margin)
+CU_PROFILE_PATH = os.getenv('CU_PROFILE_PATH', '/data/cu_profile.json')
+
+# ============================================
+# VERSIONED TRANSACTIONS (v0 + bot-owned address lookup table)
+# ============================================
+USE_VERSIONED_TX = os.getenv('USE_VERSIONED_TX', 'true').lower() == 'true'  # Legacy used until a table is loaded
+LOOKUP_TABLE_ADDRESS = os.getenv('LOOKUP_TABLE_ADDRESS', '')  # Overrides the address saved by /alt setup
+LOOKUP_TABLE_PATH = os.getenv('LOOKUP_TABLE_PATH', '/data/lookup_table.json')
+
+# ============================================
+# TOKEN DECIMALS (CreateV2 fast path + batched getMultipleAccounts)
+# ============================================
+DECIMALS_CACHE_PATH = os.getenv('DECIMALS_CACHE_PATH', '/data/token_decimals.json')
+
 # ============================================
 # TRADING PARAMETERS
 # ============================================
@@ -199,7 +324,9 @@ if tp3 and sp3:
 
 SELL_DELAY_SECONDS = int(os.getenv('SELL_DELAY_SECONDS', '0'))
 MAX_POSITION_AGE_SECONDS = int(os.getenv('MAX_HOLD_TIME_SEC', '120'))  # Let winners run to 2 min
-MONITOR_CHECK_INTERVAL = float(os.getenv('MONITOR_CHECK_INTERVAL', '0.5'))
+POSITION_STALE_DATA_SECONDS = float(os.getenv('POSITION_STALE_DATA_SECONDS', '20'))  # No monitor updates this long = data frozen, exit
+POSITION_REPORT_SECONDS = float(os.getenv('POSITION_REPORT_SECONDS', '1.5'))  # Progress log interval per open position
+POSITION_EXIT_RETRY_SECONDS = float(os.getenv('POSITION_EXIT_RETRY_SECONDS', '1.0'))  # Timer exits re-fire this often until the position leaves 'active'
 DATA_FAILURE_TOLERANCE = int(os.getenv('DATA_FAILURE_TOLERANCE', '10'))
 
 # ============================================
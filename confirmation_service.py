@@ -0,0 +1,246 @@
+"""
+Confirmation Service - Push-based TX confirmation via signatureSubscribe
+One websocket multiplexes every subscription; polling only when a subscription fails
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Dict
+
+import websockets
+
+from signature_poller import SignatureStatusPoller
+
+logger = logging.getLogger(__name__)
+
+
+class ConfirmationService:
+    """Awaitable per-signature confirmation at processed / confirmed / finalized"""
+
+    def __init__(self, rpc_client, ws_url: str = None, poller: SignatureStatusPoller = None):
+        from config import WS_ENDPOINT
+
+        self.client = rpc_client
+        self.ws_url = ws_url or WS_ENDPOINT
+        # Shared batched status poller - fallback for signatures without a live subscription
+        self.poller = poller or SignatureStatusPoller(rpc_client)
+
+        self._ws = None
+        self._task = None
+        self._next_id = 1
+
+        # (signature, commitment) -> future resolved with a status dict
+        self._waiters: Dict[tuple, asyncio.Future] = {}
+        self._started_at: Dict[tuple, float] = {}
+        self._refs: Dict[tuple, int] = {}            # key -> callers currently awaiting it
+        self._requests: Dict[int, tuple] = {}        # request id -> key (awaiting subscribe ack)
+        self._subscriptions: Dict[int, tuple] = {}   # subscription id -> key
+        self._polling = set()
+
+        self.stats = {
+            'ws_resolved': 0,
+            'poll_resolved': 0,
+            'timeouts': 0,
+            'subscribe_failures': 0,
+            'reconnects': 0,
+            'ws_latency_ms_total': 0.0,
+        }
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                async with websockets.connect(
+                    self.ws_url,
+                    ping_interval=20,
+                    ping_timeout=10,
+                    close_timeout=5
+                ) as websocket:
+                    self._ws = websocket
+                    self._requests.clear()
+                    self._subscriptions.clear()
+                    logger.info("📨 Confirmation websocket connected")
+
+                    # Resubscribe anything still outstanding from before a reconnect
+                    for key, future in list(self._waiters.items()):
+                        if not future.done():
+                            await self._subscribe(key)
+
+                    async for message in websocket:
+                        self._handle(json.loads(message))
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Confirmation websocket error: {e}")
+
+            self._ws = None
+            self.stats['reconnects'] += 1
+            # Keep outstanding waiters moving while we reconnect
+            for key, future in list(self._waiters.items()):
+                if not future.done():
+                    self._start_poll(key)
+            await asyncio.sleep(2)
+
+    async def _subscribe(self, key: tuple) -> bool:
+        if self._ws is None:
+            return False
+        signature, commitment = key
+        request_id = self._next_id
+        self._next_id += 1
+        self._requests[request_id] = key
+        try:
+            await self._ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": "signatureSubscribe",
+                "params": [signature, {"commitment": commitment}]
+            }))
+            return True
+        except Exception as e:
+            self._requests.pop(request_id, None)
+            logger.debug(f"signatureSubscribe send failed: {e}")
+            return False
+
+    def _handle(self, message: dict):
+        request_id = message.get('id')
+        if request_id is not None and request_id in self._requests:
+            key = self._requests.pop(request_id)
+            if 'result' in message:
+                self._subscriptions[message['result']] = key
+            else:
+                self.stats['subscribe_failures'] += 1
+                logger.debug(f"signatureSubscribe rejected: {message.get('error')}")
+                self._start_poll(key)
+            return
+
+        if message.get('method') != 'signatureNotification':
+            return
+
+        params = message.get('params', {})
+        # Signature subscriptions are one-shot - server drops them after notifying
+        key = self._subscriptions.pop(params.get('subscription'), None)
+        if key is None:
+            return
+        result = params.get('result', {})
+        value = result.get('value')
+        if not isinstance(value, dict):
+            return
+        err = value.get('err')
+        self._resolve(key, 'failed' if err else key[1], err, result.get('context', {}).get('slot'), 'ws')
+
+    def _resolve(self, key: tuple, status: str, err=None, slot: int = None, source: str = 'ws'):
+        future = self._waiters.get(key)
+        if future is None or future.done():
+            return
+        latency_ms = (time.time() - self._started_at.get(key, time.time())) * 1000
+        self.stats[f'{source}_resolved'] += 1
+        if source == 'ws':
+            self.stats['ws_latency_ms_total'] += latency_ms
+        future.set_result({
+            'status': status,
+            'err': err,
+            'slot': slot,
+            'source': source,
+            'latency_ms': latency_ms,
+        })
+
+    def _start_poll(self, key: tuple):
+        if key not in self._polling:
+            self._polling.add(key)
+            asyncio.create_task(self._poll(key))
+
+    async def _poll(self, key: tuple):
+        """Fallback when the subscription could not be established - rides the batched poller"""
+        signature, commitment = key
+        try:
+            while key in self._waiters and not self._waiters[key].done():
+                status = await self.poller.wait(signature, commitment, timeout=5.0)
+                if status is None:
+                    continue
+                if status.err is not None:
+                    self._resolve(key, 'failed', status.err, status.slot, 'poll')
+                else:
+                    self._resolve(key, commitment, None, status.slot, 'poll')
+        except Exception as e:
+            logger.debug(f"Confirmation poll failed: {e}")
+        finally:
+            self._polling.discard(key)
+
+    async def wait(self, signature: str, commitment: str = "confirmed", timeout: float = 30.0) -> dict:
+        """
+        Resolve once the signature reaches commitment (or fails on-chain)
+        Returns {'status': processed|confirmed|finalized|failed|timeout, 'err', 'slot', 'source', 'latency_ms'}
+        """
+        key = (signature, commitment)
+        # Every caller holds a reference; the last one out tears the subscription down
+        self._refs[key] = self._refs.get(key, 0) + 1
+        try:
+            if key not in self._waiters:
+                self._waiters[key] = asyncio.get_running_loop().create_future()
+                self._started_at[key] = time.time()
+                if not await self._subscribe(key):
+                    self._start_poll(key)
+            future = self._waiters[key]
+
+            return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            self.stats['timeouts'] += 1
+            return {
+                'status': 'timeout',
+                'err': None,
+                'slot': None,
+                'source': None,
+                'latency_ms': timeout * 1000,
+            }
+        finally:
+            self._refs[key] -= 1
+            if self._refs[key] <= 0:
+                del self._refs[key]
+                await self._cleanup(key)
+
+    async def _cleanup(self, key: tuple):
+        self._waiters.pop(key, None)
+        self._started_at.pop(key, None)
+        # Timed-out subscriptions are still live on the server - drop them
+        for sub_id, sub_key in list(self._subscriptions.items()):
+            if sub_key == key:
+                del self._subscriptions[sub_id]
+                if self._ws is not None:
+                    try:
+                        await self._ws.send(json.dumps({
+                            "jsonrpc": "2.0",
+                            "id": self._next_id,
+                            "method": "signatureUnsubscribe",
+                            "params": [sub_id]
+                        }))
+                        self._next_id += 1
+                    except Exception:
+                        pass
+
+    def get_stats(self) -> dict:
+        s = self.stats
+        return {
+            'connected': self._ws is not None,
+            'outstanding': len(self._waiters),
+            'ws_resolved': s['ws_resolved'],
+            'poll_resolved': s['poll_resolved'],
+            'timeouts': s['timeouts'],
+            'subscribe_failures': s['subscribe_failures'],
+            'reconnects': s['reconnects'],
+            'avg_ws_latency_ms': (s['ws_latency_ms_total'] / s['ws_resolved']) if s['ws_resolved'] else 0.0,
+        }
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
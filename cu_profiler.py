@@ -0,0 +1,176 @@
+"""
+Compute Unit Profiler - Measured CU consumption per instruction shape
+Sizes set_compute_unit_limit from landed TXs / simulation instead of a flat 200k
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+from collections import deque
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CU_LIMIT = 200_000
+BASE_FEE_LAMPORTS = 5_000  # Per signature
+
+
+def instruction_shape(action: str, creates_ata: bool = False, has_tip: bool = False) -> str:
+    """Shape key - e.g. buy_ata, buy, sell, sell_tip"""
+    shape = action
+    if creates_ata:
+        shape += "_ata"
+    if has_tip:
+        shape += "_tip"
+    return shape
+
+
+class ComputeUnitProfiler:
+    """Rolling CU consumption per shape, persisted across restarts"""
+
+    MIN_SAMPLES = 3
+    MAX_SAMPLES = 20
+
+    def __init__(self, rpc_client=None, cache_path: str = None):
+        from config import CU_PROFILE_PATH
+
+        self.client = rpc_client
+        self.cache_path = cache_path or CU_PROFILE_PATH
+
+        # shape -> recent consumed CU samples
+        self.samples: Dict[str, deque] = {}
+
+        # signature -> (shape, cu_limit, cu_price) for TXs we sent
+        self._submissions: Dict[str, tuple] = {}
+
+        # shape -> fee accounting for landed TXs (actual vs flat-200k equivalent)
+        self.fee_stats: Dict[str, dict] = {}
+
+        self._simulating = set()
+        self._last_save = 0.0
+        self._load()
+
+    def _load(self):
+        try:
+            if os.path.exists(self.cache_path):
+                with open(self.cache_path) as f:
+                    data = json.load(f)
+                for shape, values in data.get('samples', {}).items():
+                    self.samples[shape] = deque(values[-self.MAX_SAMPLES:], maxlen=self.MAX_SAMPLES)
+                logger.info(f"📐 Loaded CU profile: {self.describe()}")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load CU profile: {e}")
+
+    def _save(self, force: bool = False):
+        if not force and time.time() - self._last_save < 30:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            with open(self.cache_path, 'w') as f:
+                json.dump({'samples': {s: list(v) for s, v in self.samples.items()}}, f)
+            self._last_save = time.time()
+        except Exception as e:
+            logger.debug(f"Could not save CU profile: {e}")
+
+    def record(self, shape: str, units_consumed: int, source: str = "landed"):
+        if not units_consumed:
+            return
+        if shape not in self.samples:
+            self.samples[shape] = deque(maxlen=self.MAX_SAMPLES)
+        self.samples[shape].append(int(units_consumed))
+        logger.debug(f"📐 CU {shape}: {units_consumed:,} ({source})")
+        self._save(force=len(self.samples[shape]) == self.MIN_SAMPLES)
+
+    def limit_for(self, shape: str) -> int:
+        """Max recent consumption + safety margin, or the flat default until profiled"""
+        from config import CU_SAFETY_MARGIN
+
+        samples = self.samples.get(shape)
+        if not samples or len(samples) < self.MIN_SAMPLES:
+            return DEFAULT_CU_LIMIT
+        limit = max(samples) * (1 + CU_SAFETY_MARGIN)
+        # Round up to the next 1k CU
+        return int(min(DEFAULT_CU_LIMIT * 2, math.ceil(limit / 1000) * 1000))
+
+    def note_submission(self, signature: str, shape: str, cu_limit: int, cu_price: int = 0):
+        """
+        Remember what we sent so the landed TX can be attributed to its shape
+        Only TXs carrying set_compute_unit_limit belong here - the shape is sized for them
+        """
+        self._submissions[signature] = (shape, cu_limit, cu_price)
+        if len(self._submissions) > 500:
+            del self._submissions[next(iter(self._submissions))]
+
+    def observe(self, signature: str, meta) -> None:
+        """Feed a landed TX's meta (computeUnitsConsumed + fee) back into the profile"""
+        submission = self._submissions.pop(signature, None)
+        if submission is None or meta is None:
+            return
+        shape, cu_limit, cu_price = submission
+
+        consumed = getattr(meta, 'compute_units_consumed', None)
+        if consumed:
+            self.record(shape, consumed)
+
+        fee = getattr(meta, 'fee', None)
+        if fee is None:
+            return
+        stats = self.fee_stats.setdefault(shape, {'landed': 0, 'actual_fee_lamports': 0, 'flat_fee_lamports': 0})
+        stats['landed'] += 1
+        stats['actual_fee_lamports'] += fee
+        if cu_limit and cu_price:
+            # Same TX priced with the old flat 200k limit
+            priority_actual = cu_limit * cu_price // 1_000_000
+            priority_flat = DEFAULT_CU_LIMIT * cu_price // 1_000_000
+            stats['flat_fee_lamports'] += fee - priority_actual + priority_flat
+        else:
+            stats['flat_fee_lamports'] += fee
+
+    def simulate_in_background(self, shape: str, tx) -> None:
+        """Profile an unmeasured shape via simulateTransaction without delaying the send"""
+        if self.client is None or shape in self._simulating:
+            return
+        if len(self.samples.get(shape, ())) >= self.MIN_SAMPLES:
+            return
+        self._simulating.add(shape)
+        asyncio.create_task(self._simulate(shape, tx))
+
+    async def _simulate(self, shape: str, tx):
+        try:
+            resp = await asyncio.to_thread(self.client.simulate_transaction, tx, False)
+            value = resp.value if resp else None
+            if value is not None and value.err is None and value.units_consumed:
+                self.record(shape, value.units_consumed, source="simulation")
+            elif value is not None:
+                logger.debug(f"CU simulation for {shape} failed: {value.err}")
+        except Exception as e:
+            logger.debug(f"CU simulation error for {shape}: {e}")
+        finally:
+            self._simulating.discard(shape)
+
+    def describe(self) -> str:
+        return ", ".join(
+            f"{shape}={max(v):,}" for shape, v in sorted(self.samples.items()) if v
+        ) or "empty"
+
+    def get_stats(self) -> dict:
+        shapes = {}
+        for shape in sorted(set(self.samples) | set(self.fee_stats)):
+            samples = self.samples.get(shape) or []
+            fees = self.fee_stats.get(shape, {})
+            landed = fees.get('landed', 0)
+            shapes[shape] = {
+                'samples': len(samples),
+                'max_consumed': max(samples) if samples else 0,
+                'limit': self.limit_for(shape),
+                'landed': landed,
+                'avg_fee_sol': (fees['actual_fee_lamports'] / landed / 1e9) if landed else 0.0,
+                'avg_fee_flat_limit_sol': (fees['flat_fee_lamports'] / landed / 1e9) if landed else 0.0,
+            }
+        return shapes
+
+    def close(self):
+        self._save(force=True)
@@ -0,0 +1,281 @@
+"""
+Curve Quoter - Exact u64 PumpFun bonding curve quotes with the on-chain fee rules
+Integer math mirrors the program (floor-div swaps, +1 lamport on exact-out buys, ceil-div fees).
+Fee bps come from the FeeConfig tier for the curve's market cap (Global as fallback) and every
+recorded fill is re-quoted to check we still match the chain
+"""
+
+import asyncio
+import logging
+import struct
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from solders.pubkey import Pubkey
+
+from config import PUMPFUN_PROGRAM_ID
+
+logger = logging.getLogger(__name__)
+
+FEE_PROGRAM_ID = Pubkey.from_string("pfeeUxB6jkeY1Hxd7CsFCAjcbHA9rWtchMGdZ6VojVZ")
+GLOBAL_PDA = Pubkey.find_program_address([b"global"], PUMPFUN_PROGRAM_ID)[0]
+FEE_CONFIG_PDA = Pubkey.find_program_address([b"fee_config", bytes(PUMPFUN_PROGRAM_ID)], FEE_PROGRAM_ID)[0]
+
+BPS = 10_000
+DEFAULT_TOKEN_SUPPLY = 1_000_000_000_000_000  # 1B tokens, 6 decimals
+DEFAULT_PROTOCOL_FEE_BPS = 95
+DEFAULT_CREATOR_FEE_BPS = 30
+
+# Global: disc(8) + initialized(1) + authority(32) + fee_recipient(32) + 4 u64 reserves/supply + fee_bps ...
+GLOBAL_TOKEN_SUPPLY_OFFSET = 97
+GLOBAL_FEE_BPS_OFFSET = 105
+GLOBAL_CREATOR_FEE_BPS_OFFSET = 154  # after withdraw_authority(32) + enable_migrate(1) + pool_migration_fee(8)
+
+# FeeConfig: disc(8) + bump(1) + admin(32) + flat_fees(lp, protocol, creator u64) + Vec<FeeTier>
+FEE_CONFIG_FLAT_OFFSET = 41
+FEE_CONFIG_TIERS_OFFSET = 65
+FEE_TIER_SIZE = 40  # market_cap_lamports_threshold(u128) + fees(3 x u64)
+
+
+def ceil_div(a: int, b: int) -> int:
+    return -(-a // b)
+
+
+def parse_global(data: bytes) -> Optional[dict]:
+    if not data or len(data) < GLOBAL_CREATOR_FEE_BPS_OFFSET + 8:
+        return None
+    supply, fee_bps = struct.unpack_from('<2Q', data, GLOBAL_TOKEN_SUPPLY_OFFSET)
+    creator_fee_bps, = struct.unpack_from('<Q', data, GLOBAL_CREATOR_FEE_BPS_OFFSET)
+    return {'token_total_supply': supply, 'protocol_fee_bps': fee_bps, 'creator_fee_bps': creator_fee_bps}
+
+
+def parse_fee_config(data: bytes) -> Optional[List[Tuple[int, int, int]]]:
+    """Fee tiers as (market_cap_threshold_lamports, protocol_bps, creator_bps), ascending"""
+    if not data or len(data) < FEE_CONFIG_TIERS_OFFSET + 4:
+        return None
+    count, = struct.unpack_from('<I', data, FEE_CONFIG_TIERS_OFFSET)
+    tiers = []
+    offset = FEE_CONFIG_TIERS_OFFSET + 4
+    for _ in range(count):
+        if offset + FEE_TIER_SIZE > len(data):
+            return None
+        lo, hi, _lp, protocol, creator = struct.unpack_from('<2Q3Q', data, offset)
+        tiers.append((lo | (hi << 64), protocol, creator))
+        offset += FEE_TIER_SIZE
+    return tiers or None
+
+
+class CurveQuoter:
+    """Exact buy/sell quotes (single or many sizes) against u64 curve reserves"""
+
+    def __init__(self, rpc_client=None):
+        self.client = rpc_client
+
+        self.fee_tiers: Optional[List[Tuple[int, int, int]]] = None
+        self.global_fees: Optional[dict] = None
+        self.params_loaded_at = 0.0
+        self._task = None
+
+        # Last fee bps seen in a TradeEvent - used while neither account has been read
+        self.observed_bps: Optional[Tuple[int, int]] = None
+
+        self.stats = {
+            'quotes': 0,
+            'param_refreshes': 0,
+            'validated': 0,
+            'exact': 0,
+            'mismatched': 0,
+            'max_error_lamports': 0,
+            'fee_bps_mismatch': 0,
+        }
+
+    # ===== FEE PARAMETERS =====
+
+    def refresh(self) -> bool:
+        """Blocking read of Global + FeeConfig in one getMultipleAccounts"""
+        if self.client is None:
+            return False
+        try:
+            response = self.client.get_multiple_accounts([GLOBAL_PDA, FEE_CONFIG_PDA])
+            global_info, fee_config_info = (list(response.value or []) + [None, None])[:2]
+        except Exception as e:
+            logger.debug(f"Fee params fetch failed: {e}")
+            return False
+
+        global_fees = parse_global(bytes(global_info.data)) if global_info else None
+        fee_tiers = parse_fee_config(bytes(fee_config_info.data)) if fee_config_info else None
+        if global_fees:
+            self.global_fees = global_fees
+        if fee_tiers:
+            self.fee_tiers = fee_tiers
+        self.params_loaded_at = time.time()
+        self.stats['param_refreshes'] += 1
+        return bool(global_fees or fee_tiers)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self):
+        from config import FEE_PARAMS_REFRESH_SECONDS
+
+        while True:
+            if await asyncio.to_thread(self.refresh):
+                tiers = len(self.fee_tiers) if self.fee_tiers else 0
+                logger.debug(f"🧮 Fee params refreshed ({tiers} FeeConfig tiers, global={self.global_fees})")
+            await asyncio.sleep(FEE_PARAMS_REFRESH_SECONDS)
+
+    def token_supply(self) -> int:
+        return (self.global_fees or {}).get('token_total_supply') or DEFAULT_TOKEN_SUPPLY
+
+    def fee_bps(self, virtual_sol: int, virtual_tokens: int) -> Tuple[int, int]:
+        """(protocol_bps, creator_bps) the program charges at these reserves"""
+        if self.fee_tiers and virtual_tokens > 0:
+            market_cap = virtual_sol * self.token_supply() // virtual_tokens
+            selected = self.fee_tiers[0]
+            for tier in reversed(self.fee_tiers):
+                if market_cap >= tier[0]:
+                    selected = tier
+                    break
+            return selected[1], selected[2]
+        if self.global_fees:
+            return self.global_fees['protocol_fee_bps'], self.global_fees['creator_fee_bps']
+        if self.observed_bps:
+            return self.observed_bps
+        return DEFAULT_PROTOCOL_FEE_BPS, DEFAULT_CREATOR_FEE_BPS
+
+    # ===== QUOTES =====
+
+    def buy_costs(self, token_amounts: Sequence[int], virtual_sol: int, virtual_tokens: int) -> List[dict]:
+        """Exact SOL cost of buying each token amount (curve cost + protocol + creator fee)"""
+        protocol_bps, creator_bps = self.fee_bps(virtual_sol, virtual_tokens)
+        quotes = []
+        for tokens in token_amounts:
+            if tokens <= 0 or tokens >= virtual_tokens:
+                quotes.append(None)
+                continue
+            sol_cost = tokens * virtual_sol // (virtual_tokens - tokens) + 1
+            fee = ceil_div(sol_cost * protocol_bps, BPS)
+            creator_fee = ceil_div(sol_cost * creator_bps, BPS)
+            quotes.append({
+                'tokens_out': tokens,
+                'sol_cost': sol_cost,
+                'fee': fee,
+                'creator_fee': creator_fee,
+                'total_cost': sol_cost + fee + creator_fee,
+            })
+        self.stats['quotes'] += len(quotes)
+        return quotes
+
+    def quote_buys(
+        self, sol_amounts: Sequence[int], virtual_sol: int, virtual_tokens: int, real_tokens: int = None
+    ) -> List[Optional[dict]]:
+        """Tokens each SOL budget (lamports, fees included) buys, with the exact cost of those tokens"""
+        protocol_bps, creator_bps = self.fee_bps(virtual_sol, virtual_tokens)
+        token_amounts = []
+        for sol in sol_amounts:
+            sol_in = (sol - 1) * BPS // (BPS + protocol_bps + creator_bps)
+            tokens = sol_in * virtual_tokens // (virtual_sol + sol_in) if sol_in > 0 else 0
+            if real_tokens is not None:
+                tokens = min(tokens, real_tokens)
+            token_amounts.append(tokens)
+        quotes = self.buy_costs(token_amounts, virtual_sol, virtual_tokens)
+        for sol, quote in zip(sol_amounts, quotes):
+            if quote:
+                quote['sol_in'] = sol
+        return quotes
+
+    def quote_sells(self, token_amounts: Sequence[int], virtual_sol: int, virtual_tokens: int) -> List[Optional[dict]]:
+        """Net SOL each token amount sells for (curve output minus protocol + creator fee)"""
+        protocol_bps, creator_bps = self.fee_bps(virtual_sol, virtual_tokens)
+        quotes = []
+        for tokens in token_amounts:
+            if tokens <= 0:
+                quotes.append(None)
+                continue
+            sol_out = tokens * virtual_sol // (virtual_tokens + tokens)
+            fee = ceil_div(sol_out * protocol_bps, BPS)
+            creator_fee = ceil_div(sol_out * creator_bps, BPS)
+            quotes.append({
+                'tokens_in': tokens,
+                'sol_out': sol_out,
+                'fee': fee,
+                'creator_fee': creator_fee,
+                'net_sol': max(0, sol_out - fee - creator_fee),
+            })
+        self.stats['quotes'] += len(quotes)
+        return quotes
+
+    def quote_buy(self, sol_lamports: int, virtual_sol: int, virtual_tokens: int, real_tokens: int = None) -> Optional[dict]:
+        return self.quote_buys([sol_lamports], virtual_sol, virtual_tokens, real_tokens)[0]
+
+    def quote_sell(self, token_amount: int, virtual_sol: int, virtual_tokens: int) -> Optional[dict]:
+        return self.quote_sells([token_amount], virtual_sol, virtual_tokens)[0]
+
+    # ===== VALIDATION =====
+
+    def validate_trade(self, event: dict) -> Optional[int]:
+        """
+        Re-quote a TradeEvent from its pre-trade reserves and compare with what the chain did
+        Returns the curve-side SOL error in lamports (None if the event can't be checked)
+        """
+        sol = event['sol_lamports']
+        tokens = event['token_amount']
+        if tokens <= 0:
+            return None
+        if event['is_buy']:
+            pre_sol = event['virtual_sol_reserves'] - sol
+            pre_tokens = event['virtual_token_reserves'] + tokens
+            quote = self.buy_costs([tokens], pre_sol, pre_tokens)[0]
+            expected = quote['sol_cost'] if quote else None
+        else:
+            pre_sol = event['virtual_sol_reserves'] + sol
+            pre_tokens = event['virtual_token_reserves'] - tokens
+            quote = self.quote_sells([tokens], pre_sol, pre_tokens)[0]
+            expected = quote['sol_out'] if quote else None
+        if expected is None:
+            return None
+
+        self.stats['validated'] += 1
+        error = sol - expected
+        if error == 0:
+            self.stats['exact'] += 1
+        else:
+            self.stats['mismatched'] += 1
+            self.stats['max_error_lamports'] = max(self.stats['max_error_lamports'], abs(error))
+            logger.warning(
+                f"🧮 Quote mismatch {event['mint'][:8]} {'BUY' if event['is_buy'] else 'SELL'}: "
+                f"chain {sol:,} vs quote {expected:,} lamports"
+            )
+
+        # Fee bps the program actually charged vs what we would have charged
+        charged = (event.get('fee_bps'), event.get('creator_fee_bps'))
+        if charged[0] is not None:
+            self.observed_bps = charged
+            if charged != self.fee_bps(pre_sol, pre_tokens):
+                self.stats['fee_bps_mismatch'] += 1
+                logger.warning(
+                    f"🧮 Fee bps mismatch {event['mint'][:8]}: chain {charged[0]}+{charged[1]} "
+                    f"vs quoted {'+'.join(map(str, self.fee_bps(pre_sol, pre_tokens)))}"
+                )
+        return error
+
+    def get_stats(self) -> dict:
+        s = self.stats
+        return {
+            'fee_source': 'fee_config' if self.fee_tiers else 'global' if self.global_fees else (
+                'observed' if self.observed_bps else 'default'
+            ),
+            'fee_tiers': len(self.fee_tiers) if self.fee_tiers else 0,
+            **s,
+            'exact_rate': (s['exact'] / s['validated']) if s['validated'] else 0.0,
+        }
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
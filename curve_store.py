@@ -0,0 +1,393 @@
+"""
+Curve Store - Single in-memory source of bonding curve state
+Fed by the exact reserves in every TradeEvent and by accountSubscribe on held curves;
+chain reads are only a fallback. Readers never need RPC.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import struct
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import websockets
+from solders.pubkey import Pubkey
+
+from config import PUMPFUN_PROGRAM_ID, MIGRATION_THRESHOLD_SOL
+
+logger = logging.getLogger(__name__)
+
+# PumpFun launch reserves - only used to estimate reserves when the store has no entry
+INITIAL_VIRTUAL_SOL_LAMPORTS = 30_000_000_000
+INITIAL_VIRTUAL_TOKEN_RESERVES = 1_073_000_191_000_000
+INITIAL_K = INITIAL_VIRTUAL_SOL_LAMPORTS * INITIAL_VIRTUAL_TOKEN_RESERVES
+
+MAX_ACCOUNTS_PER_CALL = 100  # getMultipleAccounts limit
+EVICT_SWEEP_SECONDS = 5.0  # How often the refresh loop drops idle entries
+
+
+def derive_curve_pda(mint: Pubkey) -> Pubkey:
+    return Pubkey.find_program_address([b"bonding-curve", bytes(mint)], PUMPFUN_PROGRAM_ID)[0]
+
+
+def estimate_reserves(curve_sol: float) -> Tuple[int, int]:
+    """(virtual_sol_lamports, virtual_token_reserves) from SOL in curve via the launch constant product"""
+    virtual_sol_lamports = INITIAL_VIRTUAL_SOL_LAMPORTS + int(curve_sol * 1e9)
+    return virtual_sol_lamports, INITIAL_K // virtual_sol_lamports
+
+
+def parse_curve_account(data: bytes) -> Optional[Dict]:
+    """BondingCurve account: disc(8) + vToken + vSol + realToken + realSol + supply (u64s) + complete(bool)"""
+    if not data or len(data) < 49:
+        return None
+    virtual_token, virtual_sol, real_token, real_sol, supply = struct.unpack_from('<5Q', data, 8)
+    return {
+        'virtual_token_reserves': virtual_token,
+        'virtual_sol_reserves': virtual_sol,
+        'real_token_reserves': real_token,
+        'real_sol_reserves': real_sol,
+        'token_total_supply': supply,
+        'complete': bool(data[48]),
+    }
+
+
+class CurveStore:
+    """mint -> exact integer reserves, newest slot wins"""
+
+    def __init__(
+        self,
+        rpc_client=None,
+        ws_url: str = None,
+        retain_source: Optional[Callable[[], Iterable[str]]] = None
+    ):
+        from config import WS_ENDPOINT
+
+        self.client = rpc_client
+        self.ws_url = ws_url or WS_ENDPOINT
+        # Extra mints never evicted while listed (e.g. the scanner's watched tokens)
+        self.retain_source = retain_source or (lambda: ())
+
+        self.curves: Dict[str, dict] = {}
+
+        # Held curves streamed via accountSubscribe
+        self.watched: Dict[str, Pubkey] = {}      # mint -> curve PDA
+        # Near-entry curves (being evaluated) - batch refreshed until they expire
+        self.tracked: Dict[str, float] = {}       # mint -> expires_at
+        self._pdas: Dict[str, Pubkey] = {}
+        self._ws = None
+        self._task = None
+        self._refresh_task = None
+        self._next_id = 1
+        self._requests: Dict[int, str] = {}
+        self._subscriptions: Dict[int, str] = {}
+        self._last_sweep = time.time()
+
+        self.stats = {
+            'trade_updates': 0,
+            'account_updates': 0,
+            'chain_reads': 0,
+            'batch_calls': 0,
+            'batched_accounts': 0,
+            'stale_rejected': 0,
+            'reads': 0,
+            'misses': 0,
+            'evicted': 0,
+        }
+
+    # ===== WRITES =====
+
+    def _apply(self, mint: str, reserves: dict, slot: Optional[int], source: str) -> bool:
+        current = self.curves.get(mint)
+        if current and slot is not None and current['slot'] is not None and slot < current['slot']:
+            self.stats['stale_rejected'] += 1
+            return False
+        entry = dict(current or {})
+        entry.update(reserves)
+        entry['slot'] = slot if slot is not None else (current or {}).get('slot')
+        entry['source'] = source
+        entry['updated_at'] = time.time()
+        entry.setdefault('read_at', entry['updated_at'])
+        self.curves[mint] = entry
+        return True
+
+    def update_from_trade_event(self, mint: str, event: dict, slot: Optional[int] = None):
+        """TradeEvent carries post-trade virtual + real reserves"""
+        reserves = {
+            'virtual_sol_reserves': event['virtual_sol_reserves'],
+            'virtual_token_reserves': event['virtual_token_reserves'],
+        }
+        if event.get('real_sol_reserves') is not None:
+            reserves['real_sol_reserves'] = event['real_sol_reserves']
+            reserves['real_token_reserves'] = event['real_token_reserves']
+        if self._apply(mint, reserves, slot, 'trade_event'):
+            self.stats['trade_updates'] += 1
+
+    def update_from_account(self, mint: str, data: bytes, slot: Optional[int] = None, source: str = 'account') -> bool:
+        parsed = parse_curve_account(data)
+        if not parsed:
+            return False
+        if self._apply(mint, parsed, slot, source):
+            self.stats['account_updates'] += 1
+        return True
+
+    # ===== READS (no RPC) =====
+
+    def _is_live(self, mint: str) -> bool:
+        return self._ws is not None and mint in self.watched
+
+    def get(self, mint: str, max_age: float = None) -> Optional[dict]:
+        """
+        Snapshot with reserves + derived fields, or None if unknown / older than max_age
+        Streamed (subscribed) curves are always fresh - the account only notifies on change
+        """
+        self.stats['reads'] += 1
+        entry = self.curves.get(mint)
+        if entry is None or 'virtual_token_reserves' not in entry:
+            self.stats['misses'] += 1
+            return None
+        entry['read_at'] = time.time()
+        age = entry['read_at'] - entry['updated_at']
+        if max_age is not None and age > max_age and not self._is_live(mint):
+            self.stats['misses'] += 1
+            return None
+
+        v_sol = entry['virtual_sol_reserves']
+        v_tokens = entry['virtual_token_reserves']
+        real_sol = entry.get('real_sol_reserves', max(0, v_sol - INITIAL_VIRTUAL_SOL_LAMPORTS))
+        sol_in_curve = real_sol / 1e9
+        snapshot = dict(entry)
+        snapshot.update({
+            'real_sol_reserves': real_sol,
+            'sol_in_curve': sol_in_curve,
+            'sol_raised': sol_in_curve,
+            'price_lamports_per_atomic': (v_sol / v_tokens) if v_tokens > 0 else 0,
+            'is_migrated': entry.get('complete', False) or sol_in_curve >= MIGRATION_THRESHOLD_SOL,
+            'complete': entry.get('complete', False),
+            'is_valid': v_tokens > 0,
+            'age': age,
+        })
+        return snapshot
+
+    def sol_in_curve(self, mint: str) -> float:
+        snapshot = self.get(mint)
+        return snapshot['sol_in_curve'] if snapshot else 0.0
+
+    def reserves(self, mint: str, fallback_curve_sol: float = 0.0) -> Tuple[int, int]:
+        """(virtual_sol, virtual_token) exact from the store, else estimated from SOL in curve"""
+        snapshot = self.get(mint)
+        if snapshot and snapshot['is_valid']:
+            return snapshot['virtual_sol_reserves'], snapshot['virtual_token_reserves']
+        return estimate_reserves(max(fallback_curve_sol, 0.0))
+
+    # ===== CHAIN FALLBACK =====
+
+    def _pda(self, mint: str) -> Pubkey:
+        pda = self._pdas.get(mint)
+        if pda is None:
+            pda = self._pdas[mint] = derive_curve_pda(Pubkey.from_string(mint))
+        return pda
+
+    def fetch_many(self, mints: Iterable[str]) -> Dict[str, dict]:
+        """Blocking chain read of many curves - one getMultipleAccounts per 100 mints (processed, like the streams)"""
+        from solana.rpc.commitment import Processed
+
+        result = {}
+        if self.client is None:
+            return result
+        mints = list(dict.fromkeys(mints))
+        for i in range(0, len(mints), MAX_ACCOUNTS_PER_CALL):
+            chunk = mints[i:i + MAX_ACCOUNTS_PER_CALL]
+            self.stats['chain_reads'] += 1
+            if len(chunk) > 1:
+                self.stats['batch_calls'] += 1
+                self.stats['batched_accounts'] += len(chunk)
+            response = self.client.get_multiple_accounts([self._pda(m) for m in chunk], commitment=Processed)
+            slot = getattr(getattr(response, 'context', None), 'slot', None)
+            for mint, info in zip(chunk, response.value or []):
+                if info and info.data and self.update_from_account(mint, bytes(info.data), slot, 'chain'):
+                    result[mint] = self.get(mint)
+        return result
+
+    def fetch(self, mint: str) -> Optional[dict]:
+        """Blocking chain read of one curve into the store (fallback only)"""
+        return self.fetch_many([mint]).get(mint)
+
+    def track(self, mint: str):
+        """Keep a near-entry curve fresh via the batched refresh"""
+        from config import CURVE_NEAR_ENTRY_TTL
+
+        self.tracked[mint] = time.time() + CURVE_NEAR_ENTRY_TTL
+
+    def _due_for_refresh(self, max_age: float) -> list:
+        now = time.time()
+        for mint, expires_at in list(self.tracked.items()):
+            if expires_at < now:
+                del self.tracked[mint]
+        # accountSubscribe only notifies on change - a quiet streamed curve is current, not stale
+        streamed = set(self._subscriptions.values()) if self._ws is not None else set()
+        due = []
+        for mint in list(self.watched) + [m for m in self.tracked if m not in self.watched]:
+            if mint in streamed:
+                continue
+            entry = self.curves.get(mint)
+            if entry is None or now - entry['updated_at'] >= max_age:
+                due.append(mint)
+        return due
+
+    def _evict_idle(self, idle_ttl: float):
+        """Drop entries nobody has read for idle_ttl - the program-wide log feed adds every traded mint"""
+        now = time.time()
+        keep = set(self.watched) | set(self.tracked) | set(self.retain_source())
+        for mint, entry in list(self.curves.items()):
+            if mint not in keep and now - entry['read_at'] >= idle_ttl:
+                del self.curves[mint]
+                self._pdas.pop(mint, None)
+                self.stats['evicted'] += 1
+
+    async def _refresh_loop(self):
+        """Every tick: one getMultipleAccounts for all held + near-entry curves that went stale (idle entries swept every few seconds)"""
+        from config import CURVE_REFRESH_SECONDS, CURVE_IDLE_TTL
+
+        while True:
+            await asyncio.sleep(CURVE_REFRESH_SECONDS)
+            if time.time() - self._last_sweep >= EVICT_SWEEP_SECONDS:
+                self._last_sweep = time.time()
+                try:
+                    self._evict_idle(CURVE_IDLE_TTL)
+                except Exception as e:
+                    logger.debug(f"Curve eviction failed: {e}")
+            due = self._due_for_refresh(CURVE_REFRESH_SECONDS)
+            if not due:
+                continue
+            try:
+                await asyncio.to_thread(self.fetch_many, due)
+            except Exception as e:
+                logger.debug(f"Curve batch refresh failed: {e}")
+
+    # ===== ACCOUNT SUBSCRIPTIONS (held curves) =====
+
+    async def watch(self, mint: str):
+        if mint in self.watched:
+            return
+        self.watched[mint] = self._pda(mint)
+        await self._subscribe(mint)
+
+    def unwatch(self, mint: str):
+        self.watched.pop(mint, None)
+        for sub_id, key in list(self._subscriptions.items()):
+            if key == mint:
+                del self._subscriptions[sub_id]
+                asyncio.create_task(self._send("accountUnsubscribe", [sub_id]))
+
+    def retain(self, mints: Iterable[str]):
+        """Stop streaming curves we no longer hold"""
+        keep = set(mints)
+        for mint in list(self.watched):
+            if mint not in keep:
+                self.unwatch(mint)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def _send(self, method: str, params: list) -> Optional[int]:
+        if self._ws is None:
+            return None
+        request_id = self._next_id
+        self._next_id += 1
+        try:
+            await self._ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": method,
+                "params": params
+            }))
+            return request_id
+        except Exception as e:
+            logger.debug(f"{method} send failed: {e}")
+            return None
+
+    async def _subscribe(self, mint: str):
+        request_id = await self._send(
+            "accountSubscribe",
+            [str(self.watched[mint]), {"encoding": "base64", "commitment": "confirmed"}]
+        )
+        if request_id is not None:
+            self._requests[request_id] = mint
+
+    async def _run(self):
+        while True:
+            try:
+                async with websockets.connect(
+                    self.ws_url,
+                    ping_interval=20,
+                    ping_timeout=10,
+                    close_timeout=5
+                ) as websocket:
+                    self._ws = websocket
+                    self._requests.clear()
+                    self._subscriptions.clear()
+                    logger.info("📈 Curve stream connected")
+
+                    for mint in list(self.watched):
+                        await self._subscribe(mint)
+
+                    async for message in websocket:
+                        self._handle(json.loads(message))
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Curve stream error: {e}")
+
+            self._ws = None
+            await asyncio.sleep(2)
+
+    def _handle(self, message: dict):
+        request_id = message.get('id')
+        if request_id is not None and request_id in self._requests:
+            mint = self._requests.pop(request_id)
+            if 'result' in message:
+                self._subscriptions[message['result']] = mint
+            return
+
+        if message.get('method') != 'accountNotification':
+            return
+        params = message.get('params', {})
+        mint = self._subscriptions.get(params.get('subscription'))
+        if mint is None:
+            return
+        result = params.get('result', {})
+        value = result.get('value')
+        if not value:
+            return
+        data = value.get('data')
+        if isinstance(data, list) and data:
+            self.update_from_account(mint, base64.b64decode(data[0]), result.get('context', {}).get('slot'))
+
+    def get_stats(self) -> dict:
+        s = self.stats
+        return {
+            'curves': len(self.curves),
+            'watched': len(self.watched),
+            'tracked': len(self.tracked),
+            'avg_batch': (s['batched_accounts'] / s['batch_calls']) if s['batch_calls'] else 0.0,
+            'connected': self._ws is not None,
+            **s,
+            'hit_rate': (1 - s['misses'] / s['reads']) if s['reads'] else 0.0,
+        }
+
+    async def stop(self):
+        for task in (self._task, self._refresh_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._refresh_task = None
+        self._ws = None
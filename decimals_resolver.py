@@ -0,0 +1,220 @@
+"""
+Decimals Resolver - Token decimals without per-mint blocking RPC
+PumpFun mints are answered from the CreateV2 event (always 6, bounded in memory only);
+unknown mints are batched into getMultipleAccounts and persisted across restarts
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from solders.pubkey import Pubkey
+
+logger = logging.getLogger(__name__)
+
+PUMPFUN_DECIMALS = 6
+DEFAULT_DECIMALS = 6
+MINT_DECIMALS_OFFSET = 44  # SPL / Token-2022 mint layout: authority option(36) + supply(8)
+MAX_ACCOUNTS_PER_CALL = 100  # getMultipleAccounts limit
+BATCH_WINDOW = 0.02  # Seconds to collect concurrent misses into one call
+MAX_CREATEV2_MINTS = 20000  # Recent CreateV2 mints remembered (oldest evicted)
+PERSISTED_SOURCES = ('onchain', 'disk')  # Only answers that came from the mint account are saved
+
+
+class DecimalsResolver:
+    """mint -> decimals cache with an async batched resolver"""
+
+    def __init__(self, rpc_client, cache_path: str = None):
+        from config import DECIMALS_CACHE_PATH
+
+        self.client = rpc_client
+        self.cache_path = cache_path or DECIMALS_CACHE_PATH
+
+        self.decimals: Dict[str, int] = {}
+        self.sources: Dict[str, str] = {}  # mint -> onchain | fallback | disk
+        # CreateV2 mints carry no information beyond "PumpFun" - bounded, never persisted
+        self.pumpfun_mints: OrderedDict = OrderedDict()
+
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._flush_task = None
+        self._dirty = False
+        self._last_save = 0.0
+
+        self.stats = {
+            'hits': 0,
+            'createv2': 0,
+            'rpc_calls': 0,
+            'resolved_onchain': 0,
+            'fallbacks': 0,
+        }
+        self._load()
+
+    def _load(self):
+        try:
+            if os.path.exists(self.cache_path):
+                with open(self.cache_path) as f:
+                    data = json.load(f)
+                for mint, decimals in data.items():
+                    self.decimals[mint] = int(decimals)
+                    self.sources[mint] = 'disk'
+                logger.info(f"🔢 Loaded {len(self.decimals)} cached token decimals")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load decimals cache: {e}")
+
+    def _save(self, force: bool = False):
+        if not self._dirty or (not force and time.time() - self._last_save < 30):
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+            # Fallback guesses are not persisted - they get another chance next run
+            data = {m: d for m, d in self.decimals.items() if self.sources.get(m) in PERSISTED_SOURCES}
+            with open(self.cache_path, 'w') as f:
+                json.dump(data, f)
+            self._dirty = False
+            self._last_save = time.time()
+        except Exception as e:
+            logger.debug(f"Could not save decimals cache: {e}")
+
+    def _store(self, mint: str, decimals: int, source: str):
+        self.decimals[mint] = decimals
+        self.sources[mint] = source
+        if source in PERSISTED_SOURCES:
+            self._dirty = True
+        self._save()
+
+    # ===== SYNC API (no RPC) =====
+
+    def note_pumpfun_mint(self, mint: str):
+        """CreateV2 seen on the logs stream - PumpFun always mints with 6 decimals"""
+        if mint in self.decimals or mint in self.pumpfun_mints:
+            return
+        self.stats['createv2'] += 1
+        self.pumpfun_mints[mint] = True
+        if len(self.pumpfun_mints) > MAX_CREATEV2_MINTS:
+            self.pumpfun_mints.popitem(last=False)
+
+    def _cached(self, mint: str) -> Optional[int]:
+        decimals = self.decimals.get(mint)
+        if decimals is None and mint in self.pumpfun_mints:
+            decimals = PUMPFUN_DECIMALS
+        return decimals
+
+    def get(self, mint: str) -> Optional[int]:
+        """Cached decimals or None - never blocks"""
+        decimals = self._cached(mint)
+        if decimals is not None:
+            self.stats['hits'] += 1
+        return decimals
+
+    def source(self, mint: str) -> str:
+        if mint not in self.sources and mint in self.pumpfun_mints:
+            return 'createv2'
+        return self.sources.get(mint, 'unknown')
+
+    def prefetch(self, mint: str):
+        """Resolve a miss in the background (sync callers use the default meanwhile)"""
+        if self._cached(mint) is not None or mint in self._pending:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        asyncio.ensure_future(self.resolve(mint))
+
+    # ===== RPC =====
+
+    @staticmethod
+    def _parse(info) -> Optional[int]:
+        if info is None:
+            return None
+        data = info.data
+        if isinstance(data, (list, tuple)) and data and isinstance(data[0], str):
+            data = base64.b64decode(data[0])
+        data = bytes(data)
+        if len(data) <= MINT_DECIMALS_OFFSET:
+            return None
+        decimals = data[MINT_DECIMALS_OFFSET]
+        return decimals if decimals <= 12 else None
+
+    def fetch_sync(self, mints: Iterable[str]) -> Dict[str, int]:
+        """Blocking batched lookup for sync callers - one getMultipleAccounts per 100 misses"""
+        result = {}
+        misses = []
+        for mint in dict.fromkeys(mints):
+            decimals = self._cached(mint)
+            if decimals is not None:
+                self.stats['hits'] += 1
+                result[mint] = decimals
+            else:
+                misses.append(mint)
+
+        for i in range(0, len(misses), MAX_ACCOUNTS_PER_CALL):
+            chunk = misses[i:i + MAX_ACCOUNTS_PER_CALL]
+            try:
+                self.stats['rpc_calls'] += 1
+                response = self.client.get_multiple_accounts([Pubkey.from_string(m) for m in chunk])
+                infos = list(response.value or [])
+            except Exception as e:
+                logger.debug(f"Decimals batch fetch failed: {e}")
+                infos = []
+            infos += [None] * (len(chunk) - len(infos))
+
+            for mint, info in zip(chunk, infos):
+                decimals = self._parse(info)
+                if decimals is None:
+                    self.stats['fallbacks'] += 1
+                    self._store(mint, DEFAULT_DECIMALS, 'fallback')
+                    logger.debug(f"Token {mint[:8]}... defaulting to {DEFAULT_DECIMALS} decimals (source: fallback)")
+                else:
+                    self.stats['resolved_onchain'] += 1
+                    self._store(mint, decimals, 'onchain')
+                result[mint] = self.decimals[mint]
+        return result
+
+    async def resolve(self, mint: str) -> int:
+        """Decimals for mint - concurrent misses share one batched RPC call"""
+        decimals = self.get(mint)
+        if decimals is not None:
+            return decimals
+
+        future = self._pending.get(mint)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[mint] = future
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self._flush())
+        return await asyncio.shield(future)
+
+    async def resolve_many(self, mints: List[str]) -> Dict[str, int]:
+        values = await asyncio.gather(*(self.resolve(m) for m in mints))
+        return dict(zip(mints, values))
+
+    async def _flush(self):
+        await asyncio.sleep(BATCH_WINDOW)
+        batch, self._pending = self._pending, {}
+        try:
+            resolved = await asyncio.to_thread(self.fetch_sync, list(batch))
+        except Exception as e:
+            logger.debug(f"Decimals resolve failed: {e}")
+            resolved = {}
+        for mint, future in batch.items():
+            if not future.done():
+                future.set_result(resolved.get(mint, DEFAULT_DECIMALS))
+        # Misses that arrived during the RPC call
+        if self._pending:
+            self._flush_task = asyncio.create_task(self._flush())
+
+    def get_stats(self) -> dict:
+        return {
+            'cached': len(self.decimals),
+            'createv2_mints': len(self.pumpfun_mints),
+            **self.stats,
+        }
+
+    def close(self):
+        self._save(force=True)
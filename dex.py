@@ -3,7 +3,6 @@ DEX - PumpFun Bonding Curves with Real-Time Price Parsing
 """
 
 import time
-import struct
 import logging
 from typing import Optional, Dict, Tuple
 from solders.pubkey import Pubkey
@@ -11,24 +10,25 @@ from solders.pubkey import Pubkey
 from config import (
     PUMPFUN_PROGRAM_ID, MIGRATION_THRESHOLD_SOL, RPC_ENDPOINT
 )
+from curve_store import CurveStore, derive_curve_pda
 
 logger = logging.getLogger(__name__)
 
 class PumpFunDEX:
     """PumpFun bonding curve integration - with real-time price parsing"""
     
-    def __init__(self, wallet_manager):
+    def __init__(self, wallet_manager, curve_store=None):
         """Initialize with wallet manager"""
         self.wallet = wallet_manager
         from solana.rpc.api import Client
         self.client = Client(RPC_ENDPOINT)
         
         # Track bonding curve states from WebSocket
-        self.bonding_curves_cache = {}
         self.token_websocket_data = {}
         
-        # Persistent price cache with TTL
-        self.last_good_prices = {}
+        # On-chain curve state (TradeEvents + account stream + chain reads)
+        self.curves = curve_store or CurveStore(self.client)
+        self.CHAIN_FRESH_TTL = 2   # Store state newer than this counts as a chain read
         self.PRICE_CACHE_TTL = 30  # 30 seconds for volatile tokens
         
     def update_token_data(self, mint: str, websocket_data: Dict):
@@ -42,10 +42,6 @@ class PumpFunDEX:
             'timestamp': time.time()
         }
         
-        # Clear old cache to force fresh data usage
-        if mint in self.bonding_curves_cache:
-            del self.bonding_curves_cache[mint]
-        
         v_sol = actual_data.get('vSolInBondingCurve', 0)
         logger.debug(f"Updated WebSocket data for {mint[:8]}... SOL in curve: {v_sol:.2f}")
     
@@ -54,48 +50,29 @@ class PumpFunDEX:
         seeds = [b"bonding-curve", bytes(mint)]
         return Pubkey.find_program_address(seeds, PUMPFUN_PROGRAM_ID)
     
-    def _parse_bonding_curve_account(self, account_data: bytes) -> Optional[Dict]:
-        """Parse raw bonding curve account data to extract reserves"""
-        try:
-            if not account_data or len(account_data) < 40:
-                logger.debug(f"Account data too short: {len(account_data) if account_data else 0} bytes")
-                return None
-            
-            # PumpFun bonding curve layout (little-endian):
-            # 0-8: discriminator
-            # 8-16: virtual_token_reserves (u64)
-            # 16-24: virtual_sol_reserves (u64)
-            # 24-32: real_token_reserves (u64)
-            # 32-40: real_sol_reserves (u64)
-            
-            virtual_token_reserves = struct.unpack('<Q', account_data[8:16])[0]
-            virtual_sol_reserves = struct.unpack('<Q', account_data[16:24])[0]
-            real_token_reserves = struct.unpack('<Q', account_data[24:32])[0]
-            real_sol_reserves = struct.unpack('<Q', account_data[32:40])[0]
-            
+    def _chain_curve_data(self, snapshot: Dict, mint: str) -> Dict:
+        """Curve store snapshot (atomic units) in the get_bonding_curve_data format"""
+        curve_data = {
+            'bonding_curve': str(self.curves.watched.get(mint) or derive_curve_pda(Pubkey.from_string(mint))),
+            'virtual_token_reserves': snapshot['virtual_token_reserves'],
+            'virtual_sol_reserves': snapshot['virtual_sol_reserves'],
+            'real_token_reserves': snapshot.get('real_token_reserves', 0),
+            'real_sol_reserves': snapshot['real_sol_reserves'],
             # ✅ CHATGPT FIX #1: Use real_sol_reserves for accurate SOL raised
-            # This ensures health checks and velocity use actual deposited SOL
-            sol_in_curve = real_sol_reserves / 1e9
-            
-            # Check for migration
-            is_migrated = sol_in_curve >= MIGRATION_THRESHOLD_SOL
-            
-            logger.debug(f"Parsed bonding curve: {sol_in_curve:.2f} SOL, {virtual_token_reserves:,} tokens")
-            
-            return {
-                'virtual_token_reserves': virtual_token_reserves,
-                'virtual_sol_reserves': virtual_sol_reserves,
-                'real_token_reserves': real_token_reserves,
-                'real_sol_reserves': real_sol_reserves,
-                'sol_in_curve': sol_in_curve,
-                'is_migrated': is_migrated,
-                'is_valid': True,
-                'from_chain': True
-            }
-            
-        except Exception as e:
-            logger.error(f"Failed to parse bonding curve account: {e}")
-            return None
+            'sol_in_curve': snapshot['sol_in_curve'],
+            'is_migrated': snapshot['is_migrated'],
+            'price_lamports_per_atomic': snapshot['price_lamports_per_atomic'],
+            'is_migrating': False,
+            'can_buy': True,
+            'from_websocket': False,
+            'from_chain': True,
+            'is_valid': True,
+            'needs_retry': False,
+            'source': 'chain',  # ✅ CHATGPT FIX #2
+            'curve_source': snapshot['source'],  # trade_event | account | chain
+            'slot': snapshot.get('slot'),
+        }
+        return curve_data
     
     def get_bonding_curve_data(self, mint: str, prefer_chain: bool = False) -> Optional[Dict]:
         """
@@ -136,11 +113,10 @@ class PumpFunDEX:
                     # - vTokensInBondingCurve: UI tokens (human-readable, NOT atomic!)
                     # We must convert BOTH to atomic units for price calculation
                     
-                    # Step 1: Get token decimals
-                    token_decimals = self.wallet.get_token_decimals(mint)
-                    if isinstance(token_decimals, tuple):
-                        token_decimals = token_decimals[0]
-                    if not token_decimals or token_decimals == 0:
+                    # Step 1: Get token decimals (cache / CreateV2 only - no RPC on the price path)
+                    token_decimals = self.wallet.decimals.get(mint)
+                    if not token_decimals:
+                        self.wallet.decimals.prefetch(mint)
                         token_decimals = 6  # PumpFun standard
                     
                     # ✅ CHATGPT WS FIX: Compute price in float to avoid early int flooring
@@ -156,8 +132,8 @@ class PumpFunDEX:
                     v_tokens_atomic = int(v_tokens * (10 ** token_decimals)) if v_tokens > 0 else 0
                     
                     # ✅ CHATGPT SANITY CHECK: Compare WS price to last chain price
-                    prev = self.last_good_prices.get(mint, {}).get('data')
-                    if prev and prev.get('source') == 'chain':
+                    prev = self.curves.get(mint, max_age=self.PRICE_CACHE_TTL)
+                    if prev and prev['is_valid']:
                         prev_p = prev.get('price_lamports_per_atomic') or 0.0
                         cur_p = price_lamports_per_atomic or 0.0
                         # If WS price is 50x higher/lower than last chain price, ignore this frame
@@ -166,9 +142,9 @@ class PumpFunDEX:
                                 f"WS price out-of-range vs chain "
                                 f"(ws={cur_p:.10f}, chain={prev_p:.10f}) — ignoring WS frame"
                             )
-                            cached = self.last_good_prices[mint]['data'].copy()
+                            cached = self._chain_curve_data(prev, mint)
                             cached['is_stale'] = True
-                            cached['stale_age_seconds'] = time.time() - self.last_good_prices[mint]['timestamp']
+                            cached['stale_age_seconds'] = prev['age']
                             return cached
                     
                     logger.debug(
@@ -195,12 +171,6 @@ class PumpFunDEX:
                         'source': 'ws'  # ✅ CHATGPT FIX #2
                     }
                     
-                    # Save to persistent cache
-                    self.last_good_prices[mint] = {
-                        'data': curve_data.copy(),
-                        'timestamp': time.time()
-                    }
-                    
                     logger.debug(f"Using WebSocket data for {mint[:8]}... (age: {data_age:.1f}s)")
                     return curve_data
             
@@ -210,63 +180,26 @@ class PumpFunDEX:
             else:
                 logger.debug(f"WebSocket data expired for {mint[:8]}..., querying chain via Helius")
             
-            mint_pubkey = Pubkey.from_string(mint)
-            bonding_curve, _ = self.derive_bonding_curve_pda(mint_pubkey)
-            
-            # Query the bonding curve account
-            response = self.client.get_account_info(bonding_curve)
-            
-            if response.value and response.value.data:
-                # Parse the actual account data
-                parsed_data = self._parse_bonding_curve_account(response.value.data)
-                
-                if parsed_data:
-                    # Successfully parsed real chain data (already in atomic units)
-                    parsed_data['bonding_curve'] = str(bonding_curve)
-                    
-                    # ✅ Add explicit price field for consistency
-                    parsed_data['price_lamports_per_atomic'] = (
-                        parsed_data['virtual_sol_reserves'] / parsed_data['virtual_token_reserves']
-                        if parsed_data['virtual_token_reserves'] > 0 else 0
-                    )
-                    
-                    parsed_data['is_migrating'] = False
-                    parsed_data['can_buy'] = True
-                    parsed_data['from_websocket'] = False
-                    parsed_data['needs_retry'] = False
-                    parsed_data['source'] = 'chain'  # ✅ CHATGPT FIX #2
-                    
-                    # Cache it
-                    self.bonding_curves_cache[mint] = {
-                        'data': parsed_data,
-                        'timestamp': time.time()
-                    }
-                    
-                    # Save to persistent cache
-                    self.last_good_prices[mint] = {
-                        'data': parsed_data.copy(),
-                        'timestamp': time.time()
-                    }
-                    
-                    logger.info(f"✅ Real-time chain data for {mint[:8]}...: {parsed_data['sol_in_curve']:.2f} SOL")
-                    return parsed_data
-                else:
-                    logger.warning(f"Failed to parse bonding curve data for {mint[:8]}...")
-            else:
-                logger.debug(f"No bonding curve account found for {mint[:8]}...")
-            
-            # Check persistent cache as last resort
-            if mint in self.last_good_prices:
-                cached_price = self.last_good_prices[mint]
-                cache_age = time.time() - cached_price['timestamp']
-                
-                if cache_age < self.PRICE_CACHE_TTL:
-                    logger.info(f"Using last good price for {mint[:8]}... (age: {cache_age:.0f}s)")
-                    price_data = cached_price['data'].copy()
-                    price_data['is_stale'] = True
-                    price_data['stale_age_seconds'] = cache_age
-                    price_data['needs_retry'] = False
-                    return price_data
+            # Streamed state and the batched per-tick refresh are already on-chain truth
+            snapshot = self.curves.get(mint, max_age=self.CHAIN_FRESH_TTL)
+            if snapshot and snapshot['is_valid']:
+                logger.debug(f"Curve store hit for {mint[:8]}... ({snapshot['source']}, {snapshot['age']:.1f}s old)")
+                return self._chain_curve_data(snapshot, mint)
+            
+            snapshot = self.curves.fetch(mint)
+            if snapshot and snapshot['is_valid']:
+                logger.info(f"✅ Real-time chain data for {mint[:8]}...: {snapshot['sol_in_curve']:.2f} SOL")
+                return self._chain_curve_data(snapshot, mint)
+            logger.debug(f"No bonding curve account found for {mint[:8]}...")
+            
+            # Last known curve state as last resort
+            cached = self.curves.get(mint, max_age=self.PRICE_CACHE_TTL)
+            if cached and cached['is_valid']:
+                logger.info(f"Using last good price for {mint[:8]}... (age: {cached['age']:.0f}s)")
+                price_data = self._chain_curve_data(cached, mint)
+                price_data['is_stale'] = True
+                price_data['stale_age_seconds'] = cached['age']
+                return price_data
             
             # No data available at all
             logger.warning(f"❌ No price data available for {mint[:8]}... - cannot calculate P&L")
@@ -275,13 +208,13 @@ class PumpFunDEX:
         except Exception as e:
             logger.error(f"Failed to get bonding curve data for {mint[:8]}...: {e}")
             
-            # Check persistent cache on error
-            if mint in self.last_good_prices:
-                cached_price = self.last_good_prices[mint]
+            # Last known curve state on error
+            cached = self.curves.get(mint)
+            if cached and cached['is_valid']:
                 logger.info(f"Error fetching price, using last good price")
-                price_data = cached_price['data'].copy()
+                price_data = self._chain_curve_data(cached, mint)
                 price_data['is_stale'] = True
-                price_data['needs_retry'] = False
+                price_data['stale_age_seconds'] = cached['age']
                 return price_data
             
             return None
@@ -0,0 +1,198 @@
+"""
+Endpoint Health Registry - Shared scoring for every outbound route (Jito, RPC, PumpPortal)
+EWMA latency + success rate, decaying failure penalties, circuit breakers, adaptive timeouts
+"""
+
+import asyncio
+import logging
+import math
+import random
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class EndpointHealthRegistry:
+    """Scores endpoints from observed sends + background probes"""
+
+    EWMA_ALPHA = 0.2          # Weight of newest sample
+    FAILURE_PENALTY_MS = 500  # Added to score per failure, decays over time
+    DEFAULT_LATENCY_MS = 500  # Assumed latency for endpoints with no data
+
+    def __init__(self):
+        self.endpoints: Dict[str, dict] = {}
+        self._probes: Dict[str, Callable] = {}
+        self._probe_task = None
+        self._session = None
+
+    def _state(self, endpoint: str) -> dict:
+        if endpoint not in self.endpoints:
+            self.endpoints[endpoint] = {
+                'ewma_latency_ms': None,
+                'success_rate': 1.0,
+                'penalty_ms': 0.0,
+                'penalty_at': time.time(),
+                'samples': deque(maxlen=100),  # Successful latencies for percentile timeouts
+                'consecutive_failures': 0,
+                'breaker_trips': 0,
+                'open_until': 0.0,
+                'requests': 0,
+                'failures': 0,
+            }
+        return self.endpoints[endpoint]
+
+    def register(self, endpoint: str, probe: Optional[Callable] = None):
+        """Track an endpoint; probe is an async fn(endpoint) -> bool used in background"""
+        self._state(endpoint)
+        if probe is not None:
+            self._probes[endpoint] = probe
+
+    def _decayed_penalty(self, state: dict, now: float) -> float:
+        from config import HEALTH_PENALTY_HALF_LIFE
+
+        elapsed = now - state['penalty_at']
+        return state['penalty_ms'] * math.pow(0.5, elapsed / HEALTH_PENALTY_HALF_LIFE)
+
+    def record(self, endpoint: str, latency_ms: float, success: bool):
+        """Record the outcome of a request to an endpoint"""
+        from config import HEALTH_BREAKER_FAILURES, HEALTH_BREAKER_COOLDOWN
+
+        state = self._state(endpoint)
+        now = time.time()
+        state['requests'] += 1
+
+        alpha = self.EWMA_ALPHA
+        state['success_rate'] = (1 - alpha) * state['success_rate'] + alpha * (1.0 if success else 0.0)
+
+        if success:
+            if state['ewma_latency_ms'] is None:
+                state['ewma_latency_ms'] = latency_ms
+            else:
+                state['ewma_latency_ms'] = (1 - alpha) * state['ewma_latency_ms'] + alpha * latency_ms
+            state['samples'].append(latency_ms)
+            state['consecutive_failures'] = 0
+            if state['open_until']:
+                logger.info(f"🟢 Circuit closed: {self._label(endpoint)}")
+            state['open_until'] = 0.0
+            state['breaker_trips'] = 0
+            return
+
+        state['failures'] += 1
+        state['penalty_ms'] = self._decayed_penalty(state, now) + self.FAILURE_PENALTY_MS
+        state['penalty_at'] = now
+        state['consecutive_failures'] += 1
+        # Tripped before and the cooldown has elapsed - this failure was the half-open trial
+        half_open = bool(state['open_until']) and now >= state['open_until']
+
+        if half_open or state['consecutive_failures'] >= HEALTH_BREAKER_FAILURES:
+            # Exponential backoff on repeated trips - a failed half-open trial re-trips at once
+            state['breaker_trips'] += 1
+            cooldown = min(60.0, HEALTH_BREAKER_COOLDOWN * (2 ** (state['breaker_trips'] - 1)))
+            state['open_until'] = now + cooldown
+            state['consecutive_failures'] = 0
+            logger.warning(f"🔴 Circuit open for {cooldown:.0f}s: {self._label(endpoint)}")
+
+    def is_available(self, endpoint: str) -> bool:
+        """Closed circuit, or open circuit whose cooldown has elapsed (half-open trial)"""
+        state = self._state(endpoint)
+        return time.time() >= state['open_until']
+
+    def score(self, endpoint: str) -> float:
+        """Lower is better - latency plus decayed penalty, scaled by success rate"""
+        state = self._state(endpoint)
+        latency = state['ewma_latency_ms'] if state['ewma_latency_ms'] is not None else self.DEFAULT_LATENCY_MS
+        penalty = self._decayed_penalty(state, time.time())
+        return (latency + penalty) / max(state['success_rate'], 0.05)
+
+    def rank(self, endpoints: List[str]) -> List[str]:
+        """Endpoints best-first, open circuits excluded (unless every circuit is open)"""
+        available = [ep for ep in endpoints if self.is_available(ep)]
+        if not available:
+            available = list(endpoints)
+        return sorted(available, key=self.score)
+
+    def pick(self, endpoints: List[str]) -> str:
+        """Best endpoint - spread between the top two when their scores are close"""
+        ranked = self.rank(endpoints)
+        if len(ranked) >= 2 and self.score(ranked[1]) <= self.score(ranked[0]) * 1.2:
+            return random.choice(ranked[:2])
+        return ranked[0]
+
+    def timeout_for(self, endpoint: str, default: float, floor: float, ceiling: float) -> float:
+        """Adaptive timeout (seconds) from the endpoint's observed p95 latency"""
+        samples = self._state(endpoint)['samples']
+        if len(samples) < 10:
+            return default
+        ordered = sorted(samples)
+        p95_ms = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return max(floor, min(ceiling, p95_ms * 2.0 / 1000))
+
+    async def start(self):
+        """Start background probes"""
+        if self._probe_task is None:
+            self._probe_task = asyncio.create_task(self._probe_loop())
+            logger.info(f"🩺 Endpoint health probes started ({len(self._probes)} probed endpoints)")
+
+    async def _probe_loop(self):
+        from config import HEALTH_PROBE_INTERVAL
+
+        while True:
+            await asyncio.sleep(HEALTH_PROBE_INTERVAL)
+            await asyncio.gather(
+                *(self._run_probe(ep, probe) for ep, probe in self._probes.items()),
+                return_exceptions=True
+            )
+
+    async def _run_probe(self, endpoint: str, probe: Callable):
+        start = time.perf_counter()
+        try:
+            ok = await probe(endpoint)
+        except Exception as e:
+            logger.debug(f"Probe failed for {self._label(endpoint)}: {e}")
+            ok = False
+        self.record(endpoint, (time.perf_counter() - start) * 1000, bool(ok))
+
+    async def rpc_probe(self, endpoint: str) -> bool:
+        """Light getSlot probe for JSON-RPC endpoints"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=8, ttl_dns_cache=300))
+        payload = {"jsonrpc": "2.0", "id": 1, "method": "getSlot", "params": []}
+        async with self._session.post(endpoint, json=payload, timeout=aiohttp.ClientTimeout(total=3.0)) as response:
+            result = await response.json(content_type=None)
+            return "result" in result
+
+    @staticmethod
+    def _label(endpoint: str) -> str:
+        parts = endpoint.split('/')
+        return parts[2].split('?')[0] if len(parts) > 2 else endpoint
+
+    def get_stats(self) -> dict:
+        """Per-endpoint health snapshot"""
+        now = time.time()
+        stats = {}
+        for endpoint, state in self.endpoints.items():
+            stats[self._label(endpoint)] = {
+                'ewma_latency_ms': state['ewma_latency_ms'] or 0.0,
+                'success_rate_percent': state['success_rate'] * 100,
+                'penalty_ms': self._decayed_penalty(state, now),
+                'score': self.score(endpoint),
+                'circuit': 'open' if now < state['open_until'] else 'closed',
+                'requests': state['requests'],
+                'failures': state['failures'],
+            }
+        return stats
+
+    async def close(self):
+        if self._probe_task and not self._probe_task.done():
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+        self._probe_task = None
+        if self._session and not self._session.closed:
+            await self._session.close()
@@ -0,0 +1,267 @@
+"""
+Exit Armer - A ready-signed full-exit TX for every open position
+Each position keeps one sell TX (compute budget + sell + Jito tip, min output 1 lamport)
+signed against the cached blockhash. It is re-signed whenever the blockhash or the
+remaining token amount changes, so an exit decision is a single send.
+With EXIT_NONCE_ENABLED a position leases a durable nonce instead - its exit is signed
+once and only re-signed when the amount changes.
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from solders.pubkey import Pubkey
+from solana.rpc.types import TxOpts
+
+from cu_profiler import instruction_shape
+
+logger = logging.getLogger(__name__)
+
+LATENCY_SAMPLES = 200  # Decision-to-wire samples kept per path
+MAX_DURABLE_SIGS = 100  # Fired durable exits remembered for invalidation
+
+
+class ExitArmer:
+    """
+    Pre-signed exits keyed by mint
+    amount_source() returns the UI token amount to sell: None disarms the mint,
+    0 keeps it registered without a TX (e.g. buy fill still pending)
+    """
+
+    def __init__(self, builder):
+        self.builder = builder
+        self._sources: Dict[str, Callable[[], Optional[float]]] = {}
+        self._accounts: Dict[str, tuple] = {}  # mint -> (mint, bonding_curve, abc, user_ata, creator_vault)
+        self._leases: Dict[str, tuple] = {}  # mint -> (nonce account, nonce) in durable mode
+        self._fired = set()  # Mints whose durable exit was sent (nonce may have advanced)
+        self._durable_sigs: Dict[str, tuple] = {}  # Fired durable exit signature -> (mint, nonce account)
+        self.armed: Dict[str, dict] = {}
+
+        self.latency_ms = {
+            'armed': deque(maxlen=LATENCY_SAMPLES),
+            'built': deque(maxlen=LATENCY_SAMPLES),
+        }
+        self.stats = {
+            'signs': 0,
+            'durable_signs': 0,
+            'sign_errors': 0,
+            'fired': 0,
+            'sent': 0,
+            'amount_misses': 0,
+            'stale_misses': 0,
+            'unarmed_misses': 0,
+        }
+
+        builder.add_blockhash_listener(self._on_blockhash)
+
+    # ===== ARMING =====
+
+    def arm(self, mint: str, creator: str, amount_source: Callable[[], Optional[float]]):
+        """Register a position - its exit is signed as soon as the amount and blockhash are known"""
+        from config import EXIT_PREARM_ENABLED, EXIT_NONCE_ENABLED
+
+        if not EXIT_PREARM_ENABLED or not creator:
+            return
+        b = self.builder
+        mint_pubkey = Pubkey.from_string(mint)
+        bonding_curve, _ = b.derive_bonding_curve_pda(mint_pubkey)
+        self._accounts[mint] = (
+            mint_pubkey,
+            bonding_curve,
+            b.derive_associated_token_account(bonding_curve, mint_pubkey),
+            b.derive_associated_token_account(b.wallet.pubkey, mint_pubkey),
+            b.derive_creator_vault_pda(Pubkey.from_string(creator)),
+        )
+        self._sources[mint] = amount_source
+        if EXIT_NONCE_ENABLED and mint not in self._leases:
+            lease = b.nonces.acquire(mint)
+            if lease:
+                self._leases[mint] = lease
+        self.refresh(mint)
+
+    def disarm(self, mint: str):
+        self._sources.pop(mint, None)
+        self._accounts.pop(mint, None)
+        self.armed.pop(mint, None)
+        lease = self._leases.pop(mint, None)
+        if lease:
+            self.builder.nonces.release(lease[0], fired=mint in self._fired)
+        self._fired.discard(mint)
+
+    def refresh(self, mint: str, force: bool = False):
+        """Re-sign if the amount or blockhash moved since the armed TX (force = new blockhash)"""
+        source = self._sources.get(mint)
+        if source is None:
+            return
+        amount_ui = source()
+        if amount_ui is None:
+            self.disarm(mint)
+            return
+
+        token_amount = int(amount_ui * 1e6)
+        lease = self._leases.get(mint)
+        blockhash = lease[1] if lease else self.builder._cached_blockhash
+        if token_amount <= 0 or blockhash is None:
+            self.armed.pop(mint, None)
+            return
+
+        current = self.armed.get(mint)
+        if current and current['token_amount'] == token_amount and current['blockhash'] == blockhash:
+            if not force or lease:
+                return  # Durable exits do not expire with the blockhash
+        self._sign(mint, token_amount, blockhash)
+
+    def _on_blockhash(self, blockhash, slot):
+        for mint in list(self._sources):
+            self.refresh(mint, force=True)
+
+    def _sign(self, mint: str, token_amount: int, blockhash):
+        from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
+        from config import EXIT_PREARM_URGENCY, JITO_TIP_SELL_SOL
+
+        b = self.builder
+        try:
+            mint_pubkey, bonding_curve, abc, user_ata, creator_vault = self._accounts[mint]
+            sell_ix = b.build_sell_instruction(
+                mint_pubkey, bonding_curve, abc, user_ata, creator_vault, token_amount, 1
+            )
+
+            # Same shape as a fan-out sell - competitive on Jito and RPC alike
+            shape = instruction_shape("sell", has_tip=True)
+            cu_limit = b.cu_profiler.limit_for(shape)
+            cu_price = b.fee_oracle.get_fee(EXIT_PREARM_URGENCY)
+            tip_sol = b.landing.choose_tip(EXIT_PREARM_URGENCY, JITO_TIP_SELL_SOL)
+            tip_lamports = int(tip_sol * 1e9)
+
+            instructions = [
+                set_compute_unit_limit(cu_limit),
+                set_compute_unit_price(cu_price),
+                sell_ix,
+                b._build_jito_tip_instruction(tip_lamports),
+            ]
+            lease = self._leases.get(mint)
+            if lease:
+                tx = b._sign_with_nonce(instructions, *lease)
+                self.stats['durable_signs'] += 1
+            else:
+                tx = b._sign_transaction(instructions, blockhash)
+
+            self.armed[mint] = {
+                'tx_bytes': bytes(tx),
+                'signature': str(tx.signatures[0]),
+                'token_amount': token_amount,
+                'blockhash': blockhash,
+                'signed_at': time.time(),
+                'shape': shape,
+                'cu_limit': cu_limit,
+                'cu_price': cu_price,
+                'tip_lamports': tip_lamports,
+                'durable': lease is not None,
+            }
+            self.stats['signs'] += 1
+        except Exception as e:
+            self.stats['sign_errors'] += 1
+            self.armed.pop(mint, None)
+            logger.warning(f"⚠️ Exit arm failed for {mint[:8]}...: {e}")
+
+    # ===== FIRING =====
+
+    def ready(self, mint: str, token_amount_ui: float) -> bool:
+        """Armed TX exists, sells exactly this amount and its blockhash is still usable"""
+        from config import EXIT_PREARM_MAX_AGE
+
+        armed = self.armed.get(mint)
+        if not armed:
+            self.stats['unarmed_misses'] += 1
+            return False
+        if armed['token_amount'] != int(token_amount_ui * 1e6):
+            self.stats['amount_misses'] += 1
+            return False
+        if not armed['durable'] and time.time() - armed['signed_at'] > EXIT_PREARM_MAX_AGE:
+            self.stats['stale_misses'] += 1
+            return False
+        return True
+
+    async def fire(self, mint: str, decided_at: float = None, guard=None) -> Optional[str]:
+        """Send the armed exit as-is (call ready() first) - returns the signature or None"""
+        from config import JITO_ENABLED, SUBMIT_MODE, EXIT_PREARM_URGENCY
+
+        armed = self.armed.pop(mint, None)
+        if not armed:
+            return None
+        if guard is not None and not guard.claim("local"):
+            logger.info(f"🛑 {mint[:8]}... already submitted by another path - skipping armed exit")
+            return None
+
+        b = self.builder
+        self.stats['fired'] += 1
+        if armed['durable']:
+            self._fired.add(mint)
+        self.record_wire('armed', decided_at)
+        tx_bytes = armed['tx_bytes']
+        start = time.time()
+
+        try:
+            sig, route = None, None
+            if SUBMIT_MODE == 'fanout':
+                sig, route = await b.submitter.submit(tx_bytes, label="sell"), "fanout"
+            else:
+                if JITO_ENABLED and b.landing.rank_routes(EXIT_PREARM_URGENCY, ["jito", "rpc"])[0] == "jito":
+                    sig, route = await b._send_via_jito(tx_bytes), "jito"
+                if not sig:
+                    opts = TxOpts(skip_preflight=True, preflight_commitment="processed")
+                    sig, route = b._send_via_rpc(tx_bytes, opts), "rpc"
+        except Exception as e:
+            logger.error(f"❌ Armed exit send failed for {mint[:8]}...: {e}")
+            return None
+
+        if not sig:
+            logger.warning(f"⚠️ Armed exit for {mint[:8]}...: no route accepted")
+            return None
+
+        self.stats['sent'] += 1
+        if armed['durable'] and mint in self._leases:
+            self._durable_sigs[sig] = (mint, self._leases[mint][0])
+            if len(self._durable_sigs) > MAX_DURABLE_SIGS:
+                del self._durable_sigs[next(iter(self._durable_sigs))]
+        b.landing.track(sig, route, armed['tip_lamports'], EXIT_PREARM_URGENCY)
+        b.rebroadcaster.add(sig, tx_bytes, label="sell", durable=armed['durable'])
+        b.cu_profiler.note_submission(sig, armed['shape'], armed['cu_limit'], armed['cu_price'])
+        logger.info(
+            f"✅ ARMED{' durable' if armed['durable'] else ''} exit for {mint[:8]}... via {route} in {(time.time() - start) * 1000:.1f}ms "
+            f"(signed {time.time() - armed['signed_at']:.1f}s ago): {sig}"
+        )
+        return sig
+
+    async def invalidate(self, signature: str) -> Optional[bool]:
+        """
+        Make a fired durable exit unable to land by advancing its nonce
+        None = not a durable exit (expires with its blockhash), True = advanced, False = advance failed
+        """
+        entry = self._durable_sigs.get(signature)
+        if entry is None:
+            return None
+        if not await self.builder.nonces.invalidate(entry[1], entry[0]):
+            return False
+        self._durable_sigs.pop(signature, None)
+        return True
+
+    def record_wire(self, path: str, decided_at: Optional[float]):
+        """Decision-to-wire latency for the armed or freshly built exit path"""
+        if decided_at:
+            self.latency_ms[path].append((time.time() - decided_at) * 1000)
+
+    def get_stats(self) -> dict:
+        def p50(samples):
+            return sorted(samples)[len(samples) // 2] if samples else None
+
+        return {
+            'positions': len(self._sources),
+            'armed': len(self.armed),
+            'durable': len(self._leases),
+            **self.stats,
+            'armed_wire_p50_ms': p50(self.latency_ms['armed']),
+            'built_wire_p50_ms': p50(self.latency_ms['built']),
+        }
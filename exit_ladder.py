@@ -0,0 +1,234 @@
+"""
+Exit Retry Ladder - Resubmit an exit only once its previous send can no longer land
+Each rung waits for our own TradeEvent or a processed status. The next rung (fresh blockhash,
+higher tip / priority fee, wider slippage) goes out only on an explicit failed status, or once
+the previous TX's blockhash has expired (BLOCKHASH_VALID_SLOTS past its submit slot). A durable
+nonce TX never expires by slot - its nonce is advanced (invalidate) before the ladder moves on.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+RECENT_LADDERS = 50
+MAX_SLIPPAGE_BPS = 9900
+SLOT_SECONDS = 0.4  # Slot time used when no slot source is available, and the expiry check tick
+INVALIDATE_RETRY_SLOTS = 10  # Wait before retrying a nonce advance that did not confirm
+
+
+class ExitRetryLadder:
+    """Watches every signature sent for one exit - the first to land wins, whichever rung sent it"""
+
+    def __init__(
+        self,
+        confirmations,
+        fills,
+        slot_source: Optional[Callable[[], Optional[int]]] = None
+    ):
+        self.confirmations = confirmations
+        self.fills = fills
+        self.slot_source = slot_source or (lambda: None)
+
+        self.recent = deque(maxlen=RECENT_LADDERS)
+        self.stats = {
+            'ladders': 0,
+            'succeeded': 0,
+            'exhausted': 0,
+            'resubmits': 0,
+            'invalidations': 0,
+            'outcomes': {},  # outcome -> count (filled, landed, failed, expired, timeout, superseded, send_failed)
+            'rung_wins': {},  # rung -> exits that landed from that rung's TX
+            'detect_ms_total': 0.0,
+            'detect_samples': 0,
+        }
+
+    @staticmethod
+    def escalation(rung: int, base_slippage_bps: int) -> dict:
+        """Send parameters for a rung (rung 0 is the original send)"""
+        from config import EXIT_RETRY_FEE_STEP, EXIT_RETRY_SLIPPAGE_STEP_BPS
+
+        return {
+            'rung': rung,
+            'fee_multiplier': EXIT_RETRY_FEE_STEP ** rung,
+            'slippage_bps': min(MAX_SLIPPAGE_BPS, base_slippage_bps + rung * EXIT_RETRY_SLIPPAGE_STEP_BPS),
+            'fresh_blockhash': rung > 0,
+        }
+
+    def _new_rung(self, rung: int, signature: Optional[str]) -> dict:
+        from config import BLOCKHASH_VALID_SLOTS
+
+        return {
+            'rung': rung,
+            'signature': signature,
+            'sent_at': time.time(),
+            'submit_slot': self.slot_source(),
+            'valid_slots': BLOCKHASH_VALID_SLOTS,
+            'outcome': None,
+        }
+
+    def _expired(self, rung: dict) -> bool:
+        if rung['signature'] is None:
+            return time.time() - rung['sent_at'] >= SLOT_SECONDS  # Nothing on the wire - retry after a tick
+        slot = self.slot_source()
+        if slot is not None and rung['submit_slot'] is not None:
+            return slot - rung['submit_slot'] >= rung['valid_slots']
+        return time.time() - rung['sent_at'] >= rung['valid_slots'] * SLOT_SECONDS
+
+    async def run(
+        self,
+        key: str,
+        signature: str,
+        resubmit: Callable[[dict], Awaitable[Optional[str]]],
+        base_slippage_bps: int = 9500,
+        invalidate: Optional[Callable[[str], Awaitable[Optional[bool]]]] = None
+    ) -> dict:
+        """
+        Follow an exit from its first signature - resubmit(escalation) sends the next rung
+        invalidate(signature) advances a durable nonce before a silently expired send is
+        replaced: None = not durable, True = advanced, False = retry later
+        Returns {'signature', 'success', 'rungs'} (signature = winner, or the last one sent)
+        Every rung records its outcome, detection latency and resubmit latency
+        """
+        from config import EXIT_RETRY_MAX_RUNGS, EXIT_RETRY_BUDGET_SECONDS
+
+        self.stats['ladders'] += 1
+        start = time.time()
+        watchers = {}  # task -> (signature, kind)
+        rungs = [self._new_rung(0, signature)]
+        winner = None
+
+        def watch(sig: str):
+            remaining = max(1.0, EXIT_RETRY_BUDGET_SECONDS - (time.time() - start))
+            watchers[asyncio.create_task(self.fills.wait(sig, remaining))] = (sig, 'fill')
+            watchers[asyncio.create_task(
+                self.confirmations.wait(sig, "processed", timeout=remaining)
+            )] = (sig, 'status')
+
+        def drain(done, current: dict) -> Optional[str]:
+            nonlocal winner
+            outcome = None
+            for task in done:
+                sig, kind = watchers.pop(task)
+                result = task.result()
+                if kind == 'fill' and result:
+                    winner, outcome = sig, 'filled'
+                elif kind == 'status' and result['status'] == 'processed':
+                    winner, outcome = sig, 'landed'
+                elif kind == 'status' and result['status'] == 'failed' and sig == current['signature']:
+                    outcome = 'failed'
+                if winner:
+                    break
+            return outcome
+
+        watch(signature)
+        try:
+            while True:
+                current = rungs[-1]
+                outcome = None
+
+                # Escalate only on an explicit failure or once the current TX can no longer land
+                while outcome is None and not winner:
+                    if time.time() - start >= EXIT_RETRY_BUDGET_SECONDS:
+                        break
+                    if self._expired(current):
+                        if current['signature'] is None or invalidate is None:
+                            break
+                        released = await invalidate(current['signature'])
+                        # The TX may have landed while the nonce advance was confirming
+                        outcome = drain([t for t in list(watchers) if t.done()], current)
+                        if released is False and outcome is None and not winner:
+                            current['valid_slots'] += INVALIDATE_RETRY_SLOTS
+                            continue
+                        if released:
+                            self.stats['invalidations'] += 1
+                        break
+                    if not watchers:
+                        await asyncio.sleep(SLOT_SECONDS)
+                        continue
+                    done, _ = await asyncio.wait(set(watchers), timeout=SLOT_SECONDS, return_when=asyncio.FIRST_COMPLETED)
+                    outcome = drain(done, current)
+
+                if current['signature'] is not None:
+                    # An earlier rung's TX landing while this one is pending supersedes it
+                    # Leaving without an outcome before expiry means the budget ran out with the send still live
+                    current['outcome'] = 'superseded' if winner and winner != current['signature'] else (
+                        outcome or ('expired' if self._expired(current) else 'timeout')
+                    )
+                    current['detect_ms'] = (time.time() - current['sent_at']) * 1000
+                    self._record_outcome(current)
+
+                if winner:
+                    win_rung = next(r['rung'] for r in rungs if r['signature'] == winner)
+                    self.stats['rung_wins'][win_rung] = self.stats['rung_wins'].get(win_rung, 0) + 1
+                    self.stats['succeeded'] += 1
+                    return self._finish(key, winner, True, rungs, start)
+
+                if len(rungs) > EXIT_RETRY_MAX_RUNGS or time.time() - start >= EXIT_RETRY_BUDGET_SECONDS:
+                    self.stats['exhausted'] += 1
+                    logger.error(f"❌ Exit ladder exhausted for {key} after {len(rungs)} sends")
+                    last_sent = next(r['signature'] for r in reversed(rungs) if r['signature'])
+                    return self._finish(key, last_sent, False, rungs, start)
+
+                params = self.escalation(len(rungs), base_slippage_bps)
+                logger.warning(
+                    f"🪜 {key} rung {params['rung']}: previous {current['outcome'] or 'send_failed'} - resubmitting "
+                    f"x{params['fee_multiplier']:.2f} fee, {params['slippage_bps'] / 100:.0f}% slippage"
+                )
+                send_start = time.time()
+                try:
+                    new_sig = await resubmit(params)
+                except Exception as e:
+                    logger.warning(f"⚠️ Exit ladder resubmit error for {key}: {e}")
+                    new_sig = None
+                self.stats['resubmits'] += 1
+                rung = self._new_rung(params['rung'], new_sig)
+                rung.update({
+                    'send_ms': (time.time() - send_start) * 1000,
+                    'fee_multiplier': params['fee_multiplier'],
+                    'slippage_bps': params['slippage_bps'],
+                })
+                rungs.append(rung)
+                if new_sig:
+                    watch(new_sig)
+                else:
+                    # Nothing new on the wire - earlier sends stay watched for one more tick
+                    rung['outcome'] = 'send_failed'
+                    self._record_outcome(rung)
+        finally:
+            for task in watchers:
+                task.cancel()
+
+    def _record_outcome(self, rung: dict):
+        outcomes = self.stats['outcomes']
+        outcomes[rung['outcome']] = outcomes.get(rung['outcome'], 0) + 1
+        if rung['outcome'] in ('failed', 'filled', 'landed') and 'detect_ms' in rung:
+            self.stats['detect_ms_total'] += rung['detect_ms']
+            self.stats['detect_samples'] += 1
+
+    def _finish(self, key: str, signature: str, success: bool, rungs: list, start: float) -> dict:
+        summary = {
+            'key': key,
+            'signature': signature,
+            'success': success,
+            'total_ms': (time.time() - start) * 1000,
+            'rungs': [{k: v for k, v in r.items() if k not in ('sent_at', 'submit_slot')} for r in rungs],
+        }
+        self.recent.append(summary)
+        return summary
+
+    def get_stats(self) -> dict:
+        s = self.stats
+        return {
+            'ladders': s['ladders'],
+            'succeeded': s['succeeded'],
+            'exhausted': s['exhausted'],
+            'resubmits': s['resubmits'],
+            'invalidations': s['invalidations'],
+            'outcomes': dict(s['outcomes']),
+            'rung_wins': dict(s['rung_wins']),
+            'avg_detect_ms': (s['detect_ms_total'] / s['detect_samples']) if s['detect_samples'] else 0.0,
+        }
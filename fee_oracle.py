@@ -0,0 +1,154 @@
+"""
+Priority Fee Oracle - Background sampling of getRecentPrioritizationFees
+Rolling per-slot fees for the PumpFun program + accounts we write; zero RPC on the send path
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class PriorityFeeOracle:
+    """Keeps rolling fee percentiles (micro-lamports per CU) per urgency class"""
+
+    MAX_WATCHED_ACCOUNTS = 24  # RPC accepts up to 128 - keep the request light
+
+    def __init__(self, rpc_url: str = None, base_accounts: Optional[List[str]] = None):
+        from config import RPC_ENDPOINT, PUMPFUN_PROGRAM_ID, PUMPFUN_FEE_RECIPIENT
+
+        self.rpc_url = (rpc_url or RPC_ENDPOINT).replace('wss://', 'https://').replace('ws://', 'http://')
+        self.base_accounts = base_accounts or [str(PUMPFUN_PROGRAM_ID), str(PUMPFUN_FEE_RECIPIENT)]
+
+        # Recently written accounts (bonding curves of our positions) - most recent last
+        self._watched: "OrderedDict[str, None]" = OrderedDict()
+
+        # slot -> fee (micro-lamports/CU), trimmed to the configured window
+        self._slot_fees: Dict[int, int] = {}
+        self._percentiles: Dict[int, int] = {}
+
+        self._session = None
+        self._task = None
+        self.samples_taken = 0
+        self.sample_failures = 0
+
+    def watch_account(self, pubkey: str):
+        """Include an account we are about to write in the fee sample"""
+        self._watched.pop(pubkey, None)
+        self._watched[pubkey] = None
+        while len(self._watched) > self.MAX_WATCHED_ACCOUNTS:
+            self._watched.popitem(last=False)
+
+    async def start(self):
+        if self._task is None:
+            await self._sample()
+            self._task = asyncio.create_task(self._sample_loop())
+            logger.info(f"💸 Priority fee oracle started (p50={self._percentiles.get(50, 0):,} µL/CU)")
+
+    async def _sample_loop(self):
+        from config import PRIORITY_FEE_SAMPLE_INTERVAL
+
+        while True:
+            await asyncio.sleep(PRIORITY_FEE_SAMPLE_INTERVAL)
+            await self._sample()
+
+    async def _sample(self):
+        """One getRecentPrioritizationFees call, folded into the rolling window"""
+        from config import PRIORITY_FEE_WINDOW_SLOTS
+
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=2, ttl_dns_cache=300))
+
+        accounts = self.base_accounts + list(self._watched.keys())
+        payload = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "getRecentPrioritizationFees",
+            "params": [accounts]
+        }
+
+        try:
+            async with self._session.post(
+                self.rpc_url,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=3.0)
+            ) as response:
+                result = await response.json(content_type=None)
+
+            entries = result.get("result") or []
+            for entry in entries:
+                self._slot_fees[int(entry["slot"])] = int(entry["prioritizationFee"])
+
+            if self._slot_fees:
+                newest = max(self._slot_fees)
+                self._slot_fees = {
+                    slot: fee for slot, fee in self._slot_fees.items()
+                    if slot > newest - PRIORITY_FEE_WINDOW_SLOTS
+                }
+                self._recompute()
+            self.samples_taken += 1
+
+        except Exception as e:
+            self.sample_failures += 1
+            logger.debug(f"Priority fee sample failed: {e}")
+
+    def _recompute(self):
+        ordered = sorted(self._slot_fees.values())
+        n = len(ordered)
+        self._percentiles = {
+            pct: ordered[min(n - 1, int(n * pct / 100))]
+            for pct in (25, 50, 75, 90, 95, 99)
+        }
+
+    def _percentile(self, pct: int) -> Optional[int]:
+        if not self._slot_fees:
+            return None
+        if pct in self._percentiles:
+            return self._percentiles[pct]
+        ordered = sorted(self._slot_fees.values())
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def has_data(self) -> bool:
+        return bool(self._slot_fees)
+
+    def get_fee(self, urgency: str = "buy") -> int:
+        """Compute unit price (micro-lamports/CU) for an urgency class - in-memory only"""
+        from config import (
+            PRIORITY_FEE_PERCENTILES, PRIORITY_FEE_DEFAULT_MICROLAMPORTS,
+            PRIORITY_FEE_MIN_MICROLAMPORTS, PRIORITY_FEE_MAX_MICROLAMPORTS,
+        )
+
+        fee = self._percentile(PRIORITY_FEE_PERCENTILES.get(urgency, PRIORITY_FEE_PERCENTILES['buy']))
+        if fee is None:
+            return PRIORITY_FEE_DEFAULT_MICROLAMPORTS
+        return max(PRIORITY_FEE_MIN_MICROLAMPORTS, min(PRIORITY_FEE_MAX_MICROLAMPORTS, fee))
+
+    def get_fee_sol(self, urgency: str, compute_units: int) -> float:
+        """Total priority fee in SOL for a given compute budget"""
+        return self.get_fee(urgency) * compute_units / 1e6 / 1e9
+
+    def get_stats(self) -> dict:
+        return {
+            'slots': len(self._slot_fees),
+            'percentiles': dict(self._percentiles),
+            'buy': self.get_fee("buy"),
+            'sell': self.get_fee("sell"),
+            'emergency': self.get_fee("emergency"),
+            'samples': self.samples_taken,
+            'failures': self.sample_failures,
+        }
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        if self._session and not self._session.closed:
+            await self._session.close()
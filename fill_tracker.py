@@ -0,0 +1,130 @@
+"""
+Fill Tracker - Exact fills from our own PumpFun TradeEvents in the logs stream
+HeliusLogsMonitor routes events where user == our wallet here; buy/sell paths await them
+by signature instead of fetching the transaction
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TOKEN_DECIMALS = 6  # PumpFun mints
+MAX_FILLS = 500
+
+
+class FillTracker:
+    """Signature -> fill record from our own TradeEvents, awaitable with a timeout"""
+
+    def __init__(self, wallet_pubkey, quoter=None):
+        self.wallet = str(wallet_pubkey)
+        self.quoter = quoter  # Re-quotes every fill to check our curve math against the chain
+
+        self.fills: Dict[str, dict] = {}
+        self._waiters: Dict[str, List[asyncio.Future]] = defaultdict(list)
+
+        self.stats = {
+            'own_events': 0,
+            'waits': 0,
+            'hits': 0,
+            'misses': 0,
+            'wait_ms_total': 0.0,
+            'reconciled': 0,
+            'network_fees_lamports': 0,
+        }
+
+    def is_ours(self, user: Optional[str]) -> bool:
+        return user == self.wallet
+
+    def on_trade_event(self, signature: str, event: dict, slot: int = None):
+        """Record one of our TradeEvents (called from the logs monitor)"""
+        sol = event['sol_lamports']
+        fees = event['fee_lamports'] + event['creator_fee_lamports']
+        # Curve-side SOL movement for the wallet - network fee and tips come from getTransaction
+        sol_delta_lamports = -(sol + fees) if event['is_buy'] else sol - fees
+
+        fill = dict(event)
+        fill.update({
+            'signature': signature,
+            'slot': slot,
+            'tokens': event['token_amount'] / 10 ** TOKEN_DECIMALS,
+            'sol_delta': sol_delta_lamports / 1e9,
+            'seen_at': time.time(),
+        })
+
+        self.fills[signature] = fill
+        if len(self.fills) > MAX_FILLS:
+            del self.fills[next(iter(self.fills))]
+        self.stats['own_events'] += 1
+
+        side = "BUY" if event['is_buy'] else "SELL"
+        logger.info(
+            f"🧾 Own {side} fill {event['mint'][:8]}: {fill['tokens']:,.0f} tokens, "
+            f"{fill['sol_delta']:+.6f} SOL (slot {slot})"
+        )
+
+        if self.quoter:
+            fill['quote_error_lamports'] = self.quoter.validate_trade(event)
+
+        for future in self._waiters.pop(signature, []):
+            if not future.done():
+                future.set_result(fill)
+
+    def get(self, signature: str) -> Optional[dict]:
+        return self.fills.get(signature)
+
+    async def wait(self, signature: str, timeout: float) -> Optional[dict]:
+        """Fill for signature, or None if no TradeEvent arrived in time (caller falls back to RPC)"""
+        self.stats['waits'] += 1
+        start = time.time()
+
+        fill = self.fills.get(signature)
+        if fill is None:
+            future = asyncio.get_running_loop().create_future()
+            self._waiters[signature].append(future)
+            try:
+                fill = await asyncio.wait_for(future, timeout=timeout)
+            except asyncio.TimeoutError:
+                fill = None
+            finally:
+                waiters = self._waiters.get(signature)
+                if waiters is not None:
+                    waiters[:] = [f for f in waiters if f is not future]
+                    if not waiters:
+                        self._waiters.pop(signature, None)
+
+        if fill is None:
+            self.stats['misses'] += 1
+        else:
+            self.stats['hits'] += 1
+            self.stats['wait_ms_total'] += (time.time() - start) * 1000
+        return fill
+
+    def record_reconciliation(self, signature: str, wallet_sol_delta: float) -> Optional[float]:
+        """
+        Compare the wallet's SOL delta from getTransaction with the event's curve-side delta
+        Returns network fee + tip paid in SOL (None if we have no fill for the signature)
+        """
+        fill = self.fills.get(signature)
+        if fill is None:
+            return None
+        network_fee = fill['sol_delta'] - wallet_sol_delta
+        fill['network_fee_sol'] = network_fee
+        self.stats['reconciled'] += 1
+        self.stats['network_fees_lamports'] += int(network_fee * 1e9)
+        return network_fee
+
+    def get_stats(self) -> dict:
+        s = self.stats
+        return {
+            'own_events': s['own_events'],
+            'waits': s['waits'],
+            'hits': s['hits'],
+            'misses': s['misses'],
+            'avg_wait_ms': (s['wait_ms_total'] / s['hits']) if s['hits'] else 0.0,
+            'reconciled': s['reconciled'],
+            'avg_network_fee_sol': (s['network_fees_lamports'] / s['reconciled'] / 1e9) if s['reconciled'] else 0.0,
+        }
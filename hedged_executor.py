@@ -0,0 +1,136 @@
+"""
+Hedged Executor - Race the local builder against PumpPortal without double fills
+PumpPortal request starts once the local path exceeds a latency budget; a per-trade guard
+lets only one path submit
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TradeGuard:
+    """Idempotency guard for one trade intent - only the owning path may submit"""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.owner: Optional[str] = None
+        self.signature: Optional[str] = None
+        self.denied = set()  # Paths that were refused a send
+        self._released = asyncio.Event()
+
+    def claim(self, path: str) -> bool:
+        """Take ownership before the first send - False if another path owns it or already filled"""
+        if self.signature is None and self.owner in (None, path):
+            self.owner = path
+            return True
+        return False
+
+    async def wait_turn(self, path: str, timeout: float) -> bool:
+        """Wait for the current owner to finish - True if this path may now send"""
+        deadline = time.monotonic() + timeout
+        while not self.claim(path):
+            remaining = deadline - time.monotonic()
+            if self.signature is not None or remaining <= 0:
+                self.denied.add(path)
+                return False
+            self._released.clear()
+            try:
+                await asyncio.wait_for(self._released.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+        return True
+
+    def finish(self, path: str, signature: Optional[str]):
+        """Owner reports its result - a signature locks the trade, None hands it over"""
+        if self.owner != path:
+            return
+        if signature:
+            self.signature = signature
+        else:
+            self.owner = None
+        self._released.set()
+
+
+class HedgedExecutor:
+    """Runs local + PumpPortal submission paths for a trade under one TradeGuard"""
+
+    def __init__(self):
+        self.stats = {
+            'trades': 0,
+            'hedged': 0,
+            'local_wins': 0,
+            'pumpportal_wins': 0,
+            'pumpportal_discarded': 0,
+            'failed': 0,
+        }
+
+    async def _run_path(self, guard: TradeGuard, path: str, call: Callable) -> Optional[str]:
+        try:
+            sig = await call(guard)
+        except Exception as e:
+            logger.warning(f"⚠️ {path} path error for {guard.key}: {e}")
+            sig = None
+        guard.finish(path, sig)
+        if path == 'pumpportal' and path in guard.denied:
+            self.stats['pumpportal_discarded'] += 1
+        return sig
+
+    def _won(self, path: str, sig: Optional[str]) -> Optional[str]:
+        if sig:
+            self.stats[f'{path}_wins'] += 1
+        else:
+            self.stats['failed'] += 1
+        return sig
+
+    async def execute(
+        self,
+        key: str,
+        local_call: Optional[Callable[[TradeGuard], Awaitable[Optional[str]]]],
+        pumpportal_call: Callable[[TradeGuard], Awaitable[Optional[str]]]
+    ) -> Optional[str]:
+        """
+        Local first; PumpPortal either after local fails (serial) or in parallel once
+        local exceeds PUMPPORTAL_HEDGE_BUDGET_MS (hedged). Returns the winning signature.
+        """
+        from config import PUMPPORTAL_HEDGE_ENABLED, PUMPPORTAL_HEDGE_BUDGET_MS
+
+        self.stats['trades'] += 1
+        guard = TradeGuard(key)
+
+        if local_call is None:
+            return self._won('pumpportal', await self._run_path(guard, 'pumpportal', pumpportal_call))
+
+        local_task = asyncio.create_task(self._run_path(guard, 'local', local_call))
+        budget = PUMPPORTAL_HEDGE_BUDGET_MS / 1000 if PUMPPORTAL_HEDGE_ENABLED else None
+        done, _ = await asyncio.wait({local_task}, timeout=budget)
+
+        if done:
+            sig = local_task.result()
+            if sig:
+                return self._won('local', sig)
+            logger.warning("⚠️ Local TX failed, falling back to PumpPortal...")
+            return self._won('pumpportal', await self._run_path(guard, 'pumpportal', pumpportal_call))
+
+        # Local is over budget - fetch the PumpPortal TX now, it sends only if local gives up
+        self.stats['hedged'] += 1
+        logger.info(f"⏱️ Local path over {PUMPPORTAL_HEDGE_BUDGET_MS}ms for {key} - hedging with PumpPortal")
+        portal_task = asyncio.create_task(self._run_path(guard, 'pumpportal', pumpportal_call))
+
+        pending = {local_task, portal_task}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                sig = task.result()
+                if sig:
+                    path = 'local' if task is local_task else 'pumpportal'
+                    # Loser stops at the guard and finishes on its own
+                    return self._won(path, sig)
+
+        return self._won('local', None)
+
+    def get_stats(self) -> dict:
+        return dict(self.stats)
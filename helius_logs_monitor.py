@@ -12,7 +12,7 @@ import base64
 import base58
 import websockets
 from datetime import datetime
-from typing import Optional, Dict, Set, Tuple
+from typing import Optional, Dict, List, Set, Tuple
 
 from config import (
     HELIUS_API_KEY, PUMPFUN_PROGRAM_ID,
@@ -47,11 +47,15 @@ BLACKLISTED_CREATORS = {
 class HeliusLogsMonitor:
     """Subscribe to PumpFun program logs and track all events"""
     
-    def __init__(self, callback, rpc_client, exit_callback=None, buy_callback=None):
+    def __init__(self, callback, rpc_client, exit_callback=None, buy_callback=None, fill_tracker=None,
+                 decimals_resolver=None, curve_store=None):
         self.callback = callback
         self.rpc_client = rpc_client
         self.exit_callback = exit_callback
         self.buy_callback = buy_callback
+        self.fill_tracker = fill_tracker  # Receives TradeEvents where user == our wallet
+        self.decimals_resolver = decimals_resolver  # Learns PumpFun mint decimals from CreateV2
+        self.curve_store = curve_store  # Exact reserves from every TradeEvent
         self.running = False
         self.reconnect_count = 0
         
@@ -88,6 +92,7 @@ class HeliusLogsMonitor:
         
         # Known discriminators
         self.CREATE_V2_DISCRIMINATOR = "1b72a94ddeeb6376"
+        self.TRADE_EVENT_DISCRIMINATOR = "bddb7fd34ee661ee"  # sha256("event:TradeEvent")[:8]
 
         # Entry thresholds from config (early entry with relaxed quality gates)
         self.min_sol = MIN_BONDING_CURVE_SOL      # 4.0 SOL min
@@ -253,6 +258,15 @@ class HeliusLogsMonitor:
             is_create = any('Instruction: CreateV2' in log for log in logs)
             is_buy = any('Instruction: Buy' in log for log in logs)
             is_sell = any('Instruction: Sell' in log for log in logs)
+
+            if (is_buy or is_sell) and (self.fill_tracker or self.curve_store):
+                for event in self._extract_trade_events(logs):
+                    # Exact post-trade reserves for every curve we see trade
+                    if self.curve_store:
+                        self.curve_store.update_from_trade_event(event['mint'], event, slot)
+                    # Our own buys/sells - exact fill straight from the event, no getTransaction
+                    if self.fill_tracker and self.fill_tracker.is_ours(event['user']):
+                        self.fill_tracker.on_trade_event(signature, event, slot)
             
             if is_create:
                 await self._handle_create(logs, signature, slot)
@@ -281,6 +295,9 @@ class HeliusLogsMonitor:
 
         self.stats['creates'] += 1
 
+        if self.decimals_resolver:
+            self.decimals_resolver.note_pumpfun_mint(mint)
+
         # Initialize token state with creator
         self.watched_tokens[mint] = {
             'created_at': time.time(),
@@ -956,6 +973,52 @@ class HeliusLogsMonitor:
         mint, _ = self._extract_mint_and_creator_from_create(logs)
         return mint
     
+    def _extract_trade_events(self, logs: list) -> List[dict]:
+        """
+        Full TradeEvent decode (integer lamports / raw token units) for fills and the curve store
+        Layout after the _extract_buy_data fields: realSolReserves(8) + realTokenReserves(8) +
+        feeRecipient(32) + feeBasisPoints(8) + fee(8) + creator(32) + creatorFeeBasisPoints(8) + creatorFee(8)
+        Every event in the transaction, in log order
+        """
+        events = []
+        for log in logs:
+            if "Program data:" not in log:
+                continue
+            data_b64 = log.replace("Program data:", "").strip()
+            padding = 4 - len(data_b64) % 4
+            if padding != 4:
+                data_b64 += '=' * padding
+            try:
+                decoded = base64.b64decode(data_b64)
+            except Exception:
+                continue
+
+            # Only TradeEvents - other pump events (and other programs' data) share no layout with it
+            if len(decoded) < 113 or decoded[:8].hex() != self.TRADE_EVENT_DISCRIMINATOR:
+                continue
+            mint = base58.b58encode(decoded[8:40]).decode()
+            if not mint.endswith('pump'):
+                continue
+
+            u64 = lambda offset: int.from_bytes(decoded[offset:offset + 8], 'little')
+            has_fees = len(decoded) >= 225  # Older events predate the fee fields
+            events.append({
+                'mint': mint,
+                'sol_lamports': u64(40),
+                'token_amount': u64(48),
+                'is_buy': decoded[56] == 1,
+                'user': base58.b58encode(decoded[57:89]).decode(),
+                'virtual_sol_reserves': u64(97),
+                'virtual_token_reserves': u64(105),
+                'real_sol_reserves': u64(113) if len(decoded) >= 129 else None,
+                'real_token_reserves': u64(121) if len(decoded) >= 129 else None,
+                'fee_bps': u64(161) if has_fees else None,
+                'fee_lamports': u64(169) if has_fees else 0,
+                'creator_fee_bps': u64(209) if has_fees else None,
+                'creator_fee_lamports': u64(217) if has_fees else 0,
+            })
+        return events
+
     def _extract_buy_data(self, logs: list) -> tuple:
         """
         Extract mint, SOL amount, buyer, and ACTUAL curve state from Buy/Sell event logs
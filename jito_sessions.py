@@ -0,0 +1,195 @@
+"""
+Jito Session Pool - Persistent, pre-warmed HTTP sessions per block engine
+Avoids DNS + TCP + TLS handshakes on the hot send path
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from endpoint_health import EndpointHealthRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class JitoSessionPool:
+    """One long-lived pooled aiohttp session per Jito endpoint, kept warm in background"""
+
+    def __init__(self, endpoints: Optional[List[str]] = None, health: EndpointHealthRegistry = None):
+        from config import JITO_ENDPOINTS
+
+        self.endpoints = list(endpoints or JITO_ENDPOINTS)
+        self.health = health or EndpointHealthRegistry()
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._keepalive_task = None
+
+        # Per-endpoint send stats (connection reuse + handshake time)
+        self.stats = {ep: self._new_endpoint_stats() for ep in self.endpoints}
+
+    @staticmethod
+    def _new_endpoint_stats() -> dict:
+        return {
+            'sends': 0,
+            'reused': 0,
+            'new_connections': 0,
+            'handshake_ms_total': 0.0,
+            'last_handshake_ms': 0.0,
+            'keepalives': 0,
+            'keepalive_failures': 0,
+        }
+
+    def _make_trace_config(self) -> aiohttp.TraceConfig:
+        """Trace hooks that tell us whether a send reused a warm connection"""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_create_start(session, ctx, params):
+            if ctx.trace_request_ctx is not None:
+                ctx.trace_request_ctx['create_start'] = time.perf_counter()
+
+        async def on_create_end(session, ctx, params):
+            if ctx.trace_request_ctx is None:
+                return
+            started = ctx.trace_request_ctx.get('create_start')
+            if started is not None:
+                ctx.trace_request_ctx['handshake_ms'] = (time.perf_counter() - started) * 1000
+
+        async def on_reuse(session, ctx, params):
+            if ctx.trace_request_ctx is not None:
+                ctx.trace_request_ctx['reused'] = True
+
+        trace_config.on_connection_create_start.append(on_create_start)
+        trace_config.on_connection_create_end.append(on_create_end)
+        trace_config.on_connection_reuseconn.append(on_reuse)
+        return trace_config
+
+    def _get_session(self, endpoint: str) -> aiohttp.ClientSession:
+        """Return the pooled session for an endpoint, opening it if needed"""
+        from config import JITO_KEEPALIVE_INTERVAL
+
+        session = self._sessions.get(endpoint)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=8,
+                ttl_dns_cache=300,
+                keepalive_timeout=max(30.0, JITO_KEEPALIVE_INTERVAL * 3),
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"Content-Type": "application/json"},
+                trace_configs=[self._make_trace_config()],
+            )
+            self._sessions[endpoint] = session
+        return session
+
+    async def start(self):
+        """Open and warm every session, then keep them warm in background"""
+        if self._keepalive_task is not None:
+            return
+
+        await asyncio.gather(*(self._keepalive(ep) for ep in self.endpoints))
+        self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+
+        warm = sum(1 for ep in self.endpoints if self.stats[ep]['keepalives'] > 0)
+        logger.info(f"🔥 Jito sessions warmed ({warm}/{len(self.endpoints)} endpoints)")
+
+    async def _keepalive_loop(self):
+        """Background loop sending a light request to each endpoint"""
+        from config import JITO_KEEPALIVE_INTERVAL
+
+        while True:
+            await asyncio.sleep(JITO_KEEPALIVE_INTERVAL)
+            await asyncio.gather(*(self._keepalive(ep) for ep in self.endpoints))
+
+    async def _keepalive(self, endpoint: str):
+        """Light getTipAccounts call - keeps the TLS connection open"""
+        bundles_url = endpoint.replace('/transactions', '/bundles')
+        payload = {"jsonrpc": "2.0", "id": 1, "method": "getTipAccounts", "params": []}
+        start = time.perf_counter()
+        try:
+            session = self._get_session(endpoint)
+            async with session.post(
+                bundles_url,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=3.0)
+            ) as response:
+                await response.read()
+                ok = response.status == 200
+            self.stats[endpoint]['keepalives'] += 1
+        except Exception as e:
+            ok = False
+            self.stats[endpoint]['keepalive_failures'] += 1
+            logger.debug(f"Jito keepalive failed ({endpoint.split('/')[2]}): {e}")
+
+        # Keepalives double as health probes for the block engines
+        self.health.record(endpoint, (time.perf_counter() - start) * 1000, ok)
+
+    async def post(self, endpoint: str, payload: dict, timeout: float = 1.0, url: str = None) -> dict:
+        """
+        POST a JSON-RPC payload over the warm session for this endpoint
+        url overrides the request path (e.g. the /bundles API on the same host)
+        """
+        if endpoint not in self.stats:
+            self.endpoints.append(endpoint)
+            self.stats[endpoint] = self._new_endpoint_stats()
+
+        session = self._get_session(endpoint)
+        trace_ctx = {}
+        try:
+            async with session.post(
+                url or endpoint,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                trace_request_ctx=trace_ctx
+            ) as response:
+                return await response.json(content_type=None)
+        finally:
+            self._record_send(endpoint, trace_ctx)
+
+    def _record_send(self, endpoint: str, trace_ctx: dict):
+        """Record whether the send rode a warm connection or paid a handshake"""
+        ep_stats = self.stats[endpoint]
+        ep_stats['sends'] += 1
+        if trace_ctx.get('reused'):
+            ep_stats['reused'] += 1
+        elif 'handshake_ms' in trace_ctx:
+            ep_stats['new_connections'] += 1
+            ep_stats['handshake_ms_total'] += trace_ctx['handshake_ms']
+            ep_stats['last_handshake_ms'] = trace_ctx['handshake_ms']
+            logger.info(
+                f"🤝 Jito cold connection ({endpoint.split('/')[2]}): "
+                f"{trace_ctx['handshake_ms']:.0f}ms handshake"
+            )
+
+    def get_stats(self) -> dict:
+        """Aggregate connection reuse rate and handshake time across endpoints"""
+        sends = sum(s['sends'] for s in self.stats.values())
+        reused = sum(s['reused'] for s in self.stats.values())
+        new_conns = sum(s['new_connections'] for s in self.stats.values())
+        handshake_total = sum(s['handshake_ms_total'] for s in self.stats.values())
+
+        return {
+            'sends': sends,
+            'reused': reused,
+            'reuse_rate_percent': (reused / sends * 100) if sends else 0.0,
+            'new_connections': new_conns,
+            'avg_handshake_ms': (handshake_total / new_conns) if new_conns else 0.0,
+            'endpoints': {ep.split('/')[2]: dict(s) for ep, s in self.stats.items()},
+        }
+
+    async def close(self):
+        """Stop keepalives and close all sessions"""
+        if self._keepalive_task and not self._keepalive_task.done():
+            self._keepalive_task.cancel()
+            try:
+                await self._keepalive_task
+            except asyncio.CancelledError:
+                pass
+        self._keepalive_task = None
+
+        for session in self._sessions.values():
+            if not session.closed:
+                await session.close()
+        self._sessions.clear()
@@ -0,0 +1,253 @@
+"""
+Landing Tracker - Follow every submitted signature to landed / dropped
+Feeds measured land probability + slots-to-land back into route and tip choice
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Callable, Dict, List, Optional
+
+from signature_poller import SignatureStatusPoller
+
+logger = logging.getLogger(__name__)
+
+
+class LandingTracker:
+    """Tracks submissions per (route, tip, urgency) and picks tips/routes from the results"""
+
+    MIN_SAMPLES = 5  # Submissions needed before a bucket drives decisions
+    TIPPED_ROUTES = ('jito', 'bundle', 'fanout')  # Routes whose tip level is a Jito tip
+
+    def __init__(
+        self,
+        rpc_client,
+        slot_source: Optional[Callable[[], Optional[int]]] = None,
+        poller: SignatureStatusPoller = None
+    ):
+        self.client = rpc_client
+        self.slot_source = slot_source or (lambda: None)
+        # Statuses come from the shared batched poller (one RPC call per tick for all TXs)
+        self.poller = poller or SignatureStatusPoller(rpc_client)
+
+        # signature -> submission record
+        self.pending: Dict[str, dict] = {}
+
+        # (route, tip_lamports, urgency) -> outcome counters
+        self.buckets: Dict[tuple, dict] = {}
+
+        self._follow_tasks = set()
+        self._listeners: List[Callable] = []
+
+    def add_listener(self, callback: Callable):
+        """callback(signature, record) fires once a signature lands or is dropped"""
+        self._listeners.append(callback)
+
+    def track(
+        self,
+        signature: str,
+        route: str,
+        tip_lamports: int = 0,
+        urgency: str = "buy",
+        priority_fee_lamports: int = 0
+    ):
+        """
+        Start following a submitted signature
+        tip_lamports is the Jito tip only (it keys the bucket); priority fees are recorded
+        alongside so choose_tip never learns from a fee level it did not pick
+        """
+        if not signature or signature in self.pending:
+            return
+        self.pending[signature] = {
+            'route': route,
+            'tip_lamports': int(tip_lamports),
+            'priority_fee_lamports': int(priority_fee_lamports),
+            'urgency': urgency,
+            'submitted_at': time.time(),
+            'submit_slot': self.slot_source(),
+        }
+        bucket = self._bucket(route, tip_lamports, urgency)
+        bucket['submitted'] += 1
+        bucket['priority_fee_total'] += int(priority_fee_lamports)
+
+        task = asyncio.create_task(self._follow(signature))
+        self._follow_tasks.add(task)
+        task.add_done_callback(self._follow_tasks.discard)
+
+    def _bucket(self, route: str, tip_lamports: int, urgency: str) -> dict:
+        key = (route, int(tip_lamports), urgency)
+        if key not in self.buckets:
+            self.buckets[key] = {
+                'submitted': 0,
+                'landed': 0,
+                'dropped': 0,
+                'failed_on_chain': 0,
+                'priority_fee_total': 0,
+                'slots_total': 0,
+                'slots_samples': 0,
+                'seconds_total': 0.0,
+            }
+        return self.buckets[key]
+
+    async def start(self):
+        await self.poller.start()
+        logger.info("🎯 Landing tracker started")
+
+    async def _follow(self, sig: str):
+        """Landed once the signature shows any status, dropped after LANDING_DROP_TIMEOUT"""
+        from config import LANDING_DROP_TIMEOUT
+
+        try:
+            status = await self.poller.wait(sig, "seen", timeout=LANDING_DROP_TIMEOUT)
+        except Exception as e:
+            logger.debug(f"Landing follow failed for {sig[:16]}: {e}")
+            return
+        if status is not None:
+            self._resolve(sig, landed=True, slot=status.slot, err=status.err)
+        else:
+            self._resolve(sig, landed=False)
+
+    def _resolve(self, sig: str, landed: bool, slot: int = None, err=None, now: float = None):
+        record = self.pending.pop(sig, None)
+        if record is None:
+            return
+        now = now or time.time()
+        bucket = self._bucket(record['route'], record['tip_lamports'], record['urgency'])
+
+        record['landed'] = landed
+        record['err'] = err
+        record['resolved_at'] = now
+        if landed and err is not None:
+            # Reached the chain but did nothing - a miss for the tip/route that paid for it
+            bucket['failed_on_chain'] += 1
+        elif landed:
+            bucket['landed'] += 1
+            bucket['seconds_total'] += now - record['submitted_at']
+            if slot is not None and record['submit_slot'] is not None:
+                record['slots_to_land'] = max(0, slot - record['submit_slot'])
+                bucket['slots_total'] += record['slots_to_land']
+                bucket['slots_samples'] += 1
+        else:
+            bucket['dropped'] += 1
+            logger.warning(
+                f"🕳️ Dropped: {sig[:16]}... ({record['route']}, {record['urgency']}, "
+                f"tip {record['tip_lamports'] / 1e9:.4f})"
+            )
+
+        for callback in self._listeners:
+            try:
+                callback(sig, record)
+            except Exception as e:
+                logger.debug(f"Landing listener error: {e}")
+
+    def _aggregate(
+        self,
+        route: str = None,
+        tip_lamports: int = None,
+        urgency: str = None,
+        routes: tuple = None
+    ) -> dict:
+        totals = {'resolved': 0, 'landed': 0, 'slots_total': 0, 'slots_samples': 0, 'seconds_total': 0.0}
+        for (b_route, b_tip, b_urgency), b in self.buckets.items():
+            if route is not None and b_route != route:
+                continue
+            if routes is not None and b_route not in routes:
+                continue
+            if tip_lamports is not None and b_tip != tip_lamports:
+                continue
+            if urgency is not None and b_urgency != urgency:
+                continue
+            totals['resolved'] += b['landed'] + b['dropped'] + b['failed_on_chain']
+            totals['landed'] += b['landed']
+            totals['slots_total'] += b['slots_total']
+            totals['slots_samples'] += b['slots_samples']
+            totals['seconds_total'] += b['seconds_total']
+        return totals
+
+    @staticmethod
+    def _land_prob(totals: dict) -> Optional[float]:
+        return totals['landed'] / totals['resolved'] if totals['resolved'] else None
+
+    def choose_tip(self, urgency: str, default_sol: float) -> float:
+        """
+        Cheapest tip on the ladder whose measured land rate meets LANDING_TARGET_RATE
+        Falls back to the static default until there is enough data
+        """
+        from config import (
+            LANDING_ADAPTIVE_TIPS, JITO_TIP_LADDER_SOL,
+            LANDING_TARGET_RATE, LANDING_EXPLORE_RATE,
+        )
+
+        if not LANDING_ADAPTIVE_TIPS:
+            return default_sol
+
+        ladder = sorted(set(JITO_TIP_LADDER_SOL + [default_sol]))
+
+        # Occasionally try another level so every rung keeps getting samples
+        if random.random() < LANDING_EXPLORE_RATE:
+            return random.choice(ladder)
+
+        measured = []
+        for tip_sol in ladder:
+            totals = self._aggregate(tip_lamports=int(tip_sol * 1e9), urgency=urgency, routes=self.TIPPED_ROUTES)
+            if totals['resolved'] >= self.MIN_SAMPLES:
+                measured.append((tip_sol, self._land_prob(totals)))
+
+        if not measured:
+            return default_sol
+
+        qualified = [tip_sol for tip_sol, prob in measured if prob >= LANDING_TARGET_RATE]
+        if qualified:
+            return min(qualified)
+
+        # Nothing meets target yet - escalate one rung above the best measured level
+        best_tip = max(measured, key=lambda x: (x[1], -x[0]))[0]
+        higher = [tip_sol for tip_sol in ladder if tip_sol > best_tip]
+        return higher[0] if higher else best_tip
+
+    def rank_routes(self, urgency: str, routes: List[str]) -> List[str]:
+        """
+        Order routes by land probability (ties broken by slots-to-land)
+        Routes without enough samples keep their given order behind measured ones
+        """
+        scored = []
+        for index, route in enumerate(routes):
+            totals = self._aggregate(route=route, urgency=urgency)
+            if totals['resolved'] >= self.MIN_SAMPLES:
+                avg_slots = totals['slots_total'] / totals['slots_samples'] if totals['slots_samples'] else 0
+                scored.append((0, -self._land_prob(totals), avg_slots, index, route))
+            else:
+                scored.append((1, 0, 0, index, route))
+
+        measured_routes = [s for s in scored if s[0] == 0]
+        # Only reorder once every route has data - otherwise keep the configured order
+        if len(measured_routes) < len(routes):
+            return list(routes)
+        return [s[-1] for s in sorted(scored)]
+
+    def get_stats(self) -> dict:
+        """Land rate + slots-to-land per (route, tip, urgency)"""
+        rows = []
+        for (route, tip_lamports, urgency), b in sorted(self.buckets.items()):
+            resolved = b['landed'] + b['dropped'] + b['failed_on_chain']
+            rows.append({
+                'route': route,
+                'tip_sol': tip_lamports / 1e9,
+                'urgency': urgency,
+                'submitted': b['submitted'],
+                'resolved': resolved,
+                'landed': b['landed'],
+                'dropped': b['dropped'],
+                'failed_on_chain': b['failed_on_chain'],
+                'land_rate_percent': (b['landed'] / resolved * 100) if resolved else 0.0,
+                'avg_priority_fee_sol': (b['priority_fee_total'] / b['submitted'] / 1e9) if b['submitted'] else 0.0,
+                'avg_slots_to_land': (b['slots_total'] / b['slots_samples']) if b['slots_samples'] else 0.0,
+                'avg_seconds_to_land': (b['seconds_total'] / b['landed']) if b['landed'] else 0.0,
+            })
+        return {'pending': len(self.pending), 'buckets': rows}
+
+    async def stop(self):
+        for task in list(self._follow_tasks):
+            task.cancel()
+        self._follow_tasks.clear()
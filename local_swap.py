@@ -8,16 +8,27 @@ import struct
 import logging
 import time
 import random
-import aiohttp
 import asyncio
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+from solders.hash import Hash
 from solders.pubkey import Pubkey
 from solders.instruction import Instruction, AccountMeta
-from solders.transaction import Transaction
-from solders.message import Message
+from solders.transaction import Transaction, VersionedTransaction
+from solders.message import Message, MessageV0
 from solana.rpc.api import Client
 from solana.rpc.types import TxOpts
 
+from endpoint_health import EndpointHealthRegistry
+from jito_sessions import JitoSessionPool
+from tx_submitter import FanoutSubmitter
+from landing_tracker import LandingTracker
+from fee_oracle import PriorityFeeOracle
+from cu_profiler import ComputeUnitProfiler, instruction_shape
+from lookup_table import LookupTableManager
+from rebroadcaster import Rebroadcaster
+from nonce_pool import NoncePool
+from curve_store import CurveStore
+from curve_quoter import CurveQuoter, FEE_PROGRAM_ID, BPS
 from config import (
     PUMPFUN_PROGRAM_ID,
     PUMPFUN_FEE_RECIPIENT,
@@ -30,9 +41,6 @@ from config import (
 
 logger = logging.getLogger(__name__)
 
-# Fee Program (for feeConfig PDA)
-FEE_PROGRAM_ID = Pubkey.from_string("pfeeUxB6jkeY1Hxd7CsFCAjcbHA9rWtchMGdZ6VojVZ")
-
 # Pump.fun instruction discriminators (first 8 bytes of sha256("global:buy") etc)
 BUY_DISCRIMINATOR = bytes([0x66, 0x06, 0x3d, 0x12, 0x01, 0xda, 0xeb, 0xea])
 SELL_DISCRIMINATOR = bytes([0x33, 0xe6, 0x85, 0xa4, 0x01, 0x7f, 0x83, 0xad])
@@ -41,9 +49,53 @@ SELL_DISCRIMINATOR = bytes([0x33, 0xe6, 0x85, 0xa4, 0x01, 0x7f, 0x83, 0xad])
 class LocalSwapBuilder:
     """Build Pump.fun swap transactions locally - no external API calls"""
     
-    def __init__(self, wallet_manager, rpc_client: Client):
+    def __init__(
+        self,
+        wallet_manager,
+        rpc_client: Client,
+        jito_pool: JitoSessionPool = None,
+        submitter: FanoutSubmitter = None,
+        health: EndpointHealthRegistry = None,
+        landing: LandingTracker = None,
+        fee_oracle: PriorityFeeOracle = None,
+        cu_profiler: ComputeUnitProfiler = None,
+        lookup_tables: LookupTableManager = None,
+        curve_store: CurveStore = None,
+        quoter: CurveQuoter = None,
+        nonce_pool: NoncePool = None,
+        rebroadcaster: Rebroadcaster = None
+    ):
         self.wallet = wallet_manager
         self.client = rpc_client
+
+        # Shared endpoint scoring (EWMA latency, circuit breakers, adaptive timeouts)
+        self.health = health or EndpointHealthRegistry()
+
+        # Warm pooled sessions to the block engines (shared with PumpPortalTrader)
+        self.jito_pool = jito_pool or JitoSessionPool(health=self.health)
+
+        # Concurrent Jito + RPC submission (used when SUBMIT_MODE=fanout)
+        self.submitter = submitter or FanoutSubmitter(self.jito_pool, health=self.health)
+
+        # Landed/dropped feedback per route + tip level (drives tip and route choice)
+        self.landing = landing or LandingTracker(rpc_client, slot_source=lambda: self._cached_slot)
+
+        # Accepted TXs are re-sent every slot until they land or their blockhash expires
+        self.rebroadcaster = rebroadcaster or Rebroadcaster(
+            self.submitter, self.landing.poller, slot_source=lambda: self._cached_slot
+        )
+
+        # Rolling prioritization fees for the PumpFun accounts we write (no RPC on send path)
+        self.fee_oracle = fee_oracle or PriorityFeeOracle()
+
+        # Measured CU per instruction shape - sizes set_compute_unit_limit
+        self.cu_profiler = cu_profiler or ComputeUnitProfiler(rpc_client)
+
+        # Shared bonding curve state - sell fallback when no curve_data is passed
+        self.curves = curve_store or CurveStore(rpc_client)
+
+        # Exact u64 quotes with the on-chain protocol + creator fees
+        self.quoter = quoter or CurveQuoter(rpc_client)
         
         # Derive global PDA once (constant)
         self.global_pda = Pubkey.find_program_address(
@@ -69,13 +121,45 @@ class LocalSwapBuilder:
             FEE_PROGRAM_ID
         )[0]
 
+        # Bot-owned lookup table for the accounts every swap carries (v0 messages)
+        # Jito tip accounts stay out - tips must be static keys to count for the block engine
+        self.lookup_tables = lookup_tables or LookupTableManager(wallet_manager, rpc_client)
+        # Bot-owned durable nonce accounts (exits that never expire with the blockhash)
+        self.nonces = nonce_pool or NoncePool(wallet_manager, rpc_client)
+
+        self.lookup_tables.set_static_accounts([
+            self.global_pda,
+            PUMPFUN_FEE_RECIPIENT,
+            self.event_authority,
+            self.global_volume_accumulator,
+            self.derive_user_volume_accumulator(self.wallet.pubkey),
+            self.fee_config,
+            FEE_PROGRAM_ID,
+            TOKEN_2022_PROGRAM_ID,
+            SYSTEM_PROGRAM_ID,
+        ])
+
         # Blockhash caching - refresh every 800ms in background
         self._cached_blockhash = None
+        self._cached_slot = None  # Context slot of the cached blockhash (slots-to-land baseline)
         self._blockhash_lock = asyncio.Lock()
         self._blockhash_task = None
+        self._blockhash_listeners = []  # callback(blockhash, slot) on every new blockhash
+
+        # Bundle tracking - bundle_id -> status record (polled in background)
+        self.bundle_statuses: Dict[str, dict] = {}
+        self.bundle_stats = {
+            'submitted': 0,
+            'rejected': 0,
+            'landed': 0,
+            'failed': 0,
+            'timeout': 0,
+            'unacknowledged': 0,
+        }
 
-        # Jito endpoint latency tracking - pick fastest responding endpoint
-        self._jito_latencies = {}  # endpoint -> list of recent latencies (ms)
+        # Global volume accumulator is written on every buy - always part of the fee sample
+        if str(self.global_volume_accumulator) not in self.fee_oracle.base_accounts:
+            self.fee_oracle.base_accounts.append(str(self.global_volume_accumulator))
 
         logger.info(f"LocalSwapBuilder initialized")
         logger.info(f"  Global PDA: {self.global_pda}")
@@ -95,11 +179,23 @@ class LocalSwapBuilder:
             try:
                 blockhash_resp = self.client.get_latest_blockhash()
                 async with self._blockhash_lock:
+                    changed = blockhash_resp.value.blockhash != self._cached_blockhash
                     self._cached_blockhash = blockhash_resp.value.blockhash
+                    self._cached_slot = blockhash_resp.context.slot
+                if changed:
+                    for callback in self._blockhash_listeners:
+                        try:
+                            callback(self._cached_blockhash, self._cached_slot)
+                        except Exception as e:
+                            logger.warning(f"⚠️ Blockhash listener failed: {e}")
             except Exception as e:
                 logger.warning(f"⚠️ Blockhash refresh failed: {e}")
             await asyncio.sleep(0.8)  # Reduced from 2s - fresher blockhash = less rejection risk
 
+    def add_blockhash_listener(self, callback):
+        """callback(blockhash, slot) runs whenever the cached blockhash changes"""
+        self._blockhash_listeners.append(callback)
+
     def _build_jito_tip_instruction(self, tip_lamports: int) -> Instruction:
         """Build a SOL transfer instruction to a random Jito tip account"""
         from config import JITO_TIP_ACCOUNTS
@@ -116,46 +212,14 @@ class LocalSwapBuilder:
 
         return Instruction(SYSTEM_PROGRAM_ID, data, accounts)
 
-    def _get_fastest_jito_endpoint(self, endpoints: list) -> str:
-        """Pick the Jito endpoint with lowest average latency, or random if no data"""
-        if not self._jito_latencies:
-            return random.choice(endpoints)
-
-        # Calculate average latency for each endpoint (last 5 requests)
-        avg_latencies = {}
-        for ep in endpoints:
-            if ep in self._jito_latencies and self._jito_latencies[ep]:
-                recent = self._jito_latencies[ep][-5:]
-                avg_latencies[ep] = sum(recent) / len(recent)
-            else:
-                avg_latencies[ep] = 500  # Default 500ms for unknown endpoints
-
-        # Pick fastest, with some randomness to avoid always hammering one endpoint
-        sorted_eps = sorted(avg_latencies.items(), key=lambda x: x[1])
-        # Pick from top 2 fastest endpoints randomly
-        top_eps = [ep for ep, _ in sorted_eps[:2]]
-        return random.choice(top_eps)
-
-    def _record_jito_latency(self, endpoint: str, latency_ms: float, success: bool):
-        """Record latency for an endpoint (penalize failures)"""
-        if endpoint not in self._jito_latencies:
-            self._jito_latencies[endpoint] = []
-
-        # Penalize failures with high latency value
-        recorded_latency = latency_ms if success else 1000.0
-        self._jito_latencies[endpoint].append(recorded_latency)
-
-        # Keep only last 10 measurements
-        if len(self._jito_latencies[endpoint]) > 10:
-            self._jito_latencies[endpoint] = self._jito_latencies[endpoint][-10:]
-
     async def _send_via_jito(self, signed_tx_bytes: bytes) -> Optional[str]:
         """Send transaction via Jito block engine for priority inclusion"""
         from config import JITO_ENDPOINTS
         import base64
 
         tx_base64 = base64.b64encode(signed_tx_bytes).decode('utf-8')
-        endpoint = self._get_fastest_jito_endpoint(JITO_ENDPOINTS)
+        endpoint = self.health.pick(JITO_ENDPOINTS)
+        timeout = self.health.timeout_for(endpoint, default=1.0, floor=0.3, ceiling=2.0)
         start_time = time.time()
 
         payload = {
@@ -166,39 +230,245 @@ class LocalSwapBuilder:
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    endpoint,
-                    json=payload,
-                    headers={"Content-Type": "application/json"},
-                    timeout=aiohttp.ClientTimeout(total=1.0)  # Reduced from 5s - Jito responds in 50-200ms normally
-                ) as response:
-                    result = await response.json()
-                    latency_ms = (time.time() - start_time) * 1000
-
-                    if "result" in result:
-                        sig = result["result"]
-                        self._record_jito_latency(endpoint, latency_ms, success=True)
-                        logger.info(f"🚀 Jito accepted: {sig[:16]}...")
-                        return sig
-                    elif "error" in result:
-                        self._record_jito_latency(endpoint, latency_ms, success=False)
-                        logger.warning(f"⚠️ Jito rejected: {result['error'].get('message', result['error'])}")
-                        return None
-                    else:
-                        self._record_jito_latency(endpoint, latency_ms, success=False)
-                        logger.warning(f"⚠️ Unexpected Jito response: {result}")
-                        return None
+            # Adaptive timeout from p95 - Jito responds in 50-200ms normally over a warm connection
+            result = await self.jito_pool.post(endpoint, payload, timeout=timeout)
+            latency_ms = (time.time() - start_time) * 1000
+
+            if "result" in result:
+                sig = result["result"]
+                self.health.record(endpoint, latency_ms, success=True)
+                logger.info(f"🚀 Jito accepted: {sig[:16]}...")
+                return sig
+            elif "error" in result:
+                self.health.record(endpoint, latency_ms, success=False)
+                logger.warning(f"⚠️ Jito rejected: {result['error'].get('message', result['error'])}")
+                return None
+            else:
+                self.health.record(endpoint, latency_ms, success=False)
+                logger.warning(f"⚠️ Unexpected Jito response: {result}")
+                return None
 
         except asyncio.TimeoutError:
-            self._record_jito_latency(endpoint, 1000.0, success=False)
+            self.health.record(endpoint, timeout * 1000, success=False)
             logger.warning(f"⚠️ Jito timeout ({endpoint.split('/')[2]})")
             return None
         except Exception as e:
-            self._record_jito_latency(endpoint, 1000.0, success=False)
+            self.health.record(endpoint, (time.time() - start_time) * 1000, success=False)
             logger.warning(f"⚠️ Jito error: {e}")
             return None
 
+    def _send_via_rpc(self, signed_tx_bytes: bytes, opts: Optional[TxOpts] = None) -> str:
+        """Serial send through the main RPC client - outcome feeds the shared health registry"""
+        from config import RPC_ENDPOINT
+
+        start_time = time.time()
+        try:
+            if opts is None:
+                response = self.client.send_raw_transaction(signed_tx_bytes)
+            else:
+                response = self.client.send_raw_transaction(signed_tx_bytes, opts)
+        except Exception:
+            self.health.record(RPC_ENDPOINT, (time.time() - start_time) * 1000, success=False)
+            raise
+        self.health.record(RPC_ENDPOINT, (time.time() - start_time) * 1000, success=True)
+        return str(response.value)
+
+    def _sign_transaction(self, instructions: list, recent_blockhash):
+        """
+        Sign with the wallet keypair - v0 message against our lookup table when loaded,
+        legacy message otherwise (or if v0 compilation fails)
+        """
+        tables = self.lookup_tables.get_tables()
+        if tables:
+            try:
+                message = MessageV0.try_compile(self.wallet.pubkey, instructions, tables, recent_blockhash)
+                tx = VersionedTransaction(message, [self.wallet.keypair])
+                self.lookup_tables.record_build(True, len(bytes(tx)))
+                return tx
+            except Exception as e:
+                self.lookup_tables.stats['compile_failures'] += 1
+                logger.warning(f"⚠️ v0 compile failed, using legacy TX: {e}")
+
+        message = Message.new_with_blockhash(instructions, self.wallet.pubkey, recent_blockhash)
+        tx = Transaction.new_unsigned(message)
+        tx.sign([self.wallet.keypair], recent_blockhash)
+        self.lookup_tables.record_build(False, len(bytes(tx)))
+        return tx
+
+    def _sign_with_nonce(self, instructions: list, nonce_account: Pubkey, nonce: Hash):
+        """
+        Sign against a durable nonce - advance-nonce goes first and the nonce value stands in
+        for the recent blockhash, so the TX stays valid until that nonce is advanced
+        """
+        return self._sign_transaction(
+            [self.nonces.advance_instruction(nonce_account), *instructions], nonce
+        )
+
+    @staticmethod
+    def _bundle_session_key(bundle_url: str) -> str:
+        """Map a bundle URL onto the warm session of its block engine"""
+        from config import JITO_ENDPOINTS
+
+        tx_endpoint = bundle_url.replace('/bundles', '/transactions')
+        return tx_endpoint if tx_endpoint in JITO_ENDPOINTS else bundle_url
+
+    async def send_bundle(
+        self,
+        core_instructions: list,
+        tip_sol: float,
+        recent_blockhash,
+        companions: Optional[List[list]] = None,
+        label: str = "bundle"
+    ) -> Optional[str]:
+        """
+        Submit [swap TX, *companion TXs, tip TX] as one atomic Jito bundle
+        Tip is its own TX at the end so it is only paid if the whole bundle lands
+        Returns the swap TX signature if the block engine accepted the bundle - or if the
+        submit timed out, since the bundle may still land and a fallback send would double it
+        """
+        from config import JITO_BUNDLE_ENDPOINTS
+        import base64
+
+        swap_tx = self._sign_transaction(core_instructions, recent_blockhash)
+        txs = [swap_tx]
+        for companion_ixs in (companions or []):
+            txs.append(self._sign_transaction(companion_ixs, recent_blockhash))
+        tip_ix = self._build_jito_tip_instruction(int(tip_sol * 1e9))
+        txs.append(self._sign_transaction([tip_ix], recent_blockhash))
+
+        if len(txs) > 5:
+            logger.error(f"❌ Bundle too large ({len(txs)} TXs, Jito max is 5)")
+            return None
+
+        payload = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "sendBundle",
+            "params": [
+                [base64.b64encode(bytes(tx)).decode('utf-8') for tx in txs],
+                {"encoding": "base64"}
+            ]
+        }
+
+        urls = {self._bundle_session_key(url): url for url in JITO_BUNDLE_ENDPOINTS}
+        endpoint = self.health.pick(list(urls))
+        url = urls[endpoint]
+        timeout = self.health.timeout_for(endpoint, default=1.0, floor=0.3, ceiling=2.0)
+        start_time = time.time()
+
+        try:
+            result = await self.jito_pool.post(endpoint, payload, timeout=timeout, url=url)
+            latency_ms = (time.time() - start_time) * 1000
+        except asyncio.TimeoutError:
+            # No answer is not a rejection - hand back the signature and let confirmation decide
+            self.health.record(endpoint, timeout * 1000, success=False)
+            self.bundle_stats['unacknowledged'] += 1
+            logger.warning(f"⏱️ Jito bundle timeout ({url.split('/')[2]}) - may still land, not falling back")
+            return str(swap_tx.signatures[0])
+        except Exception as e:
+            self.health.record(endpoint, (time.time() - start_time) * 1000, success=False)
+            self.bundle_stats['rejected'] += 1
+            logger.warning(f"⚠️ Jito bundle error: {e}")
+            return None
+
+        if not result.get("result"):
+            self.health.record(endpoint, latency_ms, success=False)
+            self.bundle_stats['rejected'] += 1
+            error = result.get("error", result)
+            logger.warning(f"⚠️ Jito bundle rejected: {error.get('message', error) if isinstance(error, dict) else error}")
+            return None
+
+        self.health.record(endpoint, latency_ms, success=True)
+        bundle_id = result["result"]
+        swap_sig = str(swap_tx.signatures[0])
+        self.bundle_stats['submitted'] += 1
+        self.bundle_statuses[bundle_id] = {
+            'signature': swap_sig,
+            'label': label,
+            'tx_count': len(txs),
+            'status': 'Pending',
+            'submitted_at': time.time(),
+            'landed_slot': None,
+        }
+        if len(self.bundle_statuses) > 200:
+            del self.bundle_statuses[next(iter(self.bundle_statuses))]
+
+        logger.info(f"📦 Jito bundle accepted ({len(txs)} TXs, {latency_ms:.0f}ms): {bundle_id[:16]}...")
+        asyncio.create_task(self._poll_bundle_status(endpoint, url, bundle_id))
+        return swap_sig
+
+    async def _poll_bundle_status(self, endpoint: str, url: str, bundle_id: str):
+        """Background poll of getInflightBundleStatuses until the bundle lands, fails or times out"""
+        from config import JITO_BUNDLE_STATUS_TIMEOUT
+
+        record = self.bundle_statuses.get(bundle_id)
+        payload = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "getInflightBundleStatuses",
+            "params": [[bundle_id]]
+        }
+        start = time.time()
+
+        while time.time() - start < JITO_BUNDLE_STATUS_TIMEOUT:
+            await asyncio.sleep(0.5)
+            try:
+                result = await self.jito_pool.post(endpoint, payload, timeout=2.0, url=url)
+                statuses = (result.get("result") or {}).get("value") or []
+                status = statuses[0].get("status") if statuses and statuses[0] else None
+            except Exception as e:
+                logger.debug(f"Bundle status poll failed: {e}")
+                continue
+
+            if record is not None and status:
+                record['status'] = status
+
+            if status == "Landed":
+                self.bundle_stats['landed'] += 1
+                if record is not None:
+                    record['landed_slot'] = statuses[0].get("landed_slot")
+                logger.info(f"📦 Bundle landed in {time.time() - start:.1f}s: {bundle_id[:16]}...")
+                return
+            # "Invalid" also means not-yet-visible right after submission
+            if status == "Failed" or (status == "Invalid" and time.time() - start > 5):
+                self.bundle_stats['failed'] += 1
+                logger.warning(f"⚠️ Bundle {status.lower()}: {bundle_id[:16]}...")
+                return
+
+        self.bundle_stats['timeout'] += 1
+        if record is not None:
+            record['status'] = 'Timeout'
+        logger.warning(f"⏱️ Bundle status unknown after {JITO_BUNDLE_STATUS_TIMEOUT:.0f}s: {bundle_id[:16]}...")
+
+    def _build_fanout_transaction(
+        self,
+        core_instructions: list,
+        tip_sol: float,
+        recent_blockhash,
+        urgency: str = "buy",
+        shape: str = None,
+        fee_multiplier: float = 1.0
+    ) -> Tuple[bytes, int, int]:
+        """
+        Sign one TX that is competitive on every route:
+        compute budget for RPC leaders + Jito tip for block engine inclusion
+        Returns (tx_bytes, cu_limit, cu_price)
+        """
+        from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
+
+        cu_limit = self.cu_profiler.limit_for(shape) if shape else 200_000
+        cu_price = int(self.fee_oracle.get_fee(urgency) * fee_multiplier)
+        instructions = [
+            set_compute_unit_limit(cu_limit),
+            set_compute_unit_price(cu_price),
+            *core_instructions,
+            self._build_jito_tip_instruction(int(tip_sol * 1e9)),
+        ]
+        tx = self._sign_transaction(instructions, recent_blockhash)
+        if shape:
+            self.cu_profiler.simulate_in_background(shape, tx)
+        return bytes(tx), cu_limit, cu_price
+
     def derive_bonding_curve_pda(self, mint: Pubkey) -> Tuple[Pubkey, int]:
         """Derive bonding curve PDA for a token"""
         return Pubkey.find_program_address(
@@ -230,32 +500,6 @@ class LocalSwapBuilder:
             ASSOCIATED_TOKEN_PROGRAM_ID
         )[0]
     
-    def calculate_tokens_out(
-        self,
-        sol_amount_lamports: int,
-        virtual_sol_reserves: int,
-        virtual_token_reserves: int
-    ) -> int:
-        """
-        Calculate tokens received for SOL input (constant product AMM)
-        Formula: tokens_out = (sol_in * token_reserves) / (sol_reserves + sol_in)
-        """
-        tokens_out = (sol_amount_lamports * virtual_token_reserves) // (virtual_sol_reserves + sol_amount_lamports)
-        return tokens_out
-    
-    def calculate_sol_out(
-        self,
-        token_amount: int,
-        virtual_sol_reserves: int,
-        virtual_token_reserves: int
-    ) -> int:
-        """
-        Calculate SOL received for token input (constant product AMM)
-        Formula: sol_out = (token_in * sol_reserves) / (token_reserves + token_in)
-        """
-        sol_out = (token_amount * virtual_sol_reserves) // (virtual_token_reserves + token_amount)
-        return sol_out
-    
     def build_buy_instruction(
         self,
         mint: Pubkey,
@@ -337,11 +581,15 @@ class LocalSwapBuilder:
         curve_data: dict,
         slippage_bps: int = 5000,
         creator: str = None,
-        velocity: float = 0.0
+        velocity: float = 0.0,
+        bundle_companions: Optional[List[list]] = None,
+        guard=None
     ) -> Optional[str]:
         """
         Build and send a buy transaction locally
         Tries Jito first, immediate RPC fallback if Jito fails
+        bundle_companions: extra instruction lists signed as atomic TXs in the bundle
+        guard: optional TradeGuard - skip sending if another path already owns this trade
         """
         try:
             start = time.time()
@@ -376,6 +624,7 @@ class LocalSwapBuilder:
             user_ata = self.derive_associated_token_account(self.wallet.pubkey, mint_pubkey)
             creator_vault = self.derive_creator_vault_pda(creator_pubkey)
             user_volume_accumulator = self.derive_user_volume_accumulator(self.wallet.pubkey)
+            self.fee_oracle.watch_account(str(bonding_curve))
 
             # Get reserves from curve_data
             virtual_sol = curve_data.get('virtual_sol_reserves', 0)
@@ -385,23 +634,27 @@ class LocalSwapBuilder:
                 logger.error(f"Invalid curve data: sol={virtual_sol}, tokens={virtual_tokens}")
                 return None
 
-            # Calculate tokens out
+            # Exact tokens out for the SOL budget - protocol + creator fees come out of it
             sol_lamports = int(sol_amount * 1e9)
-            tokens_out_raw = self.calculate_tokens_out(sol_lamports, virtual_sol, virtual_tokens)
+            quote = self.quoter.quote_buy(sol_lamports, virtual_sol, virtual_tokens, curve_data.get('real_token_reserves'))
+            if not quote:
+                logger.error(f"Buy quote failed: sol={sol_lamports}, reserves={virtual_sol}/{virtual_tokens}")
+                return None
+            tokens_out_raw = quote['tokens_out']
 
             # Request full tokens calculated from SOL input
             # max_sol_cost provides price protection if curve moves up
             tokens_out = tokens_out_raw
 
-            # Max SOL cost: the absolute ceiling we'll pay
+            # Max SOL cost: the absolute ceiling we'll pay, relative to the exact cost incl. fees
             # For fast tokens, allow up to 3x input to compete with other bots
             # We only PAY what tokens actually cost - this is just the ceiling
-            max_sol_cost = int(sol_lamports * (10000 + slippage_bps) / 10000)
+            max_sol_cost = quote['total_cost'] * (BPS + slippage_bps) // BPS
 
             logger.info(f"⚡ Building LOCAL buy TX for {mint[:8]}...")
             logger.info(f"   Creator: {creator[:16]}...")
             logger.info(f"   SOL in: {sol_amount} ({sol_lamports:,} lamports)")
-            logger.info(f"   Raw tokens: {tokens_out_raw:,}")
+            logger.info(f"   Raw tokens: {tokens_out_raw:,} (exact cost {quote['total_cost']:,} incl. {quote['fee'] + quote['creator_fee']:,} fees)")
             logger.info(f"   Tokens requested: {tokens_out:,}")
             logger.info(f"   Max SOL cost: {max_sol_cost:,} lamports ({max_sol_cost/1e9:.4f} SOL)")
 
@@ -417,7 +670,9 @@ class LocalSwapBuilder:
                 max_sol_cost
             )
 
-            # Create ATA instruction (always needed for new tokens)
+            # Create ATA instruction - idempotent, so a mint we already hold an ATA for still buys
+            # Indexed mints skip the account creation itself, which is a different CU shape
+            creates_ata = mint not in self.wallet.token_index
             ata_accounts = [
                 AccountMeta(self.wallet.pubkey, is_signer=True, is_writable=True),
                 AccountMeta(user_ata, is_signer=False, is_writable=True),
@@ -426,7 +681,7 @@ class LocalSwapBuilder:
                 AccountMeta(SYSTEM_PROGRAM_ID, is_signer=False, is_writable=False),
                 AccountMeta(TOKEN_2022_PROGRAM_ID, is_signer=False, is_writable=False),
             ]
-            create_ata_ix = Instruction(ASSOCIATED_TOKEN_PROGRAM_ID, bytes(), ata_accounts)
+            create_ata_ix = Instruction(ASSOCIATED_TOKEN_PROGRAM_ID, bytes([1]), ata_accounts)
 
             # Get blockhash
             if self._cached_blockhash:
@@ -435,29 +690,74 @@ class LocalSwapBuilder:
                 blockhash_resp = self.client.get_latest_blockhash()
                 recent_blockhash = blockhash_resp.value.blockhash
 
+            # Idempotency - a hedged PumpPortal send may already own this trade
+            if guard is not None and not guard.claim("local"):
+                logger.info(f"🛑 {mint[:8]}... already submitted by another path - skipping local send")
+                return None
+
             # ===== ATTEMPT 1: JITO =====
-            from config import JITO_ENABLED, JITO_TIP_AMOUNT_SOL, JITO_TIP_AGGRESSIVE_SOL
+            from config import (
+                JITO_ENABLED, JITO_TIP_AMOUNT_SOL, JITO_TIP_AGGRESSIVE_SOL,
+                SUBMIT_MODE, JITO_BUNDLES_ENABLED,
+            )
+
+            # Static tip is the default - measured land rates move it along the tip ladder
+            default_tip_sol = JITO_TIP_AGGRESSIVE_SOL if slippage_bps >= 5000 else JITO_TIP_AMOUNT_SOL
+            jito_tip_sol = self.landing.choose_tip("buy", default_tip_sol)
+            tip_lamports = int(jito_tip_sol * 1e9)
+
+            if JITO_ENABLED and JITO_BUNDLES_ENABLED:
+                logger.info(f"   📦 Trying Jito bundle (tip TX: {jito_tip_sol} SOL)...")
+                sig = await self.send_bundle(
+                    [create_ata_ix, buy_ix],
+                    jito_tip_sol,
+                    recent_blockhash,
+                    companions=bundle_companions,
+                    label="buy"
+                )
+                if sig:
+                    self.landing.track(sig, "bundle", tip_lamports, "buy")
+                    total_time = (time.time() - start) * 1000
+                    logger.info(f"✅ LOCAL buy bundle in {total_time:.1f}ms: {sig}")
+                    return sig
+                logger.warning("⚠️ Bundle rejected - falling back to single-TX path")
+
+            if SUBMIT_MODE == 'fanout':
+                shape = instruction_shape("buy", creates_ata=creates_ata, has_tip=True)
+                tx_bytes, cu_limit, cu_price = self._build_fanout_transaction(
+                    [create_ata_ix, buy_ix], jito_tip_sol, recent_blockhash, urgency="buy", shape=shape
+                )
+
+                logger.info(f"   💰 Fan-out to Jito + RPC routes (tip: {jito_tip_sol} SOL)...")
+                sig = await self.submitter.submit(tx_bytes, label="buy")
+                if sig:
+                    self.landing.track(sig, "fanout", tip_lamports, "buy")
+                    self.rebroadcaster.add(sig, tx_bytes, label="buy")
+                    self.cu_profiler.note_submission(sig, shape, cu_limit, cu_price)
+                    total_time = (time.time() - start) * 1000
+                    logger.info(f"✅ LOCAL buy TX via fan-out in {total_time:.1f}ms: {sig}")
+                    return sig
+                logger.warning("⚠️ Fan-out buy: no route accepted")
+                return None
 
             sig = None
-            if JITO_ENABLED:
-                jito_tip_sol = JITO_TIP_AGGRESSIVE_SOL if slippage_bps >= 5000 else JITO_TIP_AMOUNT_SOL
-                tip_lamports = int(jito_tip_sol * 1e9)
+            use_jito = JITO_ENABLED and self.landing.rank_routes("buy", ["jito", "rpc"])[0] == "jito"
+            if JITO_ENABLED and not use_jito:
+                logger.info("   🎯 RPC is landing buys better than Jito - going direct")
+
+            if use_jito:
                 tip_ix = self._build_jito_tip_instruction(tip_lamports)
 
                 jito_instructions = [create_ata_ix, buy_ix, tip_ix]
 
-                message = Message.new_with_blockhash(
-                    jito_instructions,
-                    self.wallet.pubkey,
-                    recent_blockhash
-                )
-                tx = Transaction.new_unsigned(message)
-                tx.sign([self.wallet.keypair], recent_blockhash)
+                tx = self._sign_transaction(jito_instructions, recent_blockhash)
 
                 logger.info(f"   💰 Trying Jito first (tip: {jito_tip_sol} SOL)...")
                 sig = await self._send_via_jito(bytes(tx))
 
                 if sig:
+                    self.landing.track(sig, "jito", tip_lamports, "buy")
+                    self.rebroadcaster.add(sig, bytes(tx), label="buy")
                     total_time = (time.time() - start) * 1000
                     logger.info(f"✅ LOCAL buy TX via Jito in {total_time:.1f}ms: {sig}")
                     return sig
@@ -467,33 +767,34 @@ class LocalSwapBuilder:
             # ===== ATTEMPT 2: RPC + PRIORITY FEE =====
             from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
 
-            # 0.002 SOL priority fee
-            compute_limit_ix = set_compute_unit_limit(200_000)
-            compute_price_ix = set_compute_unit_price(10_000_000)
+            # Priority fee from the oracle's rolling percentile for buys (no RPC call here)
+            # CU limit sized from measured consumption of this shape
+            shape = instruction_shape("buy", creates_ata=creates_ata)
+            cu_price = self.fee_oracle.get_fee("buy")
+            cu_limit = self.cu_profiler.limit_for(shape)
+            compute_limit_ix = set_compute_unit_limit(cu_limit)
+            compute_price_ix = set_compute_unit_price(cu_price)
 
             rpc_instructions = [compute_limit_ix, compute_price_ix, create_ata_ix, buy_ix]
 
             # Use cached blockhash - don't add 100-500ms delay for fresh one
             # Blockhash refreshes every 800ms, still valid from Jito attempt
 
-            message = Message.new_with_blockhash(
-                rpc_instructions,
-                self.wallet.pubkey,
-                recent_blockhash
-            )
-            tx = Transaction.new_unsigned(message)
-            tx.sign([self.wallet.keypair], recent_blockhash)
+            tx = self._sign_transaction(rpc_instructions, recent_blockhash)
 
-            logger.info(f"   💰 RPC fallback with 0.002 SOL priority fee...")
+            logger.info(f"   💰 RPC fallback with priority fee {cu_price:,} µL/CU, limit {cu_limit:,} CU...")
+            self.cu_profiler.simulate_in_background(shape, tx)
 
             opts = TxOpts(skip_preflight=True, preflight_commitment="processed")
-            response = self.client.send_raw_transaction(bytes(tx), opts)
-            sig = str(response.value)
+            sig = self._send_via_rpc(bytes(tx), opts)
 
             if sig.startswith("1111111"):
                 logger.error("Transaction failed - invalid signature")
                 return None
 
+            self.landing.track(sig, "rpc", 0, "buy", priority_fee_lamports=cu_limit * cu_price // 1_000_000)
+            self.rebroadcaster.add(sig, bytes(tx), label="buy", jito=False)
+            self.cu_profiler.note_submission(sig, shape, cu_limit, cu_price)
             total_time = (time.time() - start) * 1000
             logger.info(f"✅ LOCAL buy TX via RPC in {total_time:.1f}ms: {sig}")
 
@@ -512,7 +813,13 @@ class LocalSwapBuilder:
         curve_data: dict = None,
         slippage_bps: int = 5000,
         token_decimals: int = 6,
-        creator: str = None
+        creator: str = None,
+        bundle_companions: Optional[List[list]] = None,
+        urgency: str = "sell",
+        guard=None,
+        on_wire=None,
+        fee_multiplier: float = 1.0,
+        fresh_blockhash: bool = False
     ) -> Optional[str]:
         """
         Build and send a sell transaction locally - JITO FIRST like buys
@@ -523,6 +830,12 @@ class LocalSwapBuilder:
             curve_data: Bonding curve data from Helius (optional, will query chain if not provided)
             slippage_bps: Slippage in basis points
             token_decimals: Token decimals (default 6 for PumpFun)
+            bundle_companions: Extra instruction lists signed as atomic TXs in the bundle
+            urgency: "sell" or "emergency" - selects landing stats for tip/route choice
+            guard: Optional TradeGuard - skip sending if another path already owns this trade
+            on_wire: Optional callback run once the TX is built, just before the first send
+            fee_multiplier: Scales the Jito tip and priority fee (exit retry ladder escalation)
+            fresh_blockhash: Fetch a new blockhash instead of using the cache (retries)
 
         Returns:
             Transaction signature or None on failure
@@ -544,6 +857,7 @@ class LocalSwapBuilder:
                 return None
             creator_pubkey = Pubkey.from_string(creator)
             creator_vault = self.derive_creator_vault_pda(creator_pubkey)
+            self.fee_oracle.watch_account(str(bonding_curve))
 
             # Use passed curve_data if available (from Helius - faster)
             # Otherwise query chain (slower but accurate)
@@ -552,28 +866,28 @@ class LocalSwapBuilder:
                 virtual_token_reserves = curve_data['virtual_token_reserves']
                 logger.info(f"⚡ Using passed curve data (Helius): {virtual_sol_reserves/1e9:.2f} vSOL")
             else:
-                # Fallback: Query chain
-                curve_account = self.client.get_account_info(bonding_curve)
-                if not curve_account.value:
+                # Fallback: curve store, then chain
+                snapshot = self.curves.get(mint, max_age=2) or self.curves.fetch(mint)
+                if not snapshot:
                     logger.error(f"❌ Could not fetch bonding curve from chain")
                     return None
 
-                curve_bytes = bytes(curve_account.value.data)
-                virtual_token_reserves = struct.unpack('<Q', curve_bytes[8:16])[0]
-                virtual_sol_reserves = struct.unpack('<Q', curve_bytes[16:24])[0]
-                logger.info(f"📊 Queried chain for curve: {virtual_sol_reserves/1e9:.2f} vSOL")
+                virtual_token_reserves = snapshot['virtual_token_reserves']
+                virtual_sol_reserves = snapshot['virtual_sol_reserves']
+                logger.info(f"📊 Curve from {snapshot['source']}: {virtual_sol_reserves/1e9:.2f} vSOL")
 
             if virtual_sol_reserves == 0 or virtual_token_reserves == 0:
                 logger.error(f"Invalid curve data: sol={virtual_sol_reserves}, tokens={virtual_token_reserves}")
                 return None
 
-            # Calculate SOL out
-            sol_out = self.calculate_sol_out(token_amount, virtual_sol_reserves, virtual_token_reserves)
+            # Exact SOL out net of protocol + creator fees (the conservative bound for min_sol_output)
+            quote = self.quoter.quote_sell(token_amount, virtual_sol_reserves, virtual_token_reserves)
+            sol_out = quote['net_sol'] if quote else 0
             # For emergency slippage (95%+), accept ANY output - we want OUT
             if slippage_bps >= 9500:
                 min_sol_output = 1  # 1 lamport = accept anything
             else:
-                min_sol_output = int(sol_out * (10000 - slippage_bps) / 10000)
+                min_sol_output = sol_out * (BPS - slippage_bps) // BPS
 
             logger.info(f"⚡ Building LOCAL sell TX for {mint[:8]}...")
             logger.info(f"   Tokens: {token_amount_ui:,.2f} ({token_amount:,} atomic)")
@@ -592,36 +906,79 @@ class LocalSwapBuilder:
             )
 
             # Get blockhash (use cache if available)
-            if self._cached_blockhash:
+            if self._cached_blockhash and not fresh_blockhash:
                 recent_blockhash = self._cached_blockhash
             else:
                 blockhash_resp = self.client.get_latest_blockhash()
                 recent_blockhash = blockhash_resp.value.blockhash
 
+            # Idempotency - a hedged PumpPortal send may already own this trade
+            if guard is not None and not guard.claim("local"):
+                logger.info(f"🛑 {mint[:8]}... already submitted by another path - skipping local send")
+                return None
+            if on_wire:
+                on_wire()
+
             # ===== ATTEMPT 1: JITO (same as buys) =====
-            from config import JITO_ENABLED, JITO_TIP_SELL_SOL
+            from config import JITO_ENABLED, JITO_TIP_SELL_SOL, SUBMIT_MODE, JITO_BUNDLES_ENABLED
+
+            # Use lower tip for sells (less time-critical than buys) unless land rates say otherwise
+            jito_tip_sol = self.landing.choose_tip(urgency, JITO_TIP_SELL_SOL) * fee_multiplier
+            tip_lamports = int(jito_tip_sol * 1e9)
+
+            if JITO_ENABLED and JITO_BUNDLES_ENABLED:
+                logger.info(f"   📦 Trying Jito bundle (tip TX: {jito_tip_sol} SOL)...")
+                sig = await self.send_bundle(
+                    [sell_ix],
+                    jito_tip_sol,
+                    recent_blockhash,
+                    companions=bundle_companions,
+                    label="sell"
+                )
+                if sig:
+                    self.landing.track(sig, "bundle", tip_lamports, urgency)
+                    total_time = (time.time() - start) * 1000
+                    logger.info(f"✅ LOCAL sell bundle in {total_time:.1f}ms: {sig}")
+                    return sig
+                logger.warning("⚠️ Bundle rejected - falling back to single-TX path")
+
+            if SUBMIT_MODE == 'fanout':
+                shape = instruction_shape("sell", has_tip=True)
+                tx_bytes, cu_limit, cu_price = self._build_fanout_transaction(
+                    [sell_ix], jito_tip_sol, recent_blockhash, urgency=urgency, shape=shape,
+                    fee_multiplier=fee_multiplier
+                )
+
+                logger.info(f"   💰 Fan-out to Jito + RPC routes (tip: {jito_tip_sol} SOL)...")
+                sig = await self.submitter.submit(tx_bytes, label="sell")
+                if sig:
+                    self.landing.track(sig, "fanout", tip_lamports, urgency)
+                    self.rebroadcaster.add(sig, tx_bytes, label="sell")
+                    self.cu_profiler.note_submission(sig, shape, cu_limit, cu_price)
+                    total_time = (time.time() - start) * 1000
+                    logger.info(f"✅ LOCAL sell TX via fan-out in {total_time:.1f}ms: {sig}")
+                    return sig
+                logger.warning("⚠️ Fan-out sell: no route accepted")
+                return None
 
             sig = None
-            if JITO_ENABLED:
-                # Use lower tip for sells (less time-critical than buys)
-                jito_tip_sol = JITO_TIP_SELL_SOL  # 0.001 SOL (sells less time-critical)
-                tip_lamports = int(jito_tip_sol * 1e9)
+            use_jito = JITO_ENABLED and self.landing.rank_routes(urgency, ["jito", "rpc"])[0] == "jito"
+            if JITO_ENABLED and not use_jito:
+                logger.info(f"   🎯 RPC is landing {urgency} exits better than Jito - going direct")
+
+            if use_jito:
                 tip_ix = self._build_jito_tip_instruction(tip_lamports)
 
                 jito_instructions = [sell_ix, tip_ix]
 
-                message = Message.new_with_blockhash(
-                    jito_instructions,
-                    self.wallet.pubkey,
-                    recent_blockhash
-                )
-                tx = Transaction.new_unsigned(message)
-                tx.sign([self.wallet.keypair], recent_blockhash)
+                tx = self._sign_transaction(jito_instructions, recent_blockhash)
 
                 logger.info(f"   💰 Trying Jito first (tip: {jito_tip_sol} SOL)...")
                 sig = await self._send_via_jito(bytes(tx))
 
                 if sig:
+                    self.landing.track(sig, "jito", tip_lamports, urgency)
+                    self.rebroadcaster.add(sig, bytes(tx), label="sell")
                     total_time = (time.time() - start) * 1000
                     logger.info(f"✅ LOCAL sell TX via Jito in {total_time:.1f}ms: {sig}")
                     return sig
@@ -631,33 +988,34 @@ class LocalSwapBuilder:
             # ===== ATTEMPT 2: RPC with priority fee =====
             from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
 
-            # 0.002 SOL priority fee for fast inclusion
-            compute_limit_ix = set_compute_unit_limit(200_000)
-            compute_price_ix = set_compute_unit_price(10_000_000)
+            # Priority fee from the oracle's rolling percentile for this urgency
+            # CU limit sized from measured consumption of this shape
+            shape = instruction_shape("sell")
+            cu_price = int(self.fee_oracle.get_fee(urgency) * fee_multiplier)
+            cu_limit = self.cu_profiler.limit_for(shape)
+            compute_limit_ix = set_compute_unit_limit(cu_limit)
+            compute_price_ix = set_compute_unit_price(cu_price)
 
             rpc_instructions = [compute_limit_ix, compute_price_ix, sell_ix]
 
             # Use cached blockhash - don't add 100-500ms delay for fresh one
             # Blockhash refreshes every 800ms, still valid from Jito attempt
 
-            message = Message.new_with_blockhash(
-                rpc_instructions,
-                self.wallet.pubkey,
-                recent_blockhash
-            )
-            tx = Transaction.new_unsigned(message)
-            tx.sign([self.wallet.keypair], recent_blockhash)
+            tx = self._sign_transaction(rpc_instructions, recent_blockhash)
 
-            logger.info(f"   💰 RPC fallback with priority fee...")
+            logger.info(f"   💰 RPC fallback with priority fee {cu_price:,} µL/CU ({urgency}), limit {cu_limit:,} CU...")
+            self.cu_profiler.simulate_in_background(shape, tx)
 
             opts = TxOpts(skip_preflight=True, preflight_commitment="processed")
-            response = self.client.send_raw_transaction(bytes(tx), opts)
-            sig = str(response.value)
+            sig = self._send_via_rpc(bytes(tx), opts)
 
             if sig.startswith("1111111"):
                 logger.error("Transaction failed - invalid signature")
                 return None
 
+            self.landing.track(sig, "rpc", 0, urgency, priority_fee_lamports=cu_limit * cu_price // 1_000_000)
+            self.rebroadcaster.add(sig, bytes(tx), label="sell", jito=False)
+            self.cu_profiler.note_submission(sig, shape, cu_limit, cu_price)
             total_time = (time.time() - start) * 1000
             logger.info(f"✅ LOCAL sell TX via RPC in {total_time:.1f}ms: {sig}")
 
@@ -0,0 +1,241 @@
+"""
+Address Lookup Table Manager - Bot-owned ALT for the static PumpFun accounts
+Lets LocalSwapBuilder compile v0 messages that reference static keys by 1-byte index
+"""
+
+import asyncio
+import json
+import logging
+import os
+import struct
+import time
+from typing import Dict, List, Optional
+
+from solders.address_lookup_table_account import (
+    ID as ADDRESS_LOOKUP_TABLE_PROGRAM_ID,
+    AddressLookupTable,
+    AddressLookupTableAccount,
+    derive_lookup_table_address,
+)
+from solders.instruction import Instruction, AccountMeta
+from solders.message import Message
+from solders.pubkey import Pubkey
+from solders.transaction import Transaction
+from solana.rpc.types import TxOpts
+
+from config import SYSTEM_PROGRAM_ID
+
+logger = logging.getLogger(__name__)
+
+# Lookup table program instruction tags (bincode u32 enum index)
+CREATE_LOOKUP_TABLE = 0
+EXTEND_LOOKUP_TABLE = 2
+
+MAX_ADDRESSES_PER_EXTEND = 20  # Keeps each extend TX well under the packet size
+ACTIVE_DEACTIVATION_SLOT = 2 ** 64 - 1
+
+
+class LookupTableManager:
+    """Creates, extends and loads the bot's address lookup table"""
+
+    def __init__(self, wallet_manager, rpc_client, table_path: str = None):
+        from config import LOOKUP_TABLE_PATH
+
+        self.wallet = wallet_manager
+        self.client = rpc_client
+        self.table_path = table_path or LOOKUP_TABLE_PATH
+
+        # Accounts we want in the table (set by LocalSwapBuilder)
+        self.static_accounts: List[Pubkey] = []
+
+        self.address: Optional[Pubkey] = None
+        self.table: Optional[AddressLookupTableAccount] = None
+
+        self.stats = {
+            'v0_built': 0,
+            'legacy_built': 0,
+            'v0_bytes_total': 0,
+            'legacy_bytes_total': 0,
+            'compile_failures': 0,
+        }
+
+    def set_static_accounts(self, accounts: List[Pubkey]):
+        seen = set()
+        self.static_accounts = [a for a in accounts if not (a in seen or seen.add(a))]
+
+    def _configured_address(self) -> Optional[Pubkey]:
+        from config import LOOKUP_TABLE_ADDRESS
+
+        if LOOKUP_TABLE_ADDRESS:
+            return Pubkey.from_string(LOOKUP_TABLE_ADDRESS)
+        try:
+            if os.path.exists(self.table_path):
+                with open(self.table_path) as f:
+                    return Pubkey.from_string(json.load(f)['address'])
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read lookup table file: {e}")
+        return None
+
+    def _persist_address(self):
+        try:
+            os.makedirs(os.path.dirname(self.table_path) or '.', exist_ok=True)
+            with open(self.table_path, 'w') as f:
+                json.dump({'address': str(self.address), 'created_at': time.time()}, f)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save lookup table address: {e}")
+
+    def _fetch(self, address: Pubkey) -> Optional[AddressLookupTable]:
+        resp = self.client.get_account_info(address)
+        if not resp.value:
+            return None
+        return AddressLookupTable.deserialize(bytes(resp.value.data))
+
+    async def load(self) -> bool:
+        """Fetch the table from chain - v0 compilation is only used once this succeeds"""
+        self.address = self.address or self._configured_address()
+        if self.address is None:
+            logger.info("📇 No address lookup table configured - legacy transactions only (/alt setup to create)")
+            return False
+
+        try:
+            table = await asyncio.to_thread(self._fetch, self.address)
+            if table is None:
+                logger.warning(f"⚠️ Lookup table {self.address} not found on chain")
+                self.table = None
+                return False
+            if table.meta.deactivation_slot != ACTIVE_DEACTIVATION_SLOT:
+                logger.warning(f"⚠️ Lookup table {self.address} is deactivated - legacy transactions only")
+                self.table = None
+                return False
+
+            addresses = list(table.addresses)
+            # Addresses from an extend in the current slot are not usable until the next slot
+            current_slot = (await asyncio.to_thread(self.client.get_slot)).value
+            if current_slot <= table.meta.last_extended_slot:
+                addresses = addresses[:table.meta.last_extended_slot_start_index]
+
+            self.table = AddressLookupTableAccount(self.address, addresses)
+            missing = len(self.missing_accounts())
+            logger.info(
+                f"📇 Lookup table loaded: {self.address} ({len(addresses)} addresses"
+                f"{f', {missing} missing - run /alt setup' if missing else ''})"
+            )
+            return True
+
+        except Exception as e:
+            logger.warning(f"⚠️ Lookup table load failed: {e}")
+            self.table = None
+            return False
+
+    def missing_accounts(self) -> List[Pubkey]:
+        present = set(self.table.addresses) if self.table else set()
+        return [a for a in self.static_accounts if a not in present]
+
+    def get_tables(self) -> List[AddressLookupTableAccount]:
+        """Tables to compile v0 messages against (empty = use legacy)"""
+        from config import USE_VERSIONED_TX
+
+        if not USE_VERSIONED_TX or self.table is None:
+            return []
+        return [self.table]
+
+    def record_build(self, versioned: bool, size: int):
+        prefix = 'v0' if versioned else 'legacy'
+        self.stats[f'{prefix}_built'] += 1
+        self.stats[f'{prefix}_bytes_total'] += size
+
+    # ===== MAINTENANCE (operator-triggered, costs rent + fees) =====
+
+    def _create_instruction(self, recent_slot: int):
+        authority = self.wallet.pubkey
+        table_address, bump = derive_lookup_table_address(authority, recent_slot)
+        data = struct.pack('<I', CREATE_LOOKUP_TABLE) + struct.pack('<Q', recent_slot) + bytes([bump])
+        accounts = [
+            AccountMeta(table_address, is_signer=False, is_writable=True),
+            AccountMeta(authority, is_signer=True, is_writable=False),
+            AccountMeta(authority, is_signer=True, is_writable=True),   # Payer
+            AccountMeta(SYSTEM_PROGRAM_ID, is_signer=False, is_writable=False),
+        ]
+        return table_address, Instruction(ADDRESS_LOOKUP_TABLE_PROGRAM_ID, data, accounts)
+
+    def _extend_instruction(self, table_address: Pubkey, new_addresses: List[Pubkey]) -> Instruction:
+        authority = self.wallet.pubkey
+        data = (
+            struct.pack('<I', EXTEND_LOOKUP_TABLE)
+            + struct.pack('<Q', len(new_addresses))
+            + b''.join(bytes(a) for a in new_addresses)
+        )
+        accounts = [
+            AccountMeta(table_address, is_signer=False, is_writable=True),
+            AccountMeta(authority, is_signer=True, is_writable=False),
+            AccountMeta(authority, is_signer=True, is_writable=True),   # Payer
+            AccountMeta(SYSTEM_PROGRAM_ID, is_signer=False, is_writable=False),
+        ]
+        return Instruction(ADDRESS_LOOKUP_TABLE_PROGRAM_ID, data, accounts)
+
+    def _send_and_confirm(self, instructions: list) -> str:
+        from solana.rpc.commitment import Confirmed
+
+        blockhash = self.client.get_latest_blockhash().value.blockhash
+        message = Message.new_with_blockhash(instructions, self.wallet.pubkey, blockhash)
+        tx = Transaction.new_unsigned(message)
+        tx.sign([self.wallet.keypair], blockhash)
+        sig = self.client.send_raw_transaction(bytes(tx), TxOpts(skip_preflight=False)).value
+        self.client.confirm_transaction(sig, commitment=Confirmed)
+        return str(sig)
+
+    async def setup(self) -> Dict:
+        """
+        Create the table if needed and extend it with any missing static accounts
+        Returns a summary for the operator
+        """
+        from solana.rpc.commitment import Finalized
+
+        summary = {'created': None, 'extended': 0, 'signatures': []}
+
+        if self.address is None:
+            self.address = self._configured_address()
+        if self.address is not None and self.table is None:
+            await self.load()
+
+        if self.address is None or self.table is None:
+            recent_slot = (await asyncio.to_thread(self.client.get_slot, Finalized)).value
+            table_address, create_ix = self._create_instruction(recent_slot)
+            sig = await asyncio.to_thread(self._send_and_confirm, [create_ix])
+            self.address = table_address
+            self.table = AddressLookupTableAccount(table_address, [])
+            self._persist_address()
+            summary['created'] = str(table_address)
+            summary['signatures'].append(sig)
+            logger.info(f"📇 Created lookup table {table_address}: {sig}")
+
+        missing = self.missing_accounts()
+        for i in range(0, len(missing), MAX_ADDRESSES_PER_EXTEND):
+            chunk = missing[i:i + MAX_ADDRESSES_PER_EXTEND]
+            sig = await asyncio.to_thread(
+                self._send_and_confirm, [self._extend_instruction(self.address, chunk)]
+            )
+            summary['extended'] += len(chunk)
+            summary['signatures'].append(sig)
+            logger.info(f"📇 Extended lookup table with {len(chunk)} addresses: {sig}")
+
+        # New entries activate one slot after the extend lands
+        await asyncio.sleep(1.0)
+        await self.load()
+        summary['address'] = str(self.address)
+        summary['addresses'] = len(self.table.addresses) if self.table else 0
+        return summary
+
+    def get_stats(self) -> dict:
+        s = self.stats
+        return {
+            'address': str(self.address) if self.address else None,
+            'loaded': self.table is not None,
+            'addresses': len(self.table.addresses) if self.table else 0,
+            'missing': len(self.missing_accounts()),
+            'v0_built': s['v0_built'],
+            'legacy_built': s['legacy_built'],
+            'avg_v0_bytes': (s['v0_bytes_total'] / s['v0_built']) if s['v0_built'] else 0.0,
+            'avg_legacy_bytes': (s['legacy_bytes_total'] / s['legacy_built']) if s['legacy_built'] else 0.0,
+            'compile_failures': s['compile_failures'],
+        }
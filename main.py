@@ -17,7 +17,7 @@ from config import (
     BUY_AMOUNT_SOL, MAX_POSITIONS, MIN_SOL_BALANCE,
     STOP_LOSS_PERCENTAGE, TAKE_PROFIT_PERCENTAGE,
     SELL_DELAY_SECONDS, MAX_POSITION_AGE_SECONDS,
-    MONITOR_CHECK_INTERVAL, DATA_FAILURE_TOLERANCE,
+    DATA_FAILURE_TOLERANCE,
     DRY_RUN, ENABLE_TELEGRAM_NOTIFICATIONS,
     BLACKLISTED_TOKENS, NOTIFY_PROFIT_THRESHOLD,
     PARTIAL_TAKE_PROFIT, LIQUIDITY_MULTIPLIER,
@@ -34,6 +34,11 @@ from config import (
     TIMER_MAX_EXTENSIONS,
     FAIL_FAST_CHECK_TIME, FAIL_FAST_PNL_THRESHOLD,
     MIN_BONDING_CURVE_SOL, MAX_BONDING_CURVE_SOL,
+    CONFIRMATION_BUY_TIMEOUT,
+    FILL_EVENT_GRACE,
+    PENDING_FILL_EXIT_WAIT,
+    BALANCE_STREAM_ENABLED,
+    EXIT_NONCE_ENABLED,
 )
 
 from wallet import WalletManager
@@ -41,9 +46,23 @@ from dex import PumpFunDEX
 from helius_logs_monitor import HeliusLogsMonitor
 from pumpportal_trader import PumpPortalTrader
 from local_swap import LocalSwapBuilder
+from jito_sessions import JitoSessionPool
+from endpoint_health import EndpointHealthRegistry
+from landing_tracker import LandingTracker
+from fee_oracle import PriorityFeeOracle
+from hedged_executor import HedgedExecutor
+from confirmation_service import ConfirmationService
+from signature_poller import SignatureStatusPoller
+from fill_tracker import FillTracker
+from balance_stream import BalanceStream
 from performance_tracker import PerformanceTracker
 from trade_logger import TradeLogger
 from curve_reader import BondingCurveReader
+from curve_store import CurveStore, estimate_reserves
+from curve_quoter import CurveQuoter
+from position_supervisor import PositionSupervisor
+from exit_armer import ExitArmer
+from exit_ladder import ExitRetryLadder
 
 logging.basicConfig(
     level=getattr(logging, LOG_LEVEL),
@@ -68,7 +87,6 @@ class Position:
         self.status = 'active'
         self.buy_signature = None
         self.sell_signatures = []
-        self.monitor_task = None
         self.exit_time = None
         self.extensions_used = 0
         self.max_pnl_reached = 0
@@ -79,6 +97,7 @@ class Position:
         self.total_sold_percent = 0
         self.realized_pnl_sol = 0
         self.is_closing = False
+        self.supervised_exit = None  # Reason of the timer exit being retried by the supervisor
         self.retry_counts = {}
         self.last_valid_price = 0
         self.last_price_update = time.time()
@@ -106,6 +125,13 @@ class Position:
         self.last_recorded_pnl = -999  # Start at impossible value
         self.first_price_check_done = False
 
+        # Optimistic open: exits are armed before the buy fill is reconciled
+        self.fill_pending = False
+        self.fill_ready = asyncio.Event()
+
+        # Curve-SOL exit levels (rug floor / tier drop), re-armed whenever the peak moves
+        self.exit_triggers = None
+
 class SniperBot:
     """Main sniper bot orchestrator with velocity gate, timer exits, and fail-fast"""
     
@@ -116,7 +142,15 @@ class SniperBot:
         logger.info("=" * 60)
         
         self.wallet = WalletManager()
-        self.dex = PumpFunDEX(self.wallet)
+
+        # One bonding curve store: exact reserves from every TradeEvent + accountSubscribe on held curves
+        self.curves = CurveStore(
+            self.wallet.client,
+            retain_source=lambda: self.scanner.watched_tokens if self.scanner else ()
+        )
+        # Exact u64 curve quotes with Global / FeeConfig fee rules (validated against our fills)
+        self.quoter = CurveQuoter(self.wallet.client)
+        self.dex = PumpFunDEX(self.wallet, curve_store=self.curves)
         self.scanner = None
         self.scanner_task = None
         self.telegram = None
@@ -128,15 +162,75 @@ class SniperBot:
         from config import RPC_ENDPOINT, PUMPFUN_PROGRAM_ID
         
         rpc_client = Client(RPC_ENDPOINT.replace('wss://', 'https://').replace('ws://', 'http://'))
-        self.curve_reader = BondingCurveReader(rpc_client, PUMPFUN_PROGRAM_ID)
+        self.curve_reader = BondingCurveReader(
+            rpc_client, PUMPFUN_PROGRAM_ID, curve_store=self.curves, quoter=self.quoter
+        )
         
         
         client = Client(RPC_ENDPOINT.replace('wss://', 'https://').replace('ws://', 'http://'))
-        self.trader = PumpPortalTrader(self.wallet, client)
-        self.local_builder = LocalSwapBuilder(self.wallet, client)
+        # One health registry shared by every outbound path (Jito, RPC, PumpPortal)
+        from config import BACKUP_RPC_ENDPOINTS
+        self.health = EndpointHealthRegistry()
+        for rpc_url in [RPC_ENDPOINT] + list(BACKUP_RPC_ENDPOINTS):
+            if rpc_url:
+                self.health.register(rpc_url, probe=self.health.rpc_probe)
+
+        self.jito_pool = JitoSessionPool(health=self.health)
+
+        # One batched getSignatureStatuses per tick shared by every TX we are waiting on
+        self.sig_poller = SignatureStatusPoller(client)
+
+        # Every submitted signature is followed to landed/dropped (slots measured from blockhash cache)
+        self.landing = LandingTracker(
+            client, slot_source=lambda: self.local_builder._cached_slot, poller=self.sig_poller
+        )
+        self.fee_oracle = PriorityFeeOracle()
+
+        self.trader = PumpPortalTrader(
+            self.wallet, client, jito_pool=self.jito_pool, health=self.health,
+            landing=self.landing, fee_oracle=self.fee_oracle
+        )
+        self.local_builder = LocalSwapBuilder(
+            self.wallet, client, jito_pool=self.jito_pool, health=self.health,
+            landing=self.landing, fee_oracle=self.fee_oracle, curve_store=self.curves,
+            quoter=self.quoter
+        )
+        # PumpPortal sends rebroadcast through the builder's submitter too
+        self.trader.rebroadcaster = self.local_builder.rebroadcaster
+
+        # Ready-signed full exit per position, re-signed on every new blockhash
+        self.exit_armer = ExitArmer(self.local_builder)
+
+        # signatureSubscribe-based confirmations (polling only if a subscription fails)
+        self.confirmations = ConfirmationService(client, poller=self.sig_poller)
+
+        # Exact fills from our own TradeEvents on the logs stream (getTransaction only reconciles fees)
+        self.fills = FillTracker(self.wallet.pubkey, quoter=self.quoter)
+
+        # accountSubscribe-fed SOL / token balances - wallet reads stay in memory on the hot path
+        self.balance_stream = BalanceStream(self.wallet)
+        if BALANCE_STREAM_ENABLED:
+            self.wallet.balance_stream = self.balance_stream
+
+        # Local vs PumpPortal submission (serial fallback or hedged race, one sender per trade)
+        self.hedger = HedgedExecutor()
+
+        # Exit failure detection from signatureSubscribe / own TradeEvents + escalating resubmits
+        self.exit_ladder = ExitRetryLadder(
+            self.confirmations, self.fills, slot_source=lambda: self.local_builder._cached_slot
+        )
+
+        # Fan-out landing attribution comes from the landing tracker's resolution
+        self.landing.add_listener(
+            lambda sig, record: self.local_builder.submitter.record_landed(sig, record['landed'])
+        )
 
         self.positions: Dict[str, Position] = {}
+        # One expiry-heap scheduler for every position's timers (max age, stale data, progress log)
+        self.supervisor = PositionSupervisor(self._supervise_position)
         self.pending_buys = 0
+        # Sell events seen on held mints vs the ones that crossed a trigger level
+        self.exit_trigger_stats = {'events': 0, 'full_checks': 0, 'exits': 0, 'arms': 0}
         self.total_trades = 0
         self.profitable_trades = 0
         self.total_pnl = 0
@@ -254,8 +348,9 @@ class SniperBot:
         now = time.time()
         age = now - position.entry_time
 
-        # Get curve values from Helius (real-time, no RPC)
-        current_curve = state.get('vSolInBondingCurve', 0)
+        # Get curve values from the curve store (real-time, no RPC), monitor state if it has nothing
+        snapshot = self.curves.get(mint)
+        current_curve = snapshot['sol_in_curve'] if snapshot else state.get('vSolInBondingCurve', 0)
         entry_curve = getattr(position, 'entry_sol_in_curve', 0) or getattr(position, 'detection_curve_sol', 0) or 6.0
 
         # Track peak curve
@@ -264,11 +359,8 @@ class SniperBot:
             state['peak_curve_sol'] = current_curve
             peak_curve = current_curve
 
-        # Calculate P&L from ACTUAL fill price
-        VIRTUAL_RESERVES = 30.0
-        virtual_sol_lamports = (current_curve + VIRTUAL_RESERVES) * 1e9
-        INITIAL_K = 30e9 * 1073000191e6
-        virtual_tokens_atomic = INITIAL_K / virtual_sol_lamports
+        # Calculate P&L from ACTUAL fill price (exact reserves when the store has them)
+        virtual_sol_lamports, virtual_tokens_atomic = self.curves.reserves(mint, current_curve)
         current_price = virtual_sol_lamports / virtual_tokens_atomic
 
         entry_price = getattr(position, 'entry_token_price_sol', 0)
@@ -328,15 +420,58 @@ class SniperBot:
 
         return False, "", pnl_percent
 
+    def _arm_exit_triggers(self, position: Position, peak_curve: float):
+        """
+        Precompute curve-SOL levels where _check_curve_exits could fire (at entry and on each new peak)
+        Tier 1 drop: peak - TIER1_CURVE_DROP_SOL, Tier 2 decay: peak * (1 - TIER2_DROP_FROM_PEAK_PCT)
+        """
+        from config import (
+            RUG_FLOOR_SOL, MIN_EXIT_AGE_SECONDS,
+            TIER1_MAX_CURVE_SOL, TIER1_CURVE_DROP_SOL,
+            TIER2_DROP_FROM_PEAK_PCT
+        )
+
+        if peak_curve < TIER1_MAX_CURVE_SOL:
+            drop_level = peak_curve - TIER1_CURVE_DROP_SOL
+        else:
+            drop_level = peak_curve * (1 - TIER2_DROP_FROM_PEAK_PCT)
+
+        position.exit_triggers = {
+            'peak': peak_curve,
+            'rug_floor': RUG_FLOOR_SOL,
+            'drop_level': drop_level + 1e-9,  # Float slack - the full check decides at the boundary
+            'age_gate': position.entry_time + MIN_EXIT_AGE_SECONDS,
+        }
+        self.exit_trigger_stats['arms'] += 1
+
+    def _exit_triggers_crossed(self, position: Position, state: dict) -> bool:
+        """Per-event exit pre-check: a few float compares against the armed levels"""
+        triggers = position.exit_triggers
+        current_curve = state.get('vSolInBondingCurve', 0)
+        peak_curve = state.get('peak_curve_sol', current_curve)
+
+        if triggers is None or peak_curve > triggers['peak']:
+            self._arm_exit_triggers(position, max(peak_curve, current_curve))
+            triggers = position.exit_triggers
+
+        if current_curve < triggers['rug_floor']:
+            return True
+        return current_curve <= triggers['drop_level'] and time.time() >= triggers['age_gate']
+
     async def _on_position_sell(self, mint: str, state: dict):
         """
         INSTANT EXIT CHECK - Called by Helius on EVERY sell event.
-        Runs full exit condition check immediately (no 2-second delay).
+        Compares against precomputed trigger levels; the full rule check only runs on a crossing.
         """
         position = self.positions.get(mint)
         if not position or position.status != 'active' or position.is_closing:
             return
 
+        self.exit_trigger_stats['events'] += 1
+        if not self._exit_triggers_crossed(position, state):
+            return
+        self.exit_trigger_stats['full_checks'] += 1
+
         # DEBUG: Log callback fired and current curve state
         current_curve = state.get('vSolInBondingCurve', 0)
         peak_curve = state.get('peak_curve_sol', 0)
@@ -344,10 +479,11 @@ class SniperBot:
         age = time.time() - position.entry_time
         logger.info(f"⚡ SELL CB: {mint[:8]}... curve={current_curve:.2f} peak={peak_curve:.2f} drop={curve_drop:.2f} age={age:.1f}s")
 
-        # Run FULL exit condition check instantly (same logic as monitoring loop)
+        # Trigger level crossed - run the FULL exit condition check (recent buy flow can still hold)
         should_exit, exit_reason, pnl_percent = self._check_curve_exits(mint, position)
 
         if should_exit:
+            self.exit_trigger_stats['exits'] += 1
             logger.warning(f"⚡ INSTANT EXIT: {exit_reason} (triggered by sell event)")
             await self._close_position_full(mint, reason=exit_reason)
             return
@@ -373,6 +509,10 @@ class SniperBot:
         if current_curve >= 85:
             logger.warning(f"⚡ INSTANT MIGRATION: Curve at {current_curve:.0f} SOL")
             await self._close_position_full(mint, reason="migration")
+            return
+
+        # P&L moves on trade events - no polling
+        self._update_position_pnl(mint, position)
 
     async def _fetch_sol_price_birdeye(self) -> float:
         """
@@ -518,11 +658,15 @@ class SniperBot:
         try:
             from solders.signature import Signature as SoldersSignature
             
+            from solana.rpc.commitment import Confirmed
+
             tx_sig = SoldersSignature.from_string(signature)
             
-            tx_response = self.trader.client.get_transaction(
+            tx_response = await asyncio.to_thread(
+                self.trader.client.get_transaction,
                 tx_sig,
                 encoding="jsonParsed",
+                commitment=Confirmed,
                 max_supported_transaction_version=0
             )
             
@@ -535,6 +679,7 @@ class SniperBot:
                 return {"confirmed": False, "sol_delta": 0.0, "token_delta": 0.0}
             
             meta = tx.transaction.meta
+            self.local_builder.cu_profiler.observe(signature, meta)
             my_pubkey_str = str(self.wallet.pubkey)
             
             sol_delta = 0.0
@@ -588,6 +733,57 @@ class SniperBot:
             logger.debug(traceback.format_exc())
             return {"confirmed": False, "sol_delta": 0.0, "token_delta": 0.0}
 
+    async def _await_own_fill(self, signature: str, timeout: float) -> tuple:
+        """
+        Wait for our own TradeEvent for signature, stopping early if the TX fails on-chain
+        Returns (fill or None, confirmation dict or None if the fill arrived first)
+        """
+        fill_task = asyncio.create_task(self.fills.wait(signature, timeout))
+        confirm_task = asyncio.create_task(self.confirmations.wait(signature, "confirmed", timeout=timeout))
+        done, _ = await asyncio.wait({fill_task, confirm_task}, return_when=asyncio.FIRST_COMPLETED)
+
+        if fill_task in done and fill_task.result():
+            confirm_task.cancel()
+            return fill_task.result(), None
+
+        confirmation = await confirm_task
+        if confirmation['status'] != 'confirmed':
+            fill_task.cancel()
+            return None, confirmation
+
+        # Confirmed - the logs notification for the same commitment is normally right behind it
+        try:
+            fill = await asyncio.wait_for(fill_task, timeout=FILL_EVENT_GRACE)
+        except asyncio.TimeoutError:
+            fill = None
+        return fill, confirmation
+
+    async def _reconcile_fill_fees(self, signature: str, mint: str):
+        """Background getTransaction for a TradeEvent fill - network fee + tip and CU profile only"""
+        try:
+            txd = {"confirmed": False}
+            for _ in range(3):
+                txd = await self._get_transaction_deltas(signature, mint)
+                if txd["confirmed"]:
+                    break
+                await asyncio.sleep(1.0)
+            if not txd["confirmed"]:
+                return
+
+            network_fee = self.fills.record_reconciliation(signature, txd["sol_delta"])
+            if network_fee is None:
+                return
+            logger.debug(f"🧾 Fee reconciliation {signature[:8]}: network fee + tip {network_fee:.6f} SOL")
+
+            fill = self.fills.get(signature)
+            position = self.positions.get(mint)
+            if fill and fill['is_buy'] and position and getattr(position, 'buy_signature', None) == signature:
+                # Cost basis includes what the wallet actually paid
+                position.amount_sol = abs(txd["sol_delta"])
+
+        except Exception as e:
+            logger.debug(f"Fill fee reconciliation failed for {signature[:8]}: {e}")
+
     async def _get_transaction_proceeds_robust(
         self,
         signature: str,
@@ -599,6 +795,7 @@ class SniperBot:
         """
         try:
             from solders.signature import Signature as SoldersSignature
+            from solana.rpc.commitment import Confirmed
 
             tx_sig = SoldersSignature.from_string(signature)
             start = time.time()
@@ -608,28 +805,45 @@ class SniperBot:
             logger.info(f"   My wallet: {my_pubkey_str}")
             logger.info(f"   Token mint: {mint[:16]}...")
 
-            # Poll for transaction to appear
+            # Our own TradeEvent carries the exact proceeds - no getTransaction on the hot path
+            fill, confirmation = await self._await_own_fill(signature, max_wait)
+            if fill:
+                asyncio.create_task(self._reconcile_fill_fees(signature, mint))
+                wait_time = time.time() - start
+                logger.info(f"✅ Fill from TradeEvent: {fill['sol_delta']:+.6f} SOL for {fill['tokens']:,.2f} tokens ({wait_time:.1f}s)")
+                return {
+                    "success": True,
+                    "sol_received": fill['sol_delta'],
+                    "tokens_sold": fill['tokens'],
+                    "wait_time": wait_time
+                }
+
+            if confirmation['status'] == 'failed':
+                logger.error(f"❌ Transaction failed on-chain: {confirmation['err']}")
+                return {"success": False, "sol_received": 0, "tokens_sold": 0, "wait_time": time.time() - start}
+            if confirmation['status'] == 'confirmed':
+                logger.debug(f"✓ Confirmed via {confirmation['source']} in {confirmation['latency_ms']:.0f}ms")
+
+            # Confirmed - fetch the parsed TX (RPC may lag the notification by a moment)
             tx = None
-            while time.time() - start < max_wait:
+            while confirmation['status'] == 'confirmed' and time.time() - start < max_wait + 5:
                 try:
-                    status = self.trader.client.get_signature_statuses([tx_sig])
-
-                    if status and status.value and status.value[0]:
-                        tx_response = self.trader.client.get_transaction(
-                            tx_sig,
-                            encoding="jsonParsed",
-                            max_supported_transaction_version=0
-                        )
+                    tx_response = self.trader.client.get_transaction(
+                        tx_sig,
+                        encoding="jsonParsed",
+                        commitment=Confirmed,
+                        max_supported_transaction_version=0
+                    )
 
-                        if tx_response and tx_response.value:
-                            tx = tx_response.value
-                            logger.debug(f"✓ Transaction found at {time.time() - start:.1f}s")
-                            break
+                    if tx_response and tx_response.value:
+                        tx = tx_response.value
+                        logger.debug(f"✓ Transaction found at {time.time() - start:.1f}s")
+                        break
 
                 except Exception as e:
-                    logger.debug(f"Poll attempt failed (retrying): {e}")
+                    logger.debug(f"get_transaction failed (retrying): {e}")
 
-                await asyncio.sleep(0.5)
+                await asyncio.sleep(0.25)
 
             if not tx:
                 wait_time = time.time() - start
@@ -651,6 +865,7 @@ class SniperBot:
                 return {"success": False, "sol_received": 0, "tokens_sold": 0, "wait_time": time.time() - start}
 
             meta = tx.transaction.meta
+            self.local_builder.cu_profiler.observe(signature, meta)
 
             # =========================================================================
             # DEBUG: Log transaction structure
@@ -904,7 +1119,10 @@ class SniperBot:
                 self.on_token_found,
                 rpc_client,
                 exit_callback=self._on_position_sell,
-                buy_callback=self._on_position_buy
+                buy_callback=self._on_position_buy,
+                fill_tracker=self.fills,
+                decimals_resolver=self.wallet.decimals,
+                curve_store=self.curves
             )
 
         if self.scanner_task and not self.scanner_task.done():
@@ -943,6 +1161,7 @@ class SniperBot:
     async def on_token_found(self, token_data: Dict):
         """Handle new token found - with liquidity and velocity validation"""
         detection_start = time.time()
+        position_opened = False  # pending_buys is handed over to the position once it opens
         
         try:
             mint = token_data['mint']
@@ -986,6 +1205,9 @@ class SniperBot:
                     )
                 return
             
+            # Near-entry curve - kept fresh by the store's batched refresh for the rest of evaluation
+            self.curves.track(mint)
+
             # Handle different data sources
             source = token_data.get('source', 'pumpportal')
 
@@ -1068,10 +1290,15 @@ class SniperBot:
             ws_tokens = float(token_data_ws.get('vTokensInBondingCurve', 800_000_000))
             token_decimals = 6  # PumpFun ALWAYS uses 6 decimals
 
-            # Calculate price data from current SOL
-            actual_tokens_atomic = int(ws_tokens * (10 ** token_decimals))
-            virtual_sol = 30 + actual_sol  # Include 30 SOL virtual reserves
-            virtual_sol_lamports = int(virtual_sol * 1e9)
+            # Calculate price data - exact reserves from the curve store, else from current SOL
+            snapshot = self.curves.get(mint, max_age=2)
+            if snapshot and snapshot['is_valid']:
+                actual_tokens_atomic = snapshot['virtual_token_reserves']
+                virtual_sol_lamports = snapshot['virtual_sol_reserves']
+            else:
+                actual_tokens_atomic = int(ws_tokens * (10 ** token_decimals))
+                virtual_sol = 30 + actual_sol  # Include 30 SOL virtual reserves
+                virtual_sol_lamports = int(virtual_sol * 1e9)
             price_lamports_per_atomic = (virtual_sol_lamports / actual_tokens_atomic) if actual_tokens_atomic > 0 else 0
 
             # ✅ CORRECT: Calculate market cap from token price
@@ -1224,14 +1451,14 @@ class SniperBot:
             helius_sol = helius_events.get('vSolInBondingCurve', 0) if helius_events else 0
             creator = helius_events.get('creator') if helius_events else None
 
-            signature = None
+            local_call = None
             if creator and helius_sol > 0:
-                # Build curve directly from Helius data (no RPC delay)
-                virtual_sol = 30 + helius_sol
+                # Exact reserves from the curve store (no RPC delay), estimated from Helius SOL on a miss
+                virtual_sol_lamports, virtual_tokens_atomic = self.curves.reserves(mint, helius_sol)
                 curve_data = {
                     'is_valid': True,
-                    'virtual_sol_reserves': int(virtual_sol * 1e9),
-                    'virtual_token_reserves': int(1_073_000_191 * 1e6 * (30 / virtual_sol)),
+                    'virtual_sol_reserves': virtual_sol_lamports,
+                    'virtual_token_reserves': virtual_tokens_atomic,
                     'sol_raised': helius_sol,
                 }
                 logger.info(f"⚡ Local TX with Helius curve: {helius_sol:.2f} SOL")
@@ -1239,57 +1466,78 @@ class SniperBot:
                 # Get velocity from helius_events for dynamic slippage
                 velocity = helius_events.get('velocity', 0.0) if helius_events else 0.0
 
-                signature = await self.local_builder.create_buy_transaction(
+                local_call = lambda guard: self.local_builder.create_buy_transaction(
                     mint=mint,
                     sol_amount=buy_amount,
                     curve_data=curve_data,
                     slippage_bps=slippage_bps,  # Base slippage, will be increased dynamically
                     creator=creator,
-                    velocity=velocity
+                    velocity=velocity,
+                    guard=guard
                 )
 
-            # Fallback to PumpPortal if local build fails
-            if not signature:
-                logger.warning("⚠️ Local TX failed, falling back to PumpPortal...")
-                signature = await self.trader.create_buy_transaction(
+            # PumpPortal as fallback (serial) or hedge once local exceeds its latency budget
+            signature = await self.hedger.execute(
+                f"buy:{mint[:8]}",
+                local_call,
+                lambda guard: self.trader.create_buy_transaction(
                     mint=mint,
                     sol_amount=buy_amount,
                     bonding_curve_key=bonding_curve_key,
                     slippage=slippage_bps,
-                    urgency="buy"
+                    urgency="buy",
+                    guard=guard
                 )
+            )
             
             bought_tokens = 0
             actual_sol_spent = buy_amount
             actual_entry_price = estimated_entry_price  # Will be updated if we get real data
             
             if signature:
-                await asyncio.sleep(1.5)  # Reduced from 3s to 1.5s for faster confirmation
+                # Exit coverage from the moment the buy is submitted
+                self._open_pending_position(
+                    mint, signature, buy_amount, estimated_entry_price, entry_market_cap, creator,
+                    helius_sol if helius_sol > 0 else 6.0
+                )
+                position_opened = True
 
-                txd = await self._get_transaction_deltas(signature, mint)
+                # Our own TradeEvent on the logs stream gives the exact fill at confirmation
+                fill, _ = await self._await_own_fill(signature, CONFIRMATION_BUY_TIMEOUT)
+
+                if fill:
+                    bought_tokens = fill['tokens']
+                    actual_sol_spent = -fill['sol_delta']
+                    logger.info(f"✅ Real fill from TradeEvent: {bought_tokens:,.0f} tokens for {actual_sol_spent:.6f} SOL")
+                    # Network fee + tip (and CU profile) reconciled from getTransaction off the hot path
+                    asyncio.create_task(self._reconcile_fill_fees(signature, mint))
+
+                else:
+                    txd = await self._get_transaction_deltas(signature, mint)
                 
-                # ✅ CRITICAL FIX: Always read actual wallet balance
-                actual_wallet_balance = self.wallet.get_token_balance(mint)
+                    # ✅ CRITICAL FIX: Always read actual wallet balance (stream / one indexed read - exits are armed)
+                    actual_wallet_balance = await self._pending_fill_balance(mint)
                 
-                if txd["confirmed"] and txd["token_delta"] > 0:
-                    bought_tokens = txd["token_delta"]
-                    actual_sol_spent = abs(txd["sol_delta"])
+                    if txd["confirmed"] and txd["token_delta"] > 0:
+                        bought_tokens = txd["token_delta"]
+                        actual_sol_spent = abs(txd["sol_delta"])
 
-                    logger.info(f"✅ Real fill from TX: {bought_tokens:,.0f} tokens for {actual_sol_spent:.6f} SOL")
+                        logger.info(f"✅ Real fill from TX: {bought_tokens:,.0f} tokens for {actual_sol_spent:.6f} SOL")
 
-                    if actual_wallet_balance > 0 and abs(actual_wallet_balance - bought_tokens) > (bought_tokens * 0.1):
-                        logger.warning(f"⚠️ Wallet balance mismatch! TX says {bought_tokens:,.0f} but wallet has {actual_wallet_balance:,.0f}")
-                        bought_tokens = actual_wallet_balance
+                        if actual_wallet_balance > 0 and abs(actual_wallet_balance - bought_tokens) > (bought_tokens * 0.1):
+                            logger.warning(f"⚠️ Wallet balance mismatch! TX says {bought_tokens:,.0f} but wallet has {actual_wallet_balance:,.0f}")
+                            bought_tokens = actual_wallet_balance
 
-                elif actual_wallet_balance > 0:
-                    bought_tokens = actual_wallet_balance
-                    actual_sol_spent = _position_buy_amount  # Use stored value, not config
-                    logger.warning(f"⚠️ TX reading failed - using wallet balance: {bought_tokens:,.0f} tokens")
+                    elif actual_wallet_balance > 0:
+                        bought_tokens = actual_wallet_balance
+                        actual_sol_spent = _position_buy_amount  # Use stored value, not config
+                        logger.warning(f"⚠️ TX reading failed - using wallet balance: {bought_tokens:,.0f} tokens")
 
-                else:
-                    logger.warning("⚠️ No tokens in wallet - TX likely failed, moving on")
-                    self.pending_buys -= 1
-                    return
+                    else:
+                        logger.warning("⚠️ No tokens in wallet - TX likely failed, moving on")
+                        self._cancel_pending_position(mint, "buy never landed")
+                        self.tracker.log_buy_failed(mint, BUY_AMOUNT_SOL, "Transaction failed or no tokens received")
+                        return
 
                 _effective_entry_curve = None  # Will be set if high slippage detected
                 if bought_tokens > 0 and actual_sol_spent > 0:
@@ -1310,8 +1558,18 @@ class SniperBot:
                         # Only exit on SEVERE drops (-30%+), not normal volatility (-10% to -15% is common)
                         if entry_slippage < -30:
                             logger.warning(f"🚨 NEGATIVE ENTRY SLIPPAGE: {entry_slippage:.1f}% - dump in progress!")
+                            pending = self.positions.get(mint)
+                            if pending and pending.is_closing:
+                                # An armed exit already fired and is waiting on this fill
+                                pending.initial_tokens = pending.remaining_tokens = bought_tokens
+                                pending.amount_sol = actual_sol_spent
+                                pending.entry_token_price_sol = actual_entry_price
+                                self._settle_pending_position(pending)
+                                return
                             logger.warning(f"   Selling immediately to minimize loss")
-                            self.pending_buys -= 1
+                            if pending:
+                                pending.is_closing = True
+                                self._cancel_pending_position(mint, "negative entry slippage - emergency sell")
                             sell_sig = await self.trader.create_sell_transaction(
                                 mint=mint,
                                 token_amount=bought_tokens,
@@ -1367,7 +1625,18 @@ class SniperBot:
                     entry_price=actual_entry_price
                 )
                 
-                position = Position(mint, actual_sol_spent, bought_tokens, entry_market_cap)
+                position = self.positions.get(mint)
+                if position is None:
+                    logger.info(f"ℹ️ {mint[:8]} already exited before the fill was reconciled")
+                    return
+                if position.is_closing or position.status != 'active':
+                    # An armed exit already fired, sized from the wallet - keep its token counts, only the cost basis for P&L
+                    position.amount_sol = actual_sol_spent
+                    position.buy_amount = _position_buy_amount
+                    position.entry_token_price_sol = actual_entry_price
+                    self._settle_pending_position(position)
+                    logger.info(f"ℹ️ {mint[:8]} fill reconciled while closing - recorded entry cost only")
+                    return
                 position.entry_buyers = unique_buyers
                 position.buy_signature = signature
                 position.creator = creator  # Store for local sell TX
@@ -1388,7 +1657,6 @@ class SniperBot:
                 position.initial_tokens = bought_tokens
                 position.remaining_tokens = bought_tokens
                 position.last_valid_balance = bought_tokens
-                position.entry_time = time.time()
                 position.entry_token_price_sol = actual_entry_price  # ✅ Use ACTUAL entry price
                 position.amount_sol = actual_sol_spent
                 position.buy_amount = _position_buy_amount  # Store for accurate close P&L
@@ -1413,9 +1681,9 @@ class SniperBot:
                 else:
                     position.entry_curve_sol = helius_events.get('total_sol', 0) if helius_events else 0
 
-                self.positions[mint] = position
                 self.total_trades += 1
-                self.pending_buys -= 1
+                # Real fill known - exits waiting on it can size the sell now
+                self._settle_pending_position(position)
 
                 # Mark token as having active position (prevents Helius cleanup)
                 if self.scanner and mint in self.scanner.watched_tokens:
@@ -1465,199 +1733,260 @@ class SniperBot:
                             position.entry_curve_sol = fresh_curve
                             logger.info(f"📊 Entry baseline updated: {fresh_curve:.2f} SOL (post-buy, slippage={slippage_ratio:.2f}x)")
 
-                position.monitor_task = asyncio.create_task(self._monitor_position(mint))
-                logger.info(f"📊 Started monitoring position {mint[:8]}...")
+                logger.info(f"📊 Fill reconciled - monitoring position {mint[:8]} on real balance")
             else:
-                self.pending_buys -= 1
+                if signature:
+                    self._cancel_pending_position(mint, "no tokens received")
+                else:
+                    self.pending_buys -= 1
                 self.tracker.log_buy_failed(mint, BUY_AMOUNT_SOL, "Transaction failed or no tokens received")
                 
         except Exception as e:
-            self.pending_buys = max(0, self.pending_buys - 1)
+            pending = self.positions.get(mint)
+            if pending and pending.fill_pending:
+                # Buy may have landed - keep the armed exits, sized from the wallet balance
+                balance = await self._pending_fill_balance(mint)
+                if balance > 0:
+                    pending.initial_tokens = pending.remaining_tokens = balance
+                    self._settle_pending_position(pending)
+                else:
+                    self._cancel_pending_position(mint, "buy processing failed with no tokens in wallet")
+            elif not position_opened:
+                self.pending_buys = max(0, self.pending_buys - 1)
             logger.error(f"Failed to process token: {e}")
             import traceback
             logger.error(traceback.format_exc())
             self.tracker.log_buy_failed(mint, BUY_AMOUNT_SOL, str(e))
 
-    async def _monitor_position(self, mint: str):
-        """Monitor position - WHALE TIERED EXITS with FLATLINE DETECTION"""
+    def _open_pending_position(
+        self, mint: str, signature: str, buy_amount: float, estimated_entry_price: float,
+        entry_market_cap: float, creator: Optional[str], detection_curve_sol: float
+    ) -> Position:
+        """Open the position as soon as the buy is submitted - monitoring runs on estimated tokens"""
+        # Exact quote (impact + fees) against current reserves; spot price only if that fails
+        quote = self.quoter.quote_buy(int(buy_amount * 1e9), *self.curves.reserves(mint, detection_curve_sol))
+        if quote:
+            estimated_tokens = quote['tokens_out'] / 1e6
+        else:
+            estimated_tokens = (buy_amount * 1e9 / estimated_entry_price / 1e6) if estimated_entry_price > 0 else 0
+
+        position = Position(mint, buy_amount, estimated_tokens, entry_market_cap)
+        position.fill_pending = True
+        position.buy_signature = signature
+        position.creator = creator
+        position.buy_amount = buy_amount
+        position.entry_token_price_sol = estimated_entry_price
+        position.detection_curve_sol = detection_curve_sol
+        position.entry_sol_in_curve = detection_curve_sol
+        position.exit_time = position.entry_time + MAX_POSITION_AGE_SECONDS
+
+        self.positions[mint] = position
+        self.pending_buys -= 1  # Counted in positions from here on
+
+        state = self.scanner.watched_tokens.get(mint, {}) if self.scanner else {}
+        self._arm_exit_triggers(position, state.get('peak_curve_sol', detection_curve_sol))
+
+        if self.scanner and mint in self.scanner.watched_tokens:
+            self.scanner.watched_tokens[mint]['has_active_position'] = True
+
+        self._start_supervision(position)
+        self.exit_armer.arm(mint, creator, lambda: self._armed_exit_amount(mint, position))
+        self.wallet.register_token_account(mint)
+        if BALANCE_STREAM_ENABLED:
+            asyncio.create_task(self.balance_stream.watch_mint(mint))
+        asyncio.create_task(self.curves.watch(mint))
+        logger.info(f"⏳ Position {mint[:8]} opened pending fill (~{estimated_tokens:,.0f} tokens) - exits armed")
+        return position
+
+    def _settle_pending_position(self, position: Position):
+        position.fill_pending = False
+        position.fill_ready.set()
+        self.exit_armer.refresh(position.mint)
+
+    def _armed_exit_amount(self, mint: str, position: Position) -> Optional[float]:
+        """Tokens the armed exit sells - None once the position is gone, 0 until the fill is known"""
+        if self.positions.get(mint) is not position or position.status not in ('active', 'closing'):
+            return None
+        if position.fill_pending:
+            return 0
+        return position.remaining_tokens
+
+    async def _pending_fill_balance(self, mint: str) -> float:
+        """Wallet balance for an unsettled buy - a fresh streamed value (0 included) or one indexed ATA read, no retries"""
+        streamed = self.balance_stream.token_balance(mint) if BALANCE_STREAM_ENABLED else None
+        if streamed is not None:
+            return streamed
         try:
-            position = self.positions.get(mint)
-            if not position:
-                return
+            balances = await asyncio.to_thread(self.wallet.get_token_balances, [mint])
+            return balances.get(mint, 0.0)
+        except Exception as e:
+            logger.debug(f"Pending-fill balance read failed for {mint[:8]}...: {e}")
+            return 0.0
 
-            logger.info(f"📈 Starting WHALE monitoring for {mint[:8]}...")
-            logger.info(f"   Entry Price: {position.entry_token_price_sol:.10f} lamports/atomic")
-            logger.info(f"   Max Hold: {MAX_POSITION_AGE_SECONDS}s")
-            logger.info(f"   Exit: ORDER FLOW (sell burst / buyer death / velocity death)")
-            logger.info(f"   Your Tokens: {position.remaining_tokens:,.0f}")
+    def _cancel_pending_position(self, mint: str, reason: str):
+        """Drop a pending position whose buy never landed"""
+        position = self.positions.get(mint)
+        if not position or not position.fill_pending:
+            return
+        position.status = 'cancelled'
+        self._settle_pending_position(position)
+        del self.positions[mint]
 
-            check_count = 0
-            consecutive_data_failures = 0
+        if self.scanner and mint in self.scanner.watched_tokens:
+            self.scanner.watched_tokens[mint]['has_active_position'] = False
 
-            while mint in self.positions and position.status == 'active':
-                check_count += 1
+        logger.warning(f"🚫 Pending position {mint[:8]} cancelled: {reason}")
 
-                # ===================================================================
-                # FIX 6: STALE DATA DETECTION - Exit if WebSocket stopped updating
-                # ===================================================================
-                if self.shutdown_requested or not self.running:
-                    logger.warning(f"⚠️ Bot stopped while monitoring {mint[:8]} - emergency exit")
-                    await self._close_position_full(mint, reason="bot_stopped")
-                    break
+    def _start_supervision(self, position: Position):
+        """Arm the position's timers in the shared supervisor (exit checks run on trade events)"""
+        from config import POSITION_STALE_DATA_SECONDS, POSITION_REPORT_SECONDS
 
-                # Check for stale WebSocket data (no updates for 20s = data frozen)
-                if self.scanner:
-                    helius_state = self.scanner.watched_tokens.get(mint, {})
-                    last_update = helius_state.get('last_update', 0)
-                    if last_update > 0 and time.time() - last_update > 20:
-                        logger.error(f"🚨 STALE DATA: No WebSocket updates for {time.time() - last_update:.0f}s")
-                        logger.error(f"   Data is frozen - emergency exit to prevent holding through crash")
-                        await self._close_position_full(mint, reason="stale_data")
-                        break
+        mint = position.mint
+        logger.info(f"📈 Starting WHALE monitoring for {mint[:8]}...")
+        logger.info(f"   Entry Price: {position.entry_token_price_sol:.10f} lamports/atomic")
+        logger.info(f"   Max Hold: {MAX_POSITION_AGE_SECONDS}s")
+        logger.info(f"   Exit: ORDER FLOW (sell burst / buyer death / velocity death)")
+        logger.info(f"   Your Tokens: {position.remaining_tokens:,.0f}{' (estimated - fill pending)' if position.fill_pending else ''}")
 
-                # Calculate P&L for display (exit checks handled by instant callbacks)
-                if self.scanner:
-                    helius_state = self.scanner.watched_tokens.get(mint, {})
-                    current_curve = helius_state.get('vSolInBondingCurve', 0)
-                    entry_curve = getattr(position, 'entry_sol_in_curve', 0) or getattr(position, 'detection_curve_sol', 0) or 6.0
-
-                    # Calculate P&L from ACTUAL fill price (not curve estimate)
-                    VIRTUAL_RESERVES = 30.0
-                    if current_curve > 0:
-                        virtual_sol_lamports = (current_curve + VIRTUAL_RESERVES) * 1e9
-                        INITIAL_K = 30e9 * 1073000191e6  # PumpFun launch reserves product
-                        virtual_tokens_atomic = INITIAL_K / virtual_sol_lamports
-                        current_price = virtual_sol_lamports / virtual_tokens_atomic
-
-                        entry_price = getattr(position, 'entry_token_price_sol', 0)
-                        if entry_price > 0:
-                            pnl_percent = ((current_price / entry_price) - 1) * 100
-                        else:
-                            pnl_percent = 0.0
-                    else:
-                        pnl_percent = 0.0
-
-                    # Update position for display
-                    position.pnl_percent = pnl_percent
-                    if pnl_percent > position.max_pnl_reached:
-                        position.max_pnl_reached = pnl_percent
-                        if not hasattr(position, 'peak_time'):
-                            position.peak_time = time.time()
-                else:
-                    pnl_percent = position.pnl_percent  # Fallback if scanner died
-
-                # ===================================================================
-                # EARLY RUG CHECK: Simple floor check (no RPC)
-                # Full exit logic handled by _check_curve_exits below
-                # ===================================================================
-                if self.scanner and not position.is_closing:
-                    state = self.scanner.watched_tokens.get(mint, {})
-                    current_curve = state.get('vSolInBondingCurve', 0)
-
-                    # Instant rug floor check - no RPC needed
-                    from config import RUG_FLOOR_SOL
-                    if current_curve > 0 and current_curve < RUG_FLOOR_SOL:
-                        # SANITY CHECK: Don't rug floor if active buying
-                        # Batch processing can show low curve before buys in same batch update it
-                        flow_buys = state.get('flow_buys', [])
-                        now_ts = time.time()
-                        recent_buy_volume = sum(amt for t, amt in flow_buys if now_ts - t < 3)
-
-                        if recent_buy_volume >= 2.0:
-                            logger.info(f"⚡ Early rug ({current_curve:.2f}) BUT {recent_buy_volume:.1f} SOL bought in 3s - HOLDING")
-                        else:
-                            logger.warning(f"🚨 EARLY RUG: Curve {current_curve:.2f} < {RUG_FLOOR_SOL} floor")
-                            await self._close_position_full(mint, reason="early_rug_floor")
-                            break
+        now = time.time()
+        self.supervisor.add(mint, {
+            'max_age': position.entry_time + MAX_POSITION_AGE_SECONDS,
+            'stale': now + POSITION_STALE_DATA_SECONDS,
+            'report': now + POSITION_REPORT_SECONDS,
+        })
+
+    def _effective_max_age(self, mint: str) -> float:
+        """Max hold - extended to 180s for runners (high bonding progress)"""
+        curve = self.curves.get(mint)
+        if curve and curve.get('sol_raised', 0) > 0:
+            bonding_pct = (curve['sol_raised'] / 85) * 100
+            if bonding_pct >= 12:  # >12% bonding = strong momentum
+                return 180
+        helius_state = self.scanner.watched_tokens.get(mint, {}) if self.scanner else {}
+        if helius_state.get('vSolInBondingCurve', 0) > 12:  # High bonding = runner
+            return 180
+        return MAX_POSITION_AGE_SECONDS
+
+    def _spawn_close(self, mint: str, reason: str):
+        asyncio.create_task(self._close_position_full(mint, reason=reason))
+
+    def _supervised_exit(self, mint: str, position: Position, reason: str) -> float:
+        """
+        Spawn the close and re-arm the timer that fired - a close can return with the position
+        still active (fill deferral, another close waiting on the fill), so it retries until it isn't
+        """
+        from config import POSITION_EXIT_RETRY_SECONDS
 
-                # Early exit if position fully sold
-                if position.remaining_tokens <= 0 and not position.pending_sells:
-                    logger.info(f"✅ {mint[:8]}... fully sold (remaining=0, no pending), exiting monitor")
-                    position.status = 'completed'
-                    break
+        position.supervised_exit = position.supervised_exit or reason
+        self._spawn_close(mint, position.supervised_exit)
+        return time.time() + POSITION_EXIT_RETRY_SECONDS
 
-                current_time = time.time()
-                age = current_time - position.entry_time
-                
-                # Dynamic max age - extend for high bonding progress
-                effective_max_age = MAX_POSITION_AGE_SECONDS  # Default 120s
-
-                # Extend to 180s if high bonding progress
-                if hasattr(self, 'curve_reader'):
-                    try:
-                        curve = self.curve_reader.get_curve_state(mint, use_cache=True)
-                        if curve and curve.get('sol_raised', 0) > 0:
-                            bonding_pct = (curve['sol_raised'] / 85) * 100
-                            if bonding_pct >= 12:  # >12% bonding = strong momentum
-                                effective_max_age = 180
-                                logger.debug(f"High bonding ({bonding_pct:.1f}%): extended max age to 180s")
-                    except:
-                        pass
-
-                if age > effective_max_age:
-                    logger.warning(f"⏰ MAX AGE REACHED for {mint[:8]}... ({age:.0f}s, limit was {effective_max_age}s)")
-                    position.is_closing = False  # Ensure close can execute
-                    await self._close_position_full(mint, reason="max_age")
-                    break
+    def _supervise_position(self, mint: str, kind: str) -> Optional[float]:
+        """Supervisor timer for one position fired - returns the next deadline for this timer, or None"""
+        from config import POSITION_STALE_DATA_SECONDS, POSITION_REPORT_SECONDS, RUG_FLOOR_SOL
 
-                try:
-                    # Exit checks now handled by instant callbacks (_on_position_sell, _on_position_buy)
-                    # This loop only handles max_age timer
-                    helius_state = self.scanner.watched_tokens.get(mint, {}) if self.scanner else {}
-                    current_curve_sol = helius_state.get('vSolInBondingCurve', 0)
-
-                    # ===================================================================
-                    # MAX AGE EXIT (keep this - timer based)
-                    # ===================================================================
-                    effective_max_age = MAX_POSITION_AGE_SECONDS
-                    if current_curve_sol > 12:  # High bonding = runner
-                        effective_max_age = 180
-
-                    if age > effective_max_age:
-                        logger.warning(f"⏰ MAX AGE: {age:.0f}s > {effective_max_age}s")
-                        await self._close_position_full(mint, reason="max_age")
-                        break
+        position = self.positions.get(mint)
+        if not position or position.status != 'active':
+            self.supervisor.remove(mint)
+            return None
 
-                    # ===================================================================
-                    # MIGRATION CHECK (keep this)
-                    # ===================================================================
-                    if current_curve_sol >= 85:
-                        logger.warning(f"🚀 MIGRATION: Curve at {current_curve_sol:.0f} SOL")
-                        await self._close_position_full(mint, reason="migration")
-                        break
+        now = time.time()
+
+        if self.shutdown_requested or not self.running:
+            if position.supervised_exit is None:
+                logger.warning(f"⚠️ Bot stopped while monitoring {mint[:8]} - emergency exit")
+            return self._supervised_exit(mint, position, "bot_stopped")
+
+        helius_state = self.scanner.watched_tokens.get(mint, {}) if self.scanner else {}
+
+        if kind == 'exit':
+            # Retry timer for an exit requested from the report tick
+            return self._supervised_exit(mint, position, position.supervised_exit or "supervised_exit")
+
+        if kind == 'max_age':
+            effective_max_age = self._effective_max_age(mint)
+            deadline = position.entry_time + effective_max_age
+            if now < deadline:
+                logger.debug(f"High bonding: extended max age for {mint[:8]}... to {effective_max_age}s")
+                return deadline
+            if position.supervised_exit is None:
+                logger.warning(f"⏰ MAX AGE REACHED for {mint[:8]}... ({now - position.entry_time:.0f}s, limit was {effective_max_age}s)")
+                position.is_closing = False  # Ensure close can execute
+            return self._supervised_exit(mint, position, "max_age")
+
+        if kind == 'stale':
+            if position.supervised_exit == 'stale_data':
+                return self._supervised_exit(mint, position, "stale_data")
+            # Stale WebSocket data (no updates for the window = data frozen)
+            last_update = helius_state.get('last_update', 0)
+            if last_update <= 0:
+                return now + POSITION_STALE_DATA_SECONDS
+            if now - last_update > POSITION_STALE_DATA_SECONDS:
+                logger.error(f"🚨 STALE DATA: No WebSocket updates for {now - last_update:.0f}s")
+                logger.error("   Data is frozen - emergency exit to prevent holding through crash")
+                return self._supervised_exit(mint, position, "stale_data")
+            return last_update + POSITION_STALE_DATA_SECONDS + 0.01
+
+        if kind == 'report':
+            # Fully sold (partial sells) - nothing left to supervise
+            if position.remaining_tokens <= 0 and not position.pending_sells:
+                logger.info(f"✅ {mint[:8]}... fully sold (remaining=0, no pending), exiting monitor")
+                position.status = 'completed'
+                del self.positions[mint]
+                self.supervisor.remove(mint)
+                logger.info(f"Position {mint[:8]}... removed after completion")
+                return None
 
-                    # ===================================================================
-                    # PROGRESS LOGGING
-                    # ===================================================================
-                    if check_count % 3 == 1:
-                        entry_curve = getattr(position, 'entry_sol_in_curve', 0) or getattr(position, 'detection_curve_sol', 0) or 6.0
-                        curve_delta = current_curve_sol - entry_curve
+            # Sell events skip P&L (trigger compares only) - refresh it for the report
+            self._update_position_pnl(mint, position)
 
-                        state = helius_state
-                        sells_5s = len([t for t in state.get('sell_timestamps', []) if time.time() - t < 5])
-                        buys_5s = len([t for t in state.get('buy_timestamps', []) if time.time() - t < 5])
+            snapshot = self.curves.get(mint)
+            current_curve_sol = snapshot['sol_in_curve'] if snapshot else helius_state.get('vSolInBondingCurve', 0)
+            entry_curve = getattr(position, 'entry_sol_in_curve', 0) or getattr(position, 'detection_curve_sol', 0) or 6.0
+            curve_delta = current_curve_sol - entry_curve
+            sells_5s = len([t for t in helius_state.get('sell_timestamps', []) if now - t < 5])
+            buys_5s = len([t for t in helius_state.get('buy_timestamps', []) if now - t < 5])
 
-                        logger.info(
-                            f"📊 {mint[:8]}... | P&L: {pnl_percent:+.1f}% | "
-                            f"Curve: {current_curve_sol:.2f} ({curve_delta:+.1f}) | "
-                            f"Flow: +{buys_5s}/-{sells_5s} | Age: {age:.0f}s"
-                        )
+            logger.info(
+                f"📊 {mint[:8]}... | P&L: {position.pnl_percent:+.1f}% | "
+                f"Curve: {current_curve_sol:.2f} ({curve_delta:+.1f}) | "
+                f"Flow: +{buys_5s}/-{sells_5s} | Age: {now - position.entry_time:.0f}s"
+            )
 
-                except Exception as e:
-                    logger.error(f"Error checking {mint[:8]}...: {e}")
-                    import traceback
-                    logger.error(traceback.format_exc())
-                
-                await asyncio.sleep(MONITOR_CHECK_INTERVAL)
-            
-            if mint in self.positions and position.status == 'completed':
-                del self.positions[mint]
-                logger.info(f"Position {mint[:8]}... removed after completion")
-                
-        except Exception as e:
-            logger.error(f"Monitor error for {mint[:8]}...: {e}")
-            if mint in self.positions:
-                await self._close_position_full(mint, reason="monitor_error")
+            # Early rug floor - a sell-event check that held on buy flow is not re-run until the next sell
+            if 0 < current_curve_sol < RUG_FLOOR_SOL and not position.is_closing and position.supervised_exit is None:
+                flow_buys = helius_state.get('flow_buys', [])
+                recent_buy_volume = sum(amt for t, amt in flow_buys if now - t < 3)
+                if recent_buy_volume >= 2.0:
+                    logger.info(f"⚡ Early rug ({current_curve_sol:.2f}) BUT {recent_buy_volume:.1f} SOL bought in 3s - HOLDING")
+                else:
+                    logger.warning(f"🚨 EARLY RUG: Curve {current_curve_sol:.2f} < {RUG_FLOOR_SOL} floor")
+                    self.supervisor.schedule(mint, 'exit', self._supervised_exit(mint, position, "early_rug_floor"))
+
+            return now + POSITION_REPORT_SECONDS
+
+        return None
+
+    def _update_position_pnl(self, mint: str, position: Position) -> float:
+        """P&L from the latest curve state (called on trade events for the position)"""
+        helius_state = self.scanner.watched_tokens.get(mint, {}) if self.scanner else {}
+        snapshot = self.curves.get(mint)
+        current_curve = snapshot['sol_in_curve'] if snapshot else helius_state.get('vSolInBondingCurve', 0)
+
+        # Calculate P&L from ACTUAL fill price (not curve estimate)
+        pnl_percent = 0.0
+        entry_price = getattr(position, 'entry_token_price_sol', 0)
+        if current_curve > 0 and entry_price > 0:
+            virtual_sol_lamports, virtual_tokens_atomic = self.curves.reserves(mint, current_curve)
+            current_price = virtual_sol_lamports / virtual_tokens_atomic
+            pnl_percent = ((current_price / entry_price) - 1) * 100
+
+        position.pnl_percent = pnl_percent
+        if pnl_percent > position.max_pnl_reached:
+            position.max_pnl_reached = pnl_percent
+            if not hasattr(position, 'peak_time'):
+                position.peak_time = time.time()
+        return pnl_percent
     
     async def _execute_partial_sell(self, mint: str, sell_percent: float, target_name: str, current_pnl: float) -> bool:
         """Execute partial sell with priority fees (LEGACY - kept for compatibility)"""
@@ -1701,6 +2030,7 @@ class SniperBot:
             if signature and not signature.startswith("1111111"):
                 # Update remaining_tokens IMMEDIATELY to prevent race condition
                 position.remaining_tokens -= ui_tokens_to_sell
+                self.exit_armer.refresh(mint)
                 logger.info(f"📊 Updated remaining_tokens: {position.remaining_tokens:,.0f} (sold {ui_tokens_to_sell:,.0f})")
 
                 # ✅ FIX: Store pending signature for P&L recovery on early close
@@ -1741,44 +2071,29 @@ class SniperBot:
             logger.info(f"⏳ Confirming {target_name} sell for {mint[:8]}...")
             logger.info(f"🔗 Solscan: https://solscan.io/tx/{signature}")
             
-            first_seen = None
             start = time.time()
-            confirmed = False
-            
-            while time.time() - start < 25:
-                try:
-                    status = self.trader.client.get_signature_statuses([signature])
-                    if status and status.value and status.value[0]:
-                        if first_seen is None:
-                            first_seen = time.time() - start
-                        
-                        confirmation_status = status.value[0].confirmation_status
-                        if confirmation_status in ["confirmed", "finalized"]:
-                            if status.value[0].err:
-                                logger.error(f"❌ {target_name} sell FAILED: {status.value[0].err}")
-                                break
-                            else:
-                                confirmed = True
-                                break
-                except Exception as e:
-                    logger.debug(f"Status check error: {e}")
-                
-                await asyncio.sleep(1)
-            
-            if not confirmed:
+            confirmation = await self.confirmations.wait(signature, "confirmed", timeout=25)
+            confirmed = confirmation['status'] == 'confirmed'
+
+            if confirmation['status'] == 'failed':
+                logger.error(f"❌ {target_name} sell FAILED: {confirmation['err']}")
+            elif not confirmed:
                 elapsed = time.time() - start
-                if first_seen is None:
-                    logger.warning(f"⏱️ Timeout: TX never appeared in RPC after {elapsed:.1f}s")
-                else:
-                    logger.warning(f"⏱️ Timeout: TX appeared at {first_seen:.1f}s but didn't confirm")
+                logger.warning(f"⏱️ Timeout: TX didn't confirm after {elapsed:.1f}s")
             
             if confirmed:
-                txd = await self._get_transaction_deltas(signature, mint)
-                if txd["confirmed"]:
-                    actual_sol_received = txd["sol_delta"] if txd["sol_delta"] > 0 else None
-                    actual_tokens_sold = abs(txd["token_delta"]) if txd["token_delta"] < 0 else None
+                fill = await self.fills.wait(signature, timeout=FILL_EVENT_GRACE)
+                if fill:
+                    actual_sol_received = fill['sol_delta'] if fill['sol_delta'] > 0 else None
+                    actual_tokens_sold = fill['tokens'] or None
+                    asyncio.create_task(self._reconcile_fill_fees(signature, mint))
                 else:
-                    actual_sol_received, actual_tokens_sold = None, None
+                    txd = await self._get_transaction_deltas(signature, mint)
+                    if txd["confirmed"]:
+                        actual_sol_received = txd["sol_delta"] if txd["sol_delta"] > 0 else None
+                        actual_tokens_sold = abs(txd["token_delta"]) if txd["token_delta"] < 0 else None
+                    else:
+                        actual_sol_received, actual_tokens_sold = None, None
 
                 if actual_sol_received is None:
                     logger.warning(f"Using wallet balance fallback for SOL")
@@ -1867,16 +2182,14 @@ class SniperBot:
 
                 tx_exists = False
                 try:
-                    from solders.signature import Signature as SoldersSignature
                     from solders.transaction_status import TransactionConfirmationStatus
-                    sig_obj = SoldersSignature.from_string(signature)
 
                     # Check signature status - this tells us if TX is known to the network
-                    status_check = self.trader.client.get_signature_statuses([sig_obj])
+                    # (joins the shared batched getSignatureStatuses tick)
+                    status_info = await self.sig_poller.lookup(signature)
 
-                    if status_check and status_check.value and status_check.value[0] is not None:
+                    if status_info is not None:
                         tx_exists = True
-                        status_info = status_check.value[0]
                         logger.info(f"✅ TX exists on chain (status: {status_info.confirmation_status})")
 
                         # TX is in the system - it WILL resolve, don't retry
@@ -2010,6 +2323,22 @@ class SniperBot:
             
             position.is_closing = True
 
+            if position.fill_pending:
+                logger.info(f"⏳ {reason} exit for {mint[:8]} waiting for buy fill...")
+                try:
+                    await asyncio.wait_for(position.fill_ready.wait(), timeout=PENDING_FILL_EXIT_WAIT)
+                except asyncio.TimeoutError:
+                    pass
+                if position.status != 'active' or mint not in self.positions:
+                    return  # Buy never landed - nothing to sell
+                if position.fill_pending:
+                    balance = await self._pending_fill_balance(mint)
+                    if balance <= 0:
+                        logger.warning(f"⚠️ No tokens for {mint[:8]} yet - exit deferred to the next trigger")
+                        position.is_closing = False
+                        return
+                    position.remaining_tokens = balance
+
             # ✅ Clear pending sells to stop background retry tasks from continuing
             position.pending_sells.clear()
             position.pending_token_amounts.clear()
@@ -2127,16 +2456,27 @@ class SniperBot:
             position.exit_curve_decision = helius_state.get('vSolInBondingCurve', 0)
             position.sell_start_time = time.time()
 
-            # Use Helius real-time curve data for sell (chain RPC is 2-13s stale)
+            # Use real-time curve data for sell (chain RPC is 2-13s stale)
             helius_curve_sol = helius_state.get('vSolInBondingCurve', 0)
+            snapshot = self.curves.get(mint)
 
-            if helius_curve_sol > 0:
-                # Build curve_data from Helius (real-time, not stale RPC)
-                virtual_sol = 30 + helius_curve_sol
-                virtual_sol_lamports = int(virtual_sol * 1e9)
-                # Constant product: k = 30 * 1_073_000_191 * 1e6
-                INITIAL_K = 30 * 1_073_000_191 * 1e15
-                virtual_tokens_atomic = int(INITIAL_K / virtual_sol_lamports)
+            if snapshot and snapshot['is_valid']:
+                # Exact reserves from the curve store (last TradeEvent / account notification)
+                curve_data = {
+                    'virtual_sol_reserves': snapshot['virtual_sol_reserves'],
+                    'virtual_token_reserves': snapshot['virtual_token_reserves'],
+                    'sol_in_curve': snapshot['sol_in_curve'],
+                    'is_valid': True,
+                    'is_migrated': snapshot['is_migrated'],
+                    'source': snapshot['source']
+                }
+                logger.info(
+                    f"⚡ Sell using curve store: {snapshot['sol_in_curve']:.2f} SOL "
+                    f"({snapshot['source']}, {snapshot['age']:.1f}s old)"
+                )
+            elif helius_curve_sol > 0:
+                # Build curve_data from Helius (real-time, not stale RPC) - reserves estimated
+                virtual_sol_lamports, virtual_tokens_atomic = estimate_reserves(helius_curve_sol)
 
                 curve_data = {
                     'virtual_sol_reserves': virtual_sol_lamports,
@@ -2164,7 +2504,7 @@ class SniperBot:
             pre_close_balance = self.wallet.get_sol_balance()
 
             # ===== TRY LOCAL SELL FIRST (faster - same as buys) =====
-            signature = None
+            local_call = None
 
             # Build curve_data for local builder from Helius state
             if curve_data and curve_data.get('is_valid'):
@@ -2176,43 +2516,53 @@ class SniperBot:
                 # Build from helius_curve_sol if available
                 local_curve_data = None
                 if helius_curve_sol > 0:
-                    virtual_sol = 30 + helius_curve_sol
-                    virtual_sol_lamports = int(virtual_sol * 1e9)
-                    INITIAL_K = 30 * 1_073_000_191 * 1e15
-                    virtual_tokens_atomic = int(INITIAL_K / virtual_sol_lamports)
+                    virtual_sol_lamports, virtual_tokens_atomic = estimate_reserves(helius_curve_sol)
                     local_curve_data = {
                         'virtual_sol_reserves': virtual_sol_lamports,
                         'virtual_token_reserves': virtual_tokens_atomic,
                     }
 
             # Try local sell (Jito first, same as buys)
-            if local_curve_data:
-                try:
-                    # Use 95% slippage for all exits
-                    sell_slippage = 9500
-
-                    signature = await self.local_builder.create_sell_transaction(
+            # A pre-armed exit for exactly this amount goes out as-is - no build on the hot path
+            armed_ready = self.exit_armer.ready(mint, ui_token_balance)
+            if local_curve_data or armed_ready:
+                # Use 95% slippage for all exits
+                sell_slippage = 9500
+                decided_at = position.exit_decision_time
+
+                async def _local_sell(guard):
+                    if armed_ready:
+                        sig = await self.exit_armer.fire(mint, decided_at=decided_at, guard=guard)
+                        if sig or not local_curve_data:
+                            return sig
+                        logger.warning("⚠️ Armed exit not accepted - building a fresh sell TX")
+                    return await self.local_builder.create_sell_transaction(
                         mint=mint,
                         token_amount_ui=ui_token_balance,
                         curve_data=local_curve_data,
                         slippage_bps=sell_slippage,
                         token_decimals=6,
-                        creator=position.creator
+                        creator=position.creator,
+                        urgency=urgency,
+                        guard=guard,
+                        on_wire=lambda: self.exit_armer.record_wire('built', decided_at)
                     )
-                except Exception as e:
-                    logger.warning(f"⚠️ Local sell failed: {e}")
-                    signature = None
 
-            # ===== FALLBACK TO PUMPPORTAL IF LOCAL FAILED =====
-            if not signature:
-                logger.warning(f"⚠️ Local sell failed, falling back to PumpPortal...")
-                signature = await self.trader.create_sell_transaction(
+                local_call = _local_sell
+
+            # ===== PUMPPORTAL: FALLBACK IF LOCAL FAILED, OR HEDGE IF LOCAL IS SLOW =====
+            signature = await self.hedger.execute(
+                f"sell:{mint[:8]}",
+                local_call,
+                lambda guard: self.trader.create_sell_transaction(
                     mint=mint,
                     token_amount=ui_token_balance,
                     slippage=95,
                     token_decimals=token_decimals,
-                    urgency=urgency
+                    urgency=urgency,
+                    guard=guard
                 )
+            )
 
             if not signature or signature.startswith("1111111"):
                 logger.error(f"❌ Close transaction failed")
@@ -2255,6 +2605,47 @@ class SniperBot:
                 self.positions[mint].status = 'error'
                 del self.positions[mint]
     
+    async def _resubmit_exit(self, mint: str, ui_token_balance: float, params: dict) -> Optional[str]:
+        """
+        One exit ladder rung - local sell with the rung's fee / slippage and a fresh blockhash,
+        PumpPortal if local can't, under the rung's own TradeGuard (one sender per rung)
+        """
+        # Streamed balance only (no RPC) - a partial fill leaves less than the tracker says
+        streamed = self.balance_stream.token_balance(mint) if BALANCE_STREAM_ENABLED else None
+        amount = streamed if streamed and streamed < ui_token_balance else ui_token_balance
+
+        local_call = None
+        position = self.positions.get(mint)
+        creator = getattr(position, 'creator', None) if position else None
+        if creator:
+            snapshot = self.curves.get(mint)
+            curve_data = snapshot if snapshot and snapshot['is_valid'] else None
+            local_call = lambda guard: self.local_builder.create_sell_transaction(
+                mint=mint,
+                token_amount_ui=amount,
+                curve_data=curve_data,
+                slippage_bps=params['slippage_bps'],
+                token_decimals=6,
+                creator=creator,
+                urgency="emergency",
+                guard=guard,
+                fee_multiplier=params['fee_multiplier'],
+                fresh_blockhash=params['fresh_blockhash']
+            )
+
+        return await self.hedger.execute(
+            f"sell:{mint[:8]}:rung{params['rung']}",
+            local_call,
+            lambda guard: self.trader.create_sell_transaction(
+                mint=mint,
+                token_amount=amount,
+                slippage=min(99, params['slippage_bps'] // 100),
+                token_decimals=6,
+                urgency="emergency",
+                guard=guard
+            )
+        )
+
     async def _finalize_close_background(
         self,
         mint: str,
@@ -2274,34 +2665,23 @@ class SniperBot:
                 logger.warning(f"Position {mint[:8]} already removed during background finalization")
                 return
 
+            # Exits are resubmitted (escalating each rung) once they fail or can no longer land
+            ladder = await self.exit_ladder.run(
+                f"sell:{mint[:8]}",
+                signature,
+                lambda params: self._resubmit_exit(mint, ui_token_balance, params),
+                invalidate=self.exit_armer.invalidate
+            )
+            if ladder['signature'] != signature:
+                logger.info(f"🪜 Exit landed via rung {len(ladder['rungs']) - 1}: {ladder['signature'][:16]}...")
+                signature = ladder['signature']
+
             # ✅ ROBUST: Parse transaction directly (NO wallet balance delta!)
             logger.info(f"⏳ Parsing transaction proceeds from blockchain...")
             logger.info(f"🔗 Solscan: https://solscan.io/tx/{signature}")
 
             tx_result = await self._get_transaction_proceeds_robust(signature, mint, max_wait=30)
 
-            # FIX: Retry sell if TX failed (error 3005 = slippage exceeded)
-            if not tx_result["success"]:
-                logger.warning("⚠️ First sell failed, retrying...")
-                await asyncio.sleep(0.5)
-                retry_balance = self.wallet.get_token_balance(mint)
-
-                if retry_balance > 1:
-                    logger.info(f"🔄 {retry_balance:,.0f} tokens still in wallet, retry with 95% slippage")
-                    retry_sig = await self.trader.create_sell_transaction(
-                        mint=mint,
-                        token_amount=retry_balance,
-                        slippage=95,
-                        token_decimals=6,
-                        urgency="emergency"
-                    )
-                    if retry_sig:
-                        logger.info(f"🔄 Retry TX: {retry_sig[:16]}...")
-                        signature = retry_sig
-                        tx_result = await self._get_transaction_proceeds_robust(signature, mint, max_wait=30)
-                    else:
-                        logger.warning(f"⚠️ Retry sell failed")
-
             if tx_result["success"]:
                 # Got EXACT proceeds from transaction
                 final_sol_received = tx_result["sol_received"]
@@ -2509,13 +2889,32 @@ class SniperBot:
             # Start blockhash cache for faster TX builds (~200-300ms savings per TX)
             await self.local_builder.start_blockhash_cache()
 
+            # Open + warm Jito block engine sessions before the first send
+            await self.jito_pool.start()
+            await self.health.start()
+            await self.sig_poller.start()
+            await self.landing.start()
+            await self.fee_oracle.start()
+            await self.local_builder.lookup_tables.load()
+            if EXIT_NONCE_ENABLED:
+                await self.local_builder.nonces.load()
+            await self.confirmations.start()
+            if BALANCE_STREAM_ENABLED:
+                await self.balance_stream.start()
+            await self.curves.start()
+            await self.quoter.start()
+            await self.supervisor.start()
+
             from solana.rpc.api import Client
             rpc_client = Client(RPC_ENDPOINT.replace('wss://', 'https://').replace('ws://', 'http://'))
             self.scanner = HeliusLogsMonitor(
                 self.on_token_found,
                 rpc_client,
                 exit_callback=self._on_position_sell,
-                buy_callback=self._on_position_buy
+                buy_callback=self._on_position_buy,
+                fill_tracker=self.fills,
+                decimals_resolver=self.wallet.decimals,
+                curve_store=self.curves
             )
             self.scanner_task = asyncio.create_task(self.scanner.start())
             
@@ -2551,6 +2950,188 @@ class SniperBot:
                     
                     if self.total_realized_sol != 0:
                         logger.info(f"💰 Total realized: {self.total_realized_sol:+.4f} SOL")
+
+                    jito_stats = self.jito_pool.get_stats()
+                    if jito_stats['sends'] > 0:
+                        logger.info(
+                            f"🔥 Jito sessions: {jito_stats['reuse_rate_percent']:.0f}% reused "
+                            f"({jito_stats['reused']}/{jito_stats['sends']}), "
+                            f"avg handshake {jito_stats['avg_handshake_ms']:.0f}ms"
+                        )
+
+                    bundle_stats = self.local_builder.bundle_stats
+                    if bundle_stats['submitted'] or bundle_stats['rejected'] or bundle_stats['unacknowledged']:
+                        logger.info(
+                            f"📦 Bundles: {bundle_stats['submitted']} accepted, {bundle_stats['landed']} landed, "
+                            f"{bundle_stats['failed']} failed, {bundle_stats['timeout']} unknown, "
+                            f"{bundle_stats['rejected']} rejected, {bundle_stats['unacknowledged']} unacknowledged"
+                        )
+
+                    health_stats = self.health.get_stats()
+                    if health_stats:
+                        logger.info(f"🩺 ENDPOINT HEALTH:")
+                        for label, hs in sorted(health_stats.items(), key=lambda x: x[1]['score']):
+                            logger.info(
+                                f"  • {label}: {hs['ewma_latency_ms']:.0f}ms ewma, "
+                                f"{hs['success_rate_percent']:.0f}% ok, penalty {hs['penalty_ms']:.0f}ms, "
+                                f"circuit {hs['circuit']}"
+                            )
+
+                    fee_stats = self.fee_oracle.get_stats()
+                    if fee_stats['slots']:
+                        logger.info(
+                            f"💸 Priority fees ({fee_stats['slots']} slots): buy {fee_stats['buy']:,} / "
+                            f"sell {fee_stats['sell']:,} / emergency {fee_stats['emergency']:,} µL/CU"
+                        )
+
+                    cu_stats = self.local_builder.cu_profiler.get_stats()
+                    if cu_stats:
+                        logger.info(f"📐 CU PROFILE:")
+                        for shape, cs in cu_stats.items():
+                            line = f"  • {shape}: max {cs['max_consumed']:,} CU → limit {cs['limit']:,}"
+                            if cs['landed']:
+                                line += (
+                                    f" | fee/landed {cs['avg_fee_sol']:.6f} SOL "
+                                    f"(flat 200k: {cs['avg_fee_flat_limit_sol']:.6f})"
+                                )
+                            logger.info(line)
+
+                    hedge_stats = self.hedger.get_stats()
+                    if hedge_stats['hedged']:
+                        logger.info(
+                            f"🏁 Hedged trades: {hedge_stats['hedged']}/{hedge_stats['trades']} | "
+                            f"local wins {hedge_stats['local_wins']} / PumpPortal wins {hedge_stats['pumpportal_wins']} | "
+                            f"PumpPortal TXs discarded {hedge_stats['pumpportal_discarded']}"
+                        )
+
+                    poll_stats = self.sig_poller.get_stats()
+                    if poll_stats['rpc_calls']:
+                        logger.info(
+                            f"🔁 Status poller: {poll_stats['rpc_calls']} calls, avg batch {poll_stats['avg_batch']:.1f} sigs, "
+                            f"peak {poll_stats['max_outstanding']} outstanding, {poll_stats['outstanding']} now"
+                        )
+
+                    bal_stats = self.balance_stream.get_stats()
+                    if BALANCE_STREAM_ENABLED:
+                        sol_age = bal_stats['sol_age_s']
+                        logger.info(
+                            f"👛 Balance stream: {'connected' if bal_stats['connected'] else 'DISCONNECTED'}, "
+                            f"{bal_stats['watched_mints']} ATAs, SOL age {f'{sol_age:.0f}s' if sol_age is not None else 'n/a'}, "
+                            f"hit rate {bal_stats['hit_rate']:.0%}, {bal_stats['drift_corrections']} drift fixes"
+                        )
+
+                    # Held curves only - closed positions stop streaming
+                    self.curves.retain(self.positions)
+                    curve_stats = self.curves.get_stats()
+                    logger.info(
+                        f"📈 Curve store: {curve_stats['curves']} curves, {curve_stats['watched']} streamed "
+                        f"({'connected' if curve_stats['connected'] else 'DISCONNECTED'}), "
+                        f"{curve_stats['trade_updates']} TradeEvent / {curve_stats['account_updates']} account updates, "
+                        f"{curve_stats['chain_reads']} chain reads (avg batch {curve_stats['avg_batch']:.1f}), "
+                        f"{curve_stats['tracked']} near-entry, {curve_stats['evicted']} evicted, hit rate {curve_stats['hit_rate']:.0%}"
+                    )
+
+                    sup_stats = self.supervisor.get_stats()
+                    if sup_stats['wakeups']:
+                        logger.info(
+                            f"⏲️ Supervisor: {sup_stats['positions']} positions, {sup_stats['timers']} timers, "
+                            f"{sup_stats['wakeups_per_position_min']:.1f} wakeups and "
+                            f"{sup_stats['cpu_ms_per_position_min']:.2f}ms CPU per position-minute, "
+                            f"max lateness {sup_stats['max_lateness_ms']:.0f}ms"
+                        )
+
+                    ladder_stats = self.exit_ladder.get_stats()
+                    if ladder_stats['ladders']:
+                        outcomes = ', '.join(f"{k} {v}" for k, v in sorted(ladder_stats['outcomes'].items()))
+                        rung_wins = ', '.join(f"r{k}: {v}" for k, v in sorted(ladder_stats['rung_wins'].items()))
+                        logger.info(
+                            f"🪜 Exit ladder: {ladder_stats['succeeded']}/{ladder_stats['ladders']} landed "
+                            f"({ladder_stats['exhausted']} exhausted, {ladder_stats['resubmits']} resubmits), "
+                            f"rungs [{outcomes}], wins [{rung_wins}], avg detect {ladder_stats['avg_detect_ms']:.0f}ms"
+                        )
+
+                    rb_stats = self.local_builder.rebroadcaster.get_stats()
+                    if rb_stats['tracked']:
+                        resends = self.local_builder.submitter.resend_stats
+                        logger.info(
+                            f"📡 Rebroadcast: {rb_stats['active']} active, {rb_stats['landed']} landed / "
+                            f"{rb_stats['expired']} expired, {rb_stats['landed_after_rebroadcast']} landed only after resends, "
+                            f"avg {rb_stats['avg_rebroadcasts']:.1f} resends, time-to-land {rb_stats['avg_time_to_land_ms']:.0f}ms, "
+                            f"{resends['sends']} route sends ({resends['throttled']} paced, {resends['rate_limited']} 429s)"
+                        )
+
+                    arm_stats = self.exit_armer.get_stats()
+                    if arm_stats['fired'] or arm_stats['built_wire_p50_ms'] is not None:
+                        armed_p50 = arm_stats['armed_wire_p50_ms']
+                        built_p50 = arm_stats['built_wire_p50_ms']
+                        logger.info(
+                            f"🔫 Armed exits: {arm_stats['armed']}/{arm_stats['positions']} armed "
+                            f"({arm_stats['durable']} durable), "
+                            f"{arm_stats['sent']}/{arm_stats['fired']} fired exits sent, {arm_stats['signs']} signs, "
+                            f"misses {arm_stats['amount_misses']} amount / {arm_stats['stale_misses']} stale / "
+                            f"{arm_stats['unarmed_misses']} unarmed, decision-to-wire p50 "
+                            f"{f'{armed_p50:.1f}ms' if armed_p50 is not None else 'n/a'} armed vs "
+                            f"{f'{built_p50:.1f}ms' if built_p50 is not None else 'n/a'} built"
+                        )
+
+                    trig = self.exit_trigger_stats
+                    if trig['events']:
+                        logger.info(
+                            f"🎯 Exit triggers: {trig['full_checks']}/{trig['events']} sell events crossed a level "
+                            f"({trig['exits']} exits), {trig['arms']} arms/re-arms"
+                        )
+
+                    quote_stats = self.quoter.get_stats()
+                    if quote_stats['validated']:
+                        logger.info(
+                            f"🧮 Quoter: {quote_stats['exact']}/{quote_stats['validated']} fills exact "
+                            f"(max err {quote_stats['max_error_lamports']} lamports), "
+                            f"{quote_stats['fee_bps_mismatch']} fee bps mismatches, fees from {quote_stats['fee_source']}"
+                        )
+
+                    fill_stats = self.fills.get_stats()
+                    if fill_stats['waits']:
+                        logger.info(
+                            f"🧾 Own fills: {fill_stats['hits']}/{fill_stats['waits']} from TradeEvents "
+                            f"(avg {fill_stats['avg_wait_ms']:.0f}ms), {fill_stats['misses']} via getTransaction | "
+                            f"avg network fee {fill_stats['avg_network_fee_sol']:.6f} SOL"
+                        )
+
+                    conf_stats = self.confirmations.get_stats()
+                    if conf_stats['ws_resolved'] or conf_stats['poll_resolved'] or conf_stats['timeouts']:
+                        logger.info(
+                            f"📨 Confirmations: ws {conf_stats['ws_resolved']} "
+                            f"(avg {conf_stats['avg_ws_latency_ms']:.0f}ms) / poll {conf_stats['poll_resolved']} / "
+                            f"timeouts {conf_stats['timeouts']} | "
+                            f"{'connected' if conf_stats['connected'] else 'DISCONNECTED'}"
+                        )
+
+                    alt_stats = self.local_builder.lookup_tables.get_stats()
+                    if alt_stats['v0_built'] or alt_stats['legacy_built']:
+                        logger.info(
+                            f"📇 TX format: v0 {alt_stats['v0_built']} (avg {alt_stats['avg_v0_bytes']:.0f}B) / "
+                            f"legacy {alt_stats['legacy_built']} (avg {alt_stats['avg_legacy_bytes']:.0f}B)"
+                        )
+
+                    landing_stats = self.landing.get_stats()
+                    if landing_stats['buckets']:
+                        logger.info(f"🎯 LANDING ({landing_stats['pending']} pending):")
+                        for row in landing_stats['buckets']:
+                            logger.info(
+                                f"  • {row['route']}/{row['urgency']} tip {row['tip_sol']:.4f}: "
+                                f"{row['land_rate_percent']:.0f}% landed ({row['landed']}/{row['resolved']}), "
+                                f"{row['avg_slots_to_land']:.1f} slots"
+                            )
+
+                    route_stats = self.local_builder.submitter.get_stats()['routes']
+                    if route_stats:
+                        logger.info(f"🛰️ SUBMIT ROUTES:")
+                        for route, rs in sorted(route_stats.items(), key=lambda x: x[1]['avg_accept_ms']):
+                            logger.info(
+                                f"  • {route}: {rs['accept_rate_percent']:.0f}% accepted, "
+                                f"avg {rs['avg_accept_ms']:.0f}ms, first {rs['first_accepts']}, "
+                                f"landed-first {rs['landed_first']}"
+                            )
                     
                     last_stats_time = time.time()
                 
@@ -2619,6 +3200,22 @@ class SniperBot:
         
         if self.telegram:
             self.telegram.stop()
+
+        await self.local_builder.rebroadcaster.stop()
+        await self.local_builder.submitter.close()
+        await self.trader.close()
+        await self.confirmations.stop()
+        await self.balance_stream.stop()
+        await self.curves.stop()
+        await self.quoter.stop()
+        await self.supervisor.stop()
+        await self.sig_poller.stop()
+        await self.jito_pool.close()
+        await self.health.close()
+        await self.landing.stop()
+        await self.fee_oracle.stop()
+        self.local_builder.cu_profiler.close()
+        self.wallet.decimals.close()
         
         if self.total_trades > 0:
             win_rate = (self.profitable_trades / self.total_trades * 100)
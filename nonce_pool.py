@@ -0,0 +1,254 @@
+"""
+Durable Nonce Pool - Bot-owned nonce accounts for exits signed once per position
+A TX whose recent blockhash is a durable nonce (and whose first instruction advances it)
+stays valid until the nonce moves, instead of ~60s. Accounts are derived from the wallet
+with fixed seeds, so no extra keypairs are stored.
+"""
+
+import asyncio
+import logging
+import struct
+from typing import Dict, Optional, Tuple
+
+from solders.hash import Hash
+from solders.message import Message
+from solders.pubkey import Pubkey
+from solders.system_program import (
+    AdvanceNonceAccountParams,
+    advance_nonce_account,
+    create_nonce_account_with_seed,
+)
+from solders.transaction import Transaction
+from solana.rpc.types import TxOpts
+
+from config import SYSTEM_PROGRAM_ID
+
+logger = logging.getLogger(__name__)
+
+NONCE_ACCOUNT_SIZE = 80
+NONCE_SEED_PREFIX = "exit-nonce-"
+NONCE_STATE_INITIALIZED = 1
+MAX_ADVANCES_PER_TX = 8
+SPENT_REREAD_DELAY = 5.0  # Seconds after a fired exit before checking whether its nonce moved
+
+
+def parse_nonce_account(data: bytes) -> Optional[Tuple[Pubkey, Hash]]:
+    """Nonce account layout: version u32, state u32, authority (32), nonce (32), fee calculator u64"""
+    if len(data) < NONCE_ACCOUNT_SIZE:
+        return None
+    if struct.unpack_from('<I', data, 4)[0] != NONCE_STATE_INITIALIZED:
+        return None
+    return Pubkey.from_bytes(data[8:40]), Hash.from_bytes(data[40:72])
+
+
+class NoncePool:
+    """Leases durable nonce accounts to positions - one account per armed exit"""
+
+    def __init__(self, wallet_manager, rpc_client):
+        self.wallet = wallet_manager
+        self.client = rpc_client
+
+        # address -> {'seed', 'nonce' (None = unknown / spent), 'lease' (mint), 'dirty', 'spent' (last fired nonce)}
+        # dirty = a fired exit did not move the nonce - it may still land, so not reused until /nonce rotate
+        self.accounts: Dict[Pubkey, dict] = {}
+        self.loaded = False
+
+        self.stats = {
+            'leases': 0,
+            'lease_misses': 0,
+            'spent': 0,
+            'dirty': 0,
+            'advances': 0,
+        }
+
+    def _derive(self, index: int) -> Tuple[Pubkey, str]:
+        seed = f"{NONCE_SEED_PREFIX}{index}"
+        return Pubkey.create_with_seed(self.wallet.pubkey, seed, SYSTEM_PROGRAM_ID), seed
+
+    def _read(self, addresses: list) -> Dict[Pubkey, Optional[Hash]]:
+        resp = self.client.get_multiple_accounts(addresses)
+        nonces = {}
+        for address, account in zip(addresses, resp.value):
+            parsed = parse_nonce_account(bytes(account.data)) if account else None
+            if parsed and parsed[0] == self.wallet.pubkey:
+                nonces[address] = parsed[1]
+            else:
+                nonces[address] = None
+        return nonces
+
+    async def load(self) -> bool:
+        """Read the configured number of seed-derived accounts - only initialized ones are leased"""
+        from config import NONCE_POOL_SIZE
+
+        derived = [self._derive(i) for i in range(NONCE_POOL_SIZE)]
+        try:
+            nonces = await asyncio.to_thread(self._read, [address for address, _ in derived])
+        except Exception as e:
+            logger.warning(f"⚠️ Nonce pool load failed: {e}")
+            return False
+
+        for address, seed in derived:
+            nonce = nonces.get(address)
+            if nonce is None:
+                self.accounts.pop(address, None)
+                continue
+            record = self.accounts.get(address)
+            if record is None:
+                self.accounts[address] = {'seed': seed, 'nonce': nonce, 'lease': None, 'dirty': False, 'spent': None}
+            elif record['lease'] is None:
+                record['nonce'] = nonce
+                if record['dirty'] and nonce != record['spent']:
+                    record['dirty'] = False  # Advanced since - the parked exit can no longer land
+
+        self.loaded = bool(self.accounts)
+        if self.accounts:
+            logger.info(f"🔐 Nonce pool loaded: {len(self.accounts)}/{NONCE_POOL_SIZE} accounts")
+        else:
+            logger.info("🔐 No durable nonce accounts - exits re-sign every blockhash (/nonce setup to create)")
+        return self.loaded
+
+    # ===== LEASES =====
+
+    def acquire(self, mint: str) -> Optional[Tuple[Pubkey, Hash]]:
+        """Lease a clean nonce account to this position - None if the pool is empty or exhausted"""
+        for address, record in self.accounts.items():
+            if record['lease'] is None and record['nonce'] is not None and not record['dirty']:
+                record['lease'] = mint
+                self.stats['leases'] += 1
+                return address, record['nonce']
+        self.stats['lease_misses'] += 1
+        return None
+
+    def release(self, address: Pubkey, fired: bool):
+        """Return a lease - a fired exit's nonce is re-read before the account is reused"""
+        record = self.accounts.get(address)
+        if record is None:
+            return
+        if not fired:
+            record['lease'] = None
+            return
+        self.stats['spent'] += 1
+        used = record['spent'] = record['nonce']
+        record['nonce'] = None
+        try:
+            asyncio.get_running_loop().create_task(self._reread_spent(address, used))
+        except RuntimeError:
+            record['lease'] = None
+            record['dirty'] = True
+
+    async def _reread_spent(self, address: Pubkey, used: Hash):
+        record = self.accounts[address]
+        await asyncio.sleep(SPENT_REREAD_DELAY)
+        try:
+            nonce = (await asyncio.to_thread(self._read, [address])).get(address)
+        except Exception as e:
+            logger.warning(f"⚠️ Nonce re-read failed for {address}: {e}")
+            nonce = None
+        record['lease'] = None
+        if nonce is not None and nonce != used:
+            record['nonce'] = nonce
+            return
+        # Exit never advanced the nonce - the signed TX could still land later
+        record['nonce'] = nonce
+        record['dirty'] = True
+        self.stats['dirty'] += 1
+        logger.warning(f"⚠️ Nonce {str(address)[:8]}... not advanced by its exit - parked until /nonce rotate")
+
+    async def invalidate(self, address: Pubkey, mint: str) -> bool:
+        """
+        Make sure an exit fired for mint against this nonce can no longer land - advances the
+        nonce (confirmed) unless it has visibly moved on already. False = advance failed
+        """
+        record = self.accounts.get(address)
+        if record is None:
+            return True  # Account gone - nothing signed against it can land
+        if record['lease'] not in (None, mint) or (record['lease'] is None and not record['dirty'] and record['nonce'] is not None):
+            return True  # Re-read saw the nonce advance (and it may be leased again) - do not touch it
+        try:
+            sig = await asyncio.to_thread(self._send_and_confirm, [self.advance_instruction(address)])
+        except Exception as e:
+            logger.warning(f"⚠️ Nonce advance failed for {str(address)[:8]}...: {e}")
+            return False
+        self.stats['advances'] += 1
+        logger.info(f"🔐 Advanced nonce {str(address)[:8]}... to invalidate its exit: {sig}")
+        if record['dirty']:
+            # Parked by an earlier re-read - check again so the account returns to the pool
+            record['dirty'] = False
+            asyncio.get_running_loop().create_task(self._reread_spent(address, record['spent']))
+        return True
+
+    def advance_instruction(self, address: Pubkey):
+        return advance_nonce_account(AdvanceNonceAccountParams(
+            nonce_pubkey=address, authorized_pubkey=self.wallet.pubkey
+        ))
+
+    # ===== MAINTENANCE (operator-triggered, costs rent + fees) =====
+
+    def _send_and_confirm(self, instructions: list) -> str:
+        from solana.rpc.commitment import Confirmed
+
+        blockhash = self.client.get_latest_blockhash().value.blockhash
+        message = Message.new_with_blockhash(instructions, self.wallet.pubkey, blockhash)
+        tx = Transaction.new_unsigned(message)
+        tx.sign([self.wallet.keypair], blockhash)
+        sig = self.client.send_raw_transaction(bytes(tx), TxOpts(skip_preflight=False)).value
+        self.client.confirm_transaction(sig, commitment=Confirmed)
+        return str(sig)
+
+    async def setup(self) -> Dict:
+        """Create any of the NONCE_POOL_SIZE seed accounts that do not exist yet"""
+        from config import NONCE_POOL_SIZE
+
+        summary = {'created': 0, 'signatures': []}
+        await self.load()
+        rent = (await asyncio.to_thread(
+            self.client.get_minimum_balance_for_rent_exemption, NONCE_ACCOUNT_SIZE
+        )).value
+
+        for i in range(NONCE_POOL_SIZE):
+            address, seed = self._derive(i)
+            if address in self.accounts:
+                continue
+            create_ix, init_ix = create_nonce_account_with_seed(
+                self.wallet.pubkey, address, self.wallet.pubkey, seed, self.wallet.pubkey, rent
+            )
+            sig = await asyncio.to_thread(self._send_and_confirm, [create_ix, init_ix])
+            summary['created'] += 1
+            summary['signatures'].append(sig)
+            logger.info(f"🔐 Created nonce account {address}: {sig}")
+
+        await self.load()
+        summary['accounts'] = len(self.accounts)
+        summary['rent_sol'] = rent / 1e9
+        return summary
+
+    async def rotate(self) -> Dict:
+        """
+        Advance every unleased nonce - invalidates any exit ever signed against it
+        (clears dirty accounts for reuse)
+        """
+        summary = {'advanced': 0, 'signatures': []}
+        idle = [a for a, r in self.accounts.items() if r['lease'] is None]
+        for i in range(0, len(idle), MAX_ADVANCES_PER_TX):
+            chunk = idle[i:i + MAX_ADVANCES_PER_TX]
+            sig = await asyncio.to_thread(
+                self._send_and_confirm, [self.advance_instruction(a) for a in chunk]
+            )
+            summary['advanced'] += len(chunk)
+            summary['signatures'].append(sig)
+            logger.info(f"🔐 Advanced {len(chunk)} nonce accounts: {sig}")
+        self.stats['advances'] += summary['advanced']
+
+        await self.load()
+        summary['accounts'] = len(self.accounts)
+        return summary
+
+    def get_stats(self) -> dict:
+        records = self.accounts.values()
+        return {
+            'accounts': len(self.accounts),
+            'leased': sum(1 for r in records if r['lease'] is not None),
+            'free': sum(1 for r in records if r['lease'] is None and r['nonce'] is not None and not r['dirty']),
+            'dirty': sum(1 for r in records if r['dirty']),
+            **self.stats,
+        }
@@ -0,0 +1,138 @@
+"""
+Position Supervisor - One scheduler task for every open position
+Timers (max age, stale-data window, progress report) live in a single expiry heap; the task
+sleeps until the earliest deadline instead of each position polling on an interval.
+P&L is updated by the trade event callbacks, not here.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PositionSupervisor:
+    """
+    Expiry heap of (deadline, seq, mint, kind)
+    handler(mint, kind) runs synchronously when a timer fires and returns the next deadline
+    for that kind, or None to drop it. Handlers must not block - long work goes in a task
+    """
+
+    def __init__(self, handler: Callable[[str, str], Optional[float]]):
+        self.handler = handler
+
+        self._heap = []
+        self._seq = itertools.count()
+        self._timers: Dict[Tuple[str, str], int] = {}  # (mint, kind) -> live seq (older heap entries are dead)
+        self._added_at: Dict[str, float] = {}
+        self._wake = asyncio.Event()
+        self._task = None
+
+        self.stats = {
+            'wakeups': 0,
+            'fired': {},
+            'handler_errors': 0,
+            'cpu_seconds': 0.0,
+            'position_seconds': 0.0,  # Supervised time of positions already removed
+            'max_lateness_ms': 0.0,
+        }
+
+    # ===== TIMERS =====
+
+    def schedule(self, mint: str, kind: str, deadline: float):
+        """(Re)arm one timer - replaces any earlier deadline for the same (mint, kind)"""
+        seq = next(self._seq)
+        self._timers[(mint, kind)] = seq
+        heapq.heappush(self._heap, (deadline, seq, mint, kind))
+        if self._heap[0][1] == seq:
+            self._wake.set()  # New earliest deadline - re-arm the sleep
+
+    def cancel(self, mint: str, kind: str):
+        self._timers.pop((mint, kind), None)
+
+    def add(self, mint: str, timers: Dict[str, float]):
+        self._added_at.setdefault(mint, time.time())
+        for kind, deadline in timers.items():
+            self.schedule(mint, kind, deadline)
+
+    def remove(self, mint: str):
+        for key in [k for k in self._timers if k[0] == mint]:
+            del self._timers[key]
+        added_at = self._added_at.pop(mint, None)
+        if added_at is not None:
+            self.stats['position_seconds'] += time.time() - added_at
+
+    # ===== LOOP =====
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            # Drop dead heap entries (cancelled / re-armed timers)
+            while self._heap and self._timers.get((self._heap[0][2], self._heap[0][3])) != self._heap[0][1]:
+                heapq.heappop(self._heap)
+
+            self._wake.clear()
+            if not self._heap:
+                await self._wake.wait()
+                continue
+
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            deadline, seq, mint, kind = heapq.heappop(self._heap)
+            if self._timers.get((mint, kind)) != seq:
+                continue
+            del self._timers[(mint, kind)]
+
+            self.stats['wakeups'] += 1
+            self.stats['fired'][kind] = self.stats['fired'].get(kind, 0) + 1
+            lateness_ms = (time.time() - deadline) * 1000
+            self.stats['max_lateness_ms'] = max(self.stats['max_lateness_ms'], lateness_ms)
+
+            cpu_start = time.thread_time()
+            try:
+                next_deadline = self.handler(mint, kind)
+            except Exception as e:
+                self.stats['handler_errors'] += 1
+                logger.error(f"Supervisor {kind} handler error for {mint[:8]}...: {e}")
+                next_deadline = None
+            self.stats['cpu_seconds'] += time.thread_time() - cpu_start
+
+            if next_deadline is not None and mint in self._added_at:
+                self.schedule(mint, kind, next_deadline)
+
+    def get_stats(self) -> dict:
+        s = self.stats
+        now = time.time()
+        position_minutes = (s['position_seconds'] + sum(now - t for t in self._added_at.values())) / 60
+        return {
+            'positions': len(self._added_at),
+            'timers': len(self._timers),
+            'wakeups': s['wakeups'],
+            'fired': dict(s['fired']),
+            'handler_errors': s['handler_errors'],
+            'wakeups_per_position_min': (s['wakeups'] / position_minutes) if position_minutes else 0.0,
+            'cpu_ms_per_position_min': (s['cpu_seconds'] * 1000 / position_minutes) if position_minutes else 0.0,
+            'max_lateness_ms': s['max_lateness_ms'],
+        }
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
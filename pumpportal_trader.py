@@ -9,18 +9,49 @@ import base64
 import json
 import logging
 import random
+import time
 from typing import Optional
 from solana.rpc.types import TxOpts
 
+from endpoint_health import EndpointHealthRegistry
+from jito_sessions import JitoSessionPool
+
 logger = logging.getLogger(__name__)
 
 class PumpPortalTrader:
     """Use PumpPortal's API for transaction creation with dynamic fees"""
     
-    def __init__(self, wallet_manager, client):
+    def __init__(
+        self,
+        wallet_manager,
+        client,
+        jito_pool: JitoSessionPool = None,
+        health: EndpointHealthRegistry = None,
+        landing=None,
+        fee_oracle=None
+    ):
         self.wallet = wallet_manager
         self.client = client
+        self.landing = landing  # Optional LandingTracker - follows our sends to landed/dropped
+        self.fee_oracle = fee_oracle  # Optional PriorityFeeOracle - live fees instead of fixed table
+        self.rebroadcaster = None  # Optional Rebroadcaster - re-sends accepted TXs until landed/expired
+        self.health = health or EndpointHealthRegistry()
+        self.jito_pool = jito_pool or JitoSessionPool(health=self.health)
         self.api_url = "https://pumpportal.fun/api/trade-local"
+        self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Pooled session - keeps the TLS connection to PumpPortal warm between trades"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=8, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=10),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
 
     async def _send_via_jito(self, signed_tx_bytes: bytes) -> Optional[str]:
         """Send transaction via Jito block engine for priority inclusion"""
@@ -28,7 +59,11 @@ class PumpPortalTrader:
         import base64
 
         tx_base64 = base64.b64encode(signed_tx_bytes).decode('utf-8')
-        endpoint = random.choice(JITO_ENDPOINTS)
+        endpoint = self.health.pick(JITO_ENDPOINTS)
+        # PumpPortal is the fallback path - keep its long-standing 5s budget rather than the
+        # local builder's adaptive sub-second one
+        timeout = 5.0
+        start_time = time.time()
 
         payload = {
             "jsonrpc": "2.0",
@@ -38,33 +73,66 @@ class PumpPortalTrader:
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    endpoint,
-                    json=payload,
-                    headers={"Content-Type": "application/json"},
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as response:
-                    result = await response.json()
-
-                    if "result" in result:
-                        sig = result["result"]
-                        logger.info(f"🚀 Jito accepted: {sig[:16]}...")
-                        return sig
-                    elif "error" in result:
-                        logger.warning(f"⚠️ Jito rejected: {result['error'].get('message', result['error'])}")
-                        return None
-                    else:
-                        logger.warning(f"⚠️ Unexpected Jito response: {result}")
-                        return None
+            result = await self.jito_pool.post(endpoint, payload, timeout=timeout)
+            latency_ms = (time.time() - start_time) * 1000
+
+            if "result" in result:
+                sig = result["result"]
+                self.health.record(endpoint, latency_ms, success=True)
+                logger.info(f"🚀 Jito accepted: {sig[:16]}...")
+                return sig
+            elif "error" in result:
+                self.health.record(endpoint, latency_ms, success=False)
+                logger.warning(f"⚠️ Jito rejected: {result['error'].get('message', result['error'])}")
+                return None
+            else:
+                self.health.record(endpoint, latency_ms, success=False)
+                logger.warning(f"⚠️ Unexpected Jito response: {result}")
+                return None
 
         except asyncio.TimeoutError:
+            self.health.record(endpoint, timeout * 1000, success=False)
             logger.warning(f"⚠️ Jito timeout")
             return None
         except Exception as e:
+            self.health.record(endpoint, (time.time() - start_time) * 1000, success=False)
             logger.warning(f"⚠️ Jito error: {e}")
             return None
 
+    def _send_via_rpc(self, signed_tx_bytes: bytes, opts: Optional[TxOpts] = None) -> str:
+        """Serial send through the main RPC client - outcome feeds the shared health registry"""
+        from config import RPC_ENDPOINT
+
+        start_time = time.time()
+        try:
+            if opts is None:
+                response = self.client.send_raw_transaction(signed_tx_bytes)
+            else:
+                response = self.client.send_raw_transaction(signed_tx_bytes, opts)
+        except Exception:
+            self.health.record(RPC_ENDPOINT, (time.time() - start_time) * 1000, success=False)
+            raise
+        self.health.record(RPC_ENDPOINT, (time.time() - start_time) * 1000, success=True)
+        return str(response.value)
+
+    async def _acquire_guard(self, guard, mint: str) -> bool:
+        """Hedged mode: hold the signed TX until the local path finishes - send only if it gave up"""
+        from config import PUMPPORTAL_HEDGE_MAX_WAIT
+
+        if guard is None:
+            return True
+        if await guard.wait_turn("pumpportal", PUMPPORTAL_HEDGE_MAX_WAIT):
+            return True
+        logger.info(f"🛑 {mint[:8]}... already submitted by the local path - discarding PumpPortal TX")
+        return False
+
+    def _track_landing(self, sig: str, route: str, priority_fee: float, urgency: str, tx_bytes: bytes = None):
+        if self.landing:
+            self.landing.track(sig, route, 0, urgency, priority_fee_lamports=int(priority_fee * 1e9))
+        if self.rebroadcaster and tx_bytes:
+            # PumpPortal TXs carry no Jito tip - resends stay on RPC
+            self.rebroadcaster.add(sig, tx_bytes, label=route, jito=False)
+
     def _build_jito_tip_instruction(self, tip_lamports: int) -> bytes:
         """Build raw bytes for a Jito tip instruction to append to transaction"""
         from config import JITO_TIP_ACCOUNTS
@@ -103,6 +171,13 @@ class PumpPortalTrader:
         }
         # Total fees: 0.0013 SOL = 2.6% per trade (down from 5%)
 
+        # Live percentile from the fee oracle (in-memory) - fixed table until it has samples
+        if self.fee_oracle and self.fee_oracle.has_data():
+            from config import PUMPPORTAL_ASSUMED_CU
+            fee = round(self.fee_oracle.get_fee_sol(urgency, PUMPPORTAL_ASSUMED_CU), 6)
+            logger.debug(f"Priority fee ({urgency}, oracle): {fee:.6f} SOL")
+            return fee
+
         fee = urgency_fees.get(urgency, 0.0010)  # Default to buy fee
         logger.debug(f"Priority fee ({urgency}): {fee:.6f} SOL")
         return fee
@@ -113,7 +188,8 @@ class PumpPortalTrader:
         sol_amount: float,
         bonding_curve_key: str = None,
         slippage: int = 30,  # UPDATED: Tighter default (0.3%) since we validate liquidity
-        urgency: str = "buy"  # Default to buy priority (0.001 SOL)
+        urgency: str = "buy",  # Default to buy priority (0.001 SOL)
+        guard=None  # Optional TradeGuard - only send if no other path owns the trade
     ) -> Optional[str]:
         """Get a buy transaction from PumpPortal API with dynamic fees"""
         try:
@@ -140,161 +216,171 @@ class PumpPortalTrader:
             logger.info(f"Priority fee: {priority_fee:.6f} SOL ({urgency}), Slippage: {slippage} BPS")
             logger.debug(f"Using wallet: {wallet_pubkey}")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(self.api_url, json=payload) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"PumpPortal API error ({response.status}): {error_text}")
+            if not self.health.is_available(self.api_url):
+                logger.warning("⚠️ PumpPortal API circuit open - skipping request")
+                return None
+
+            request_start = time.time()
+            session = self._get_session()
+            async with session.post(self.api_url, json=payload) as response:
+                self.health.record(self.api_url, (time.time() - request_start) * 1000, response.status == 200)
+                if response.status != 200:
+                    error_text = await response.text()
+                    logger.error(f"PumpPortal API error ({response.status}): {error_text}")
+                    return None
+                
+                content_type = response.headers.get('content-type', '')
+                
+                # Read response based on content type
+                if 'application/json' in content_type:
+                    response_text = await response.text()
+                    try:
+                        data = json.loads(response_text)
+                        tx_base64 = data.get("transaction") or data.get("signedTransaction")
+                        if not tx_base64:
+                            logger.error("No transaction field in JSON response")
+                            return None
+                        raw_tx_bytes = base64.b64decode(tx_base64)
+                        logger.info(f"Decoded base64 transaction from JSON ({len(raw_tx_bytes)} bytes)")
+                    except Exception as e:
+                        logger.error(f"Failed to decode JSON response: {e}")
                         return None
+                elif 'application/octet-stream' in content_type:
+                    raw_tx_bytes = await response.read()
+                    logger.info(f"Received raw binary transaction ({len(raw_tx_bytes)} bytes)")
+                else:
+                    raw_tx_bytes = await response.read()
+                    logger.warning(f"Unknown content-type: {content_type}, treating as raw bytes")
+                
+            # Body is fully read - leave the pooled connection before signing / waiting on the guard
+            # Validate transaction size
+            if len(raw_tx_bytes) < 100:
+                logger.error(f"Transaction too small: {len(raw_tx_bytes)} bytes")
+                return None
+            
+            # Check if it's a v0 transaction (544 bytes or high bit set)
+            is_v0 = len(raw_tx_bytes) == 544 or (raw_tx_bytes[0] & 0x80) != 0
+            
+            if is_v0:
+                logger.info(f"V0 transaction detected - needs signing")
+                try:
+                    from solders.transaction import VersionedTransaction
                     
-                    content_type = response.headers.get('content-type', '')
+                    unsigned_tx = VersionedTransaction.from_bytes(raw_tx_bytes)
+                    message = unsigned_tx.message
+                    signed_tx = VersionedTransaction(message, [self.wallet.keypair])
+                    signed_tx_bytes = bytes(signed_tx)
                     
-                    # Read response based on content type
-                    if 'application/json' in content_type:
-                        response_text = await response.text()
-                        try:
-                            data = json.loads(response_text)
-                            tx_base64 = data.get("transaction") or data.get("signedTransaction")
-                            if not tx_base64:
-                                logger.error("No transaction field in JSON response")
-                                return None
-                            raw_tx_bytes = base64.b64decode(tx_base64)
-                            logger.info(f"Decoded base64 transaction from JSON ({len(raw_tx_bytes)} bytes)")
-                        except Exception as e:
-                            logger.error(f"Failed to decode JSON response: {e}")
-                            return None
-                    elif 'application/octet-stream' in content_type:
-                        raw_tx_bytes = await response.read()
-                        logger.info(f"Received raw binary transaction ({len(raw_tx_bytes)} bytes)")
-                    else:
-                        raw_tx_bytes = await response.read()
-                        logger.warning(f"Unknown content-type: {content_type}, treating as raw bytes")
+                    logger.info(f"Created signed v0 transaction ({len(signed_tx_bytes)} bytes)")
                     
-                    # Validate transaction size
-                    if len(raw_tx_bytes) < 100:
-                        logger.error(f"Transaction too small: {len(raw_tx_bytes)} bytes")
+                except Exception as e:
+                    logger.error(f"Failed to sign v0 transaction: {e}")
+                    return None
+            else:
+                # Legacy transaction - manual signing with overflow protection
+                logger.info("Legacy transaction - manual signing (robust varint parse + re-pack)")
+                try:
+                    b = raw_tx_bytes
+                    if len(b) < 2:
+                        logger.error(f"Legacy tx too small ({len(b)} bytes)")
                         return None
-                    
-                    # Check if it's a v0 transaction (544 bytes or high bit set)
-                    is_v0 = len(raw_tx_bytes) == 544 or (raw_tx_bytes[0] & 0x80) != 0
-                    
-                    if is_v0:
-                        logger.info(f"V0 transaction detected - needs signing")
-                        try:
-                            from solders.transaction import VersionedTransaction
-                            
-                            unsigned_tx = VersionedTransaction.from_bytes(raw_tx_bytes)
-                            message = unsigned_tx.message
-                            signed_tx = VersionedTransaction(message, [self.wallet.keypair])
-                            signed_tx_bytes = bytes(signed_tx)
-                            
-                            logger.info(f"Created signed v0 transaction ({len(signed_tx_bytes)} bytes)")
-                            
-                        except Exception as e:
-                            logger.error(f"Failed to sign v0 transaction: {e}")
+
+                    # Parse compact-u16 signature count with overflow protection
+                    idx = 0
+                    val = 0
+                    shift = 0
+                    while True:
+                        if idx >= len(b):
+                            logger.error("Bad legacy varint for sig_count")
+                            return None
+
+                        # Check shift BEFORE parsing to prevent overflow
+                        if shift > 14:
+                            logger.error(f"sig_count varint too long (shift={shift}, would overflow u16)")
                             return None
-                    else:
-                        # Legacy transaction - manual signing with overflow protection
-                        logger.info("Legacy transaction - manual signing (robust varint parse + re-pack)")
-                        try:
-                            b = raw_tx_bytes
-                            if len(b) < 2:
-                                logger.error(f"Legacy tx too small ({len(b)} bytes)")
-                                return None
-
-                            # Parse compact-u16 signature count with overflow protection
-                            idx = 0
-                            val = 0
-                            shift = 0
-                            while True:
-                                if idx >= len(b):
-                                    logger.error("Bad legacy varint for sig_count")
-                                    return None
-
-                                # Check shift BEFORE parsing to prevent overflow
-                                if shift > 14:
-                                    logger.error(f"sig_count varint too long (shift={shift}, would overflow u16)")
-                                    return None
-
-                                byte = b[idx]
-                                val |= (byte & 0x7F) << shift
-                                idx += 1
-
-                                # Check value BEFORE continuing to prevent overflow
-                                if val > 65535:
-                                    logger.error(f"sig_count varint value {val} exceeds u16 max (65535)")
-                                    return None
-
-                                if byte < 0x80:
-                                    break
-                                shift += 7
-
-                            sig_count = val
-
-                            # Additional validation
-                            if sig_count > 100:  # Sanity check
-                                logger.error(f"sig_count {sig_count} is suspiciously high, likely malformed")
-                                return None
-
-                            sig_section_end = idx + 64 * sig_count
-
-                            if sig_section_end > len(b):
-                                logger.error(f"Malformed legacy tx: sig_section_end {sig_section_end} > len {len(b)}")
-                                return None
-
-                            # Message is everything after signatures
-                            msg_bytes = b[sig_section_end:]
-                            if not msg_bytes:
-                                logger.error("Empty legacy message bytes")
-                                return None
-
-                            # Sign the message
-                            signature = self.wallet.keypair.sign_message(msg_bytes)
-
-                            # Repack: [sig_count=1] + [signature] + [message]
-                            signed_tx_bytes = bytes([0x01]) + bytes(signature) + msg_bytes
-
-                            logger.info(f"Signed legacy transaction (len={len(signed_tx_bytes)})")
-
-                        except Exception as e:
-                            logger.error(f"Failed to sign legacy transaction: {e}")
-                            import traceback
-                            logger.error(traceback.format_exc())
+
+                        byte = b[idx]
+                        val |= (byte & 0x7F) << shift
+                        idx += 1
+
+                        # Check value BEFORE continuing to prevent overflow
+                        if val > 65535:
+                            logger.error(f"sig_count varint value {val} exceeds u16 max (65535)")
                             return None
+
+                        if byte < 0x80:
+                            break
+                        shift += 7
+
+                    sig_count = val
+
+                    # Additional validation
+                    if sig_count > 100:  # Sanity check
+                        logger.error(f"sig_count {sig_count} is suspiciously high, likely malformed")
+                        return None
+
+                    sig_section_end = idx + 64 * sig_count
+
+                    if sig_section_end > len(b):
+                        logger.error(f"Malformed legacy tx: sig_section_end {sig_section_end} > len {len(b)}")
+                        return None
+
+                    # Message is everything after signatures
+                    msg_bytes = b[sig_section_end:]
+                    if not msg_bytes:
+                        logger.error("Empty legacy message bytes")
+                        return None
+
+                    # Sign the message
+                    signature = self.wallet.keypair.sign_message(msg_bytes)
+
+                    # Repack: [sig_count=1] + [signature] + [message]
+                    signed_tx_bytes = bytes([0x01]) + bytes(signature) + msg_bytes
+
+                    logger.info(f"Signed legacy transaction (len={len(signed_tx_bytes)})")
+
+                except Exception as e:
+                    logger.error(f"Failed to sign legacy transaction: {e}")
+                    import traceback
+                    logger.error(traceback.format_exc())
+                    return None
+            
+            if not await self._acquire_guard(guard, mint):
+                return None
+
+            logger.info(f"Sending transaction for {mint[:8]}...")
+            
+            # Send with retry logic
+            try:
+                opts = TxOpts(skip_preflight=True, preflight_commitment="processed")
+                sig = self._send_via_rpc(signed_tx_bytes, opts)
+                
+                if sig.startswith("1111111"):
+                    logger.warning("Transaction failed - received invalid signature")
+                    raise Exception("Invalid signature returned")
+                
+                self._track_landing(sig, "pumpportal", priority_fee, urgency, signed_tx_bytes)
+                logger.info(f"✅ Transaction sent successfully: {sig}")
+                return sig
+                
+            except Exception as e:
+                logger.warning(f"First send attempt failed: {e}")
+                
+                try:
+                    sig = self._send_via_rpc(raw_tx_bytes)
                     
-                    logger.info(f"Sending transaction for {mint[:8]}...")
+                    if sig.startswith("1111111"):
+                        logger.error("Transaction failed - received invalid signature on retry")
+                        return None
                     
-                    # Send with retry logic
-                    try:
-                        opts = TxOpts(skip_preflight=True, preflight_commitment="processed")
-                        response = self.client.send_raw_transaction(signed_tx_bytes, opts)
-                        sig = str(response.value)
-                        
-                        if sig.startswith("1111111"):
-                            logger.warning("Transaction failed - received invalid signature")
-                            raise Exception("Invalid signature returned")
-                        
-                        logger.info(f"✅ Transaction sent successfully: {sig}")
-                        return sig
-                        
-                    except Exception as e:
-                        logger.warning(f"First send attempt failed: {e}")
-                        
-                        try:
-                            response = self.client.send_raw_transaction(raw_tx_bytes)
-                            sig = str(response.value)
-                            
-                            if sig.startswith("1111111"):
-                                logger.error("Transaction failed - received invalid signature on retry")
-                                return None
-                            
-                            logger.info(f"✅ Transaction sent on retry: {sig}")
-                            return sig
-                            
-                        except Exception as e2:
-                            logger.error(f"Both send attempts failed: {e2}")
-                            return None
-                        
+                    self._track_landing(sig, "pumpportal", priority_fee, urgency, raw_tx_bytes)
+                    logger.info(f"✅ Transaction sent on retry: {sig}")
+                    return sig
+                    
+                except Exception as e2:
+                    logger.error(f"Both send attempts failed: {e2}")
+                    return None
+                
         except Exception as e:
             logger.error(f"Failed to create buy transaction: {e}")
             import traceback
@@ -308,7 +394,8 @@ class PumpPortalTrader:
         bonding_curve_key: str = None,
         slippage: int = 50,
         token_decimals: int = 6,
-        urgency: str = "sell"  # Default to sell priority (0.0015 SOL)
+        urgency: str = "sell",  # Default to sell priority (0.0015 SOL)
+        guard=None  # Optional TradeGuard - only send if no other path owns the trade
     ) -> Optional[str]:
         """Get a sell transaction from PumpPortal API with dynamic fees - expects UI token amounts"""
         try:
@@ -351,179 +438,190 @@ class PumpPortalTrader:
             
             logger.debug(f"Sell payload: {json.dumps(payload, indent=2)}")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(self.api_url, json=payload) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"PumpPortal API error ({response.status}): {error_text}")
-                        if response.status == 400:
-                            logger.error(f"Bad Request Details:")
-                            logger.error(f"  - UI amount sent: {ui_amount:.6f}")
-                            logger.error(f"  - Token decimals: {token_decimals}")
-                            logger.error(f"  - denominatedInSol: false (string)")
+            if not self.health.is_available(self.api_url):
+                logger.warning("⚠️ PumpPortal API circuit open - skipping request")
+                return None
+
+            request_start = time.time()
+            session = self._get_session()
+            async with session.post(self.api_url, json=payload) as response:
+                self.health.record(self.api_url, (time.time() - request_start) * 1000, response.status == 200)
+                if response.status != 200:
+                    error_text = await response.text()
+                    logger.error(f"PumpPortal API error ({response.status}): {error_text}")
+                    if response.status == 400:
+                        logger.error(f"Bad Request Details:")
+                        logger.error(f"  - UI amount sent: {ui_amount:.6f}")
+                        logger.error(f"  - Token decimals: {token_decimals}")
+                        logger.error(f"  - denominatedInSol: false (string)")
+                    return None
+                
+                content_type = response.headers.get('content-type', '')
+                
+                # Read response based on content type
+                if 'application/json' in content_type:
+                    response_text = await response.text()
+                    try:
+                        data = json.loads(response_text)
+                        tx_base64 = data.get("transaction") or data.get("signedTransaction")
+                        if not tx_base64:
+                            logger.error("No transaction field in JSON response")
+                            return None
+                        raw_tx_bytes = base64.b64decode(tx_base64)
+                        logger.info(f"Decoded base64 transaction from JSON ({len(raw_tx_bytes)} bytes)")
+                    except Exception as e:
+                        logger.error(f"Failed to decode JSON response: {e}")
                         return None
+                elif 'application/octet-stream' in content_type:
+                    raw_tx_bytes = await response.read()
+                    logger.info(f"Received raw binary transaction ({len(raw_tx_bytes)} bytes)")
+                else:
+                    raw_tx_bytes = await response.read()
+                    logger.warning(f"Unknown content-type: {content_type}, treating as raw bytes")
+                
+            # Body is fully read - leave the pooled connection before signing / waiting on the guard
+            # Validate transaction size
+            if len(raw_tx_bytes) < 100:
+                logger.error(f"Transaction too small: {len(raw_tx_bytes)} bytes")
+                return None
+            
+            # Check if it's a v0 transaction
+            is_v0 = len(raw_tx_bytes) == 544 or (raw_tx_bytes[0] & 0x80) != 0
+            
+            if is_v0:
+                logger.info(f"V0 transaction detected - needs signing")
+                try:
+                    from solders.transaction import VersionedTransaction
                     
-                    content_type = response.headers.get('content-type', '')
+                    unsigned_tx = VersionedTransaction.from_bytes(raw_tx_bytes)
+                    message = unsigned_tx.message
+                    signed_tx = VersionedTransaction(message, [self.wallet.keypair])
+                    signed_tx_bytes = bytes(signed_tx)
                     
-                    # Read response based on content type
-                    if 'application/json' in content_type:
-                        response_text = await response.text()
-                        try:
-                            data = json.loads(response_text)
-                            tx_base64 = data.get("transaction") or data.get("signedTransaction")
-                            if not tx_base64:
-                                logger.error("No transaction field in JSON response")
-                                return None
-                            raw_tx_bytes = base64.b64decode(tx_base64)
-                            logger.info(f"Decoded base64 transaction from JSON ({len(raw_tx_bytes)} bytes)")
-                        except Exception as e:
-                            logger.error(f"Failed to decode JSON response: {e}")
-                            return None
-                    elif 'application/octet-stream' in content_type:
-                        raw_tx_bytes = await response.read()
-                        logger.info(f"Received raw binary transaction ({len(raw_tx_bytes)} bytes)")
-                    else:
-                        raw_tx_bytes = await response.read()
-                        logger.warning(f"Unknown content-type: {content_type}, treating as raw bytes")
+                    logger.info(f"Created signed v0 transaction ({len(signed_tx_bytes)} bytes)")
                     
-                    # Validate transaction size
-                    if len(raw_tx_bytes) < 100:
-                        logger.error(f"Transaction too small: {len(raw_tx_bytes)} bytes")
+                except Exception as e:
+                    logger.error(f"Failed to sign v0 transaction: {e}")
+                    return None
+            else:
+                # Legacy transaction - manual signing with overflow protection
+                logger.info("Legacy transaction - manual signing (robust varint parse + re-pack)")
+                try:
+                    b = raw_tx_bytes
+                    if len(b) < 2:
+                        logger.error(f"Legacy tx too small ({len(b)} bytes)")
                         return None
-                    
-                    # Check if it's a v0 transaction
-                    is_v0 = len(raw_tx_bytes) == 544 or (raw_tx_bytes[0] & 0x80) != 0
-                    
-                    if is_v0:
-                        logger.info(f"V0 transaction detected - needs signing")
-                        try:
-                            from solders.transaction import VersionedTransaction
-                            
-                            unsigned_tx = VersionedTransaction.from_bytes(raw_tx_bytes)
-                            message = unsigned_tx.message
-                            signed_tx = VersionedTransaction(message, [self.wallet.keypair])
-                            signed_tx_bytes = bytes(signed_tx)
-                            
-                            logger.info(f"Created signed v0 transaction ({len(signed_tx_bytes)} bytes)")
-                            
-                        except Exception as e:
-                            logger.error(f"Failed to sign v0 transaction: {e}")
+
+                    # Parse compact-u16 signature count with overflow protection
+                    idx = 0
+                    val = 0
+                    shift = 0
+                    while True:
+                        if idx >= len(b):
+                            logger.error("Bad legacy varint for sig_count")
                             return None
-                    else:
-                        # Legacy transaction - manual signing with overflow protection
-                        logger.info("Legacy transaction - manual signing (robust varint parse + re-pack)")
-                        try:
-                            b = raw_tx_bytes
-                            if len(b) < 2:
-                                logger.error(f"Legacy tx too small ({len(b)} bytes)")
-                                return None
-
-                            # Parse compact-u16 signature count with overflow protection
-                            idx = 0
-                            val = 0
-                            shift = 0
-                            while True:
-                                if idx >= len(b):
-                                    logger.error("Bad legacy varint for sig_count")
-                                    return None
-
-                                # Check shift BEFORE parsing to prevent overflow
-                                if shift > 14:
-                                    logger.error(f"sig_count varint too long (shift={shift}, would overflow u16)")
-                                    return None
-
-                                byte = b[idx]
-                                val |= (byte & 0x7F) << shift
-                                idx += 1
-
-                                # Check value BEFORE continuing to prevent overflow
-                                if val > 65535:
-                                    logger.error(f"sig_count varint value {val} exceeds u16 max (65535)")
-                                    return None
-
-                                if byte < 0x80:
-                                    break
-                                shift += 7
-
-                            sig_count = val
-
-                            # Additional validation
-                            if sig_count > 100:  # Sanity check
-                                logger.error(f"sig_count {sig_count} is suspiciously high, likely malformed")
-                                return None
-
-                            sig_section_end = idx + 64 * sig_count
-
-                            if sig_section_end > len(b):
-                                logger.error(f"Malformed legacy tx: sig_section_end {sig_section_end} > len {len(b)}")
-                                return None
-
-                            # Message is everything after signatures
-                            msg_bytes = b[sig_section_end:]
-                            if not msg_bytes:
-                                logger.error("Empty legacy message bytes")
-                                return None
-
-                            # Sign the message
-                            signature = self.wallet.keypair.sign_message(msg_bytes)
-
-                            # Repack: [sig_count=1] + [signature] + [message]
-                            signed_tx_bytes = bytes([0x01]) + bytes(signature) + msg_bytes
-
-                            logger.info(f"Signed legacy transaction (len={len(signed_tx_bytes)})")
-
-                        except Exception as e:
-                            logger.error(f"Failed to sign legacy transaction: {e}")
-                            import traceback
-                            logger.error(traceback.format_exc())
+
+                        # Check shift BEFORE parsing to prevent overflow
+                        if shift > 14:
+                            logger.error(f"sig_count varint too long (shift={shift}, would overflow u16)")
                             return None
-                    
-                    logger.info(f"Sending sell transaction for {mint[:8]}...")
 
-                    # Send via Jito first (faster), fallback to regular RPC (must exit)
-                    from config import JITO_ENABLED
+                        byte = b[idx]
+                        val |= (byte & 0x7F) << shift
+                        idx += 1
 
-                    sig = None
-                    if JITO_ENABLED:
-                        sig = await self._send_via_jito(signed_tx_bytes)
-                        if sig:
-                            logger.info(f"✅ Sell TX via Jito: {sig}")
-                            return sig
-                        else:
-                            logger.warning(f"⚠️ Jito failed for sell - falling back to RPC")
+                        # Check value BEFORE continuing to prevent overflow
+                        if val > 65535:
+                            logger.error(f"sig_count varint value {val} exceeds u16 max (65535)")
+                            return None
 
-                    # Fallback to regular RPC (MUST exit position)
-                    try:
-                        opts = TxOpts(skip_preflight=True, preflight_commitment="processed")
-                        response = self.client.send_raw_transaction(signed_tx_bytes, opts)
-                        sig = str(response.value)
+                        if byte < 0x80:
+                            break
+                        shift += 7
 
-                        if sig.startswith("1111111"):
-                            logger.warning("Transaction failed - received invalid signature")
-                            raise Exception("Invalid signature returned")
+                    sig_count = val
 
-                        logger.info(f"✅ Sell transaction sent successfully: {sig}")
-                        return sig
+                    # Additional validation
+                    if sig_count > 100:  # Sanity check
+                        logger.error(f"sig_count {sig_count} is suspiciously high, likely malformed")
+                        return None
 
-                    except Exception as e:
-                        logger.warning(f"RPC send failed: {e}")
+                    sig_section_end = idx + 64 * sig_count
+
+                    if sig_section_end > len(b):
+                        logger.error(f"Malformed legacy tx: sig_section_end {sig_section_end} > len {len(b)}")
+                        return None
 
-                        # Try raw bytes as last resort
-                        try:
-                            response = self.client.send_raw_transaction(raw_tx_bytes)
-                            sig = str(response.value)
+                    # Message is everything after signatures
+                    msg_bytes = b[sig_section_end:]
+                    if not msg_bytes:
+                        logger.error("Empty legacy message bytes")
+                        return None
 
-                            if sig.startswith("1111111"):
-                                logger.error("Transaction failed - received invalid signature on retry")
-                                return None
+                    # Sign the message
+                    signature = self.wallet.keypair.sign_message(msg_bytes)
 
-                            logger.info(f"✅ Sell transaction sent on retry: {sig}")
-                            return sig
+                    # Repack: [sig_count=1] + [signature] + [message]
+                    signed_tx_bytes = bytes([0x01]) + bytes(signature) + msg_bytes
 
-                        except Exception as e2:
-                            logger.error(f"All send attempts failed: {e2}")
-                            return None
-                        
+                    logger.info(f"Signed legacy transaction (len={len(signed_tx_bytes)})")
+
+                except Exception as e:
+                    logger.error(f"Failed to sign legacy transaction: {e}")
+                    import traceback
+                    logger.error(traceback.format_exc())
+                    return None
+            
+            if not await self._acquire_guard(guard, mint):
+                return None
+
+            logger.info(f"Sending sell transaction for {mint[:8]}...")
+
+            # Send via Jito first (faster), fallback to regular RPC (must exit)
+            from config import JITO_ENABLED
+
+            sig = None
+            if JITO_ENABLED:
+                sig = await self._send_via_jito(signed_tx_bytes)
+                if sig:
+                    self._track_landing(sig, "pumpportal_jito", priority_fee, urgency, signed_tx_bytes)
+                    logger.info(f"✅ Sell TX via Jito: {sig}")
+                    return sig
+                else:
+                    logger.warning(f"⚠️ Jito failed for sell - falling back to RPC")
+
+            # Fallback to regular RPC (MUST exit position)
+            try:
+                opts = TxOpts(skip_preflight=True, preflight_commitment="processed")
+                sig = self._send_via_rpc(signed_tx_bytes, opts)
+
+                if sig.startswith("1111111"):
+                    logger.warning("Transaction failed - received invalid signature")
+                    raise Exception("Invalid signature returned")
+
+                self._track_landing(sig, "pumpportal", priority_fee, urgency, signed_tx_bytes)
+                logger.info(f"✅ Sell transaction sent successfully: {sig}")
+                return sig
+
+            except Exception as e:
+                logger.warning(f"RPC send failed: {e}")
+
+                # Try raw bytes as last resort
+                try:
+                    sig = self._send_via_rpc(raw_tx_bytes)
+
+                    if sig.startswith("1111111"):
+                        logger.error("Transaction failed - received invalid signature on retry")
+                        return None
+
+                    self._track_landing(sig, "pumpportal", priority_fee, urgency, raw_tx_bytes)
+                    logger.info(f"✅ Sell transaction sent on retry: {sig}")
+                    return sig
+
+                except Exception as e2:
+                    logger.error(f"All send attempts failed: {e2}")
+                    return None
+                
         except Exception as e:
             logger.error(f"Failed to create sell transaction: {e}")
             import traceback
@@ -0,0 +1,156 @@
+"""
+Rebroadcaster - Keep re-sending submitted TX bytes until they land or expire
+Leaders drop transactions under load; the same signed bytes go back out to the primary RPC
+and top Jito regions (paced per route by the submitter) until the signature is seen or its
+blockhash expires.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from signature_poller import SignatureStatusPoller
+
+logger = logging.getLogger(__name__)
+
+RECENT_RECORDS = 100  # Finished per-signature records kept for stats
+
+
+class Rebroadcaster:
+    """Per-signature resend loop driven by the shared status poller"""
+
+    def __init__(
+        self,
+        submitter,
+        poller: SignatureStatusPoller,
+        slot_source: Optional[Callable[[], Optional[int]]] = None
+    ):
+        self.submitter = submitter
+        self.poller = poller
+        self.slot_source = slot_source or (lambda: None)
+
+        self.active: Dict[str, dict] = {}
+        self.recent = deque(maxlen=RECENT_RECORDS)
+        self._tasks = set()
+
+        self.stats = {
+            'tracked': 0,
+            'landed': 0,
+            'expired': 0,
+            'rebroadcasts': 0,
+            'landed_after_rebroadcast': 0,
+            'time_to_land_total': 0.0,
+        }
+
+    def add(self, signature: str, tx_bytes: bytes, label: str = "tx", jito: bool = True, durable: bool = False):
+        """
+        Start rebroadcasting a submitted TX
+        jito=False keeps resends on RPC routes (TX carries no tip); durable TXs never expire
+        with the blockhash, so only REBROADCAST_MAX_SECONDS bounds them
+        """
+        from config import REBROADCAST_ENABLED
+
+        if not REBROADCAST_ENABLED or not signature or signature in self.active:
+            return
+        self.active[signature] = {
+            'signature': signature,
+            'label': label,
+            'tx_bytes': tx_bytes,
+            'jito': jito,
+            'durable': durable,
+            'submitted_at': time.time(),
+            'submit_slot': self.slot_source(),
+            'rebroadcasts': 0,
+        }
+        self.stats['tracked'] += 1
+
+        task = asyncio.create_task(self._follow(signature))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _expired(self, record: dict, now: float) -> bool:
+        from config import REBROADCAST_MAX_SECONDS, BLOCKHASH_VALID_SLOTS
+
+        if now - record['submitted_at'] > REBROADCAST_MAX_SECONDS:
+            return True
+        if record['durable'] or record['submit_slot'] is None:
+            return False
+        slot = self.slot_source()
+        return slot is not None and slot - record['submit_slot'] >= BLOCKHASH_VALID_SLOTS
+
+    async def _follow(self, signature: str):
+        from config import REBROADCAST_INTERVAL
+
+        record = self.active[signature]
+        try:
+            while True:
+                # Doubles as the resend cadence - returns early once the signature is seen
+                status = await self.poller.wait(signature, "seen", timeout=REBROADCAST_INTERVAL)
+                now = time.time()
+                if status is not None:
+                    self._finish(record, landed=True, now=now)
+                    return
+                if self._expired(record, now):
+                    self._finish(record, landed=False, now=now)
+                    return
+                if not await self.submitter.resend(record['tx_bytes'], jito=record['jito']):
+                    continue  # Every route paced or paused - try again next tick
+                record['rebroadcasts'] += 1
+                self.stats['rebroadcasts'] += 1
+        except asyncio.CancelledError:
+            self.active.pop(signature, None)
+            raise
+        except Exception as e:
+            logger.debug(f"Rebroadcast loop failed for {signature[:16]}: {e}")
+            self.active.pop(signature, None)
+
+    def _finish(self, record: dict, landed: bool, now: float):
+        self.active.pop(record['signature'], None)
+        summary = {
+            'signature': record['signature'],
+            'label': record['label'],
+            'rebroadcasts': record['rebroadcasts'],
+            'landed': landed,
+            'time_to_land_ms': (now - record['submitted_at']) * 1000 if landed else None,
+        }
+        self.recent.append(summary)
+
+        if landed:
+            self.stats['landed'] += 1
+            self.stats['time_to_land_total'] += now - record['submitted_at']
+            if record['rebroadcasts']:
+                self.stats['landed_after_rebroadcast'] += 1
+                logger.info(
+                    f"📡 {record['label']} {record['signature'][:16]}... landed after "
+                    f"{record['rebroadcasts']} rebroadcasts ({summary['time_to_land_ms']:.0f}ms)"
+                )
+        else:
+            self.stats['expired'] += 1
+            logger.warning(
+                f"📡 {record['label']} {record['signature'][:16]}... expired unseen after "
+                f"{record['rebroadcasts']} rebroadcasts"
+            )
+
+    def get_stats(self) -> dict:
+        s = self.stats
+        finished = s['landed'] + s['expired']
+        return {
+            'active': len(self.active),
+            'tracked': s['tracked'],
+            'landed': s['landed'],
+            'expired': s['expired'],
+            'rebroadcasts': s['rebroadcasts'],
+            'landed_after_rebroadcast': s['landed_after_rebroadcast'],
+            'avg_rebroadcasts': (s['rebroadcasts'] / finished) if finished else 0.0,
+            'avg_time_to_land_ms': (s['time_to_land_total'] * 1000 / s['landed']) if s['landed'] else 0.0,
+            'recent': list(self.recent)[-10:],
+        }
+
+    async def stop(self):
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
@@ -0,0 +1,167 @@
+"""
+Signature Status Poller - One batched getSignatureStatuses per tick for every outstanding TX
+Waiters (landing tracker, confirmation fallback, tier checks) share the same RPC call
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+LEVELS = {"seen": -1, "processed": 0, "confirmed": 1, "finalized": 2}
+MAX_SIGNATURES_PER_CALL = 256  # getSignatureStatuses limit
+
+
+class SignatureStatusPoller:
+    """Batches all watched signatures into getSignatureStatuses calls and fans results out"""
+
+    def __init__(self, rpc_client, interval: float = 0.5):
+        self.client = rpc_client
+        self.interval = interval
+
+        # signature -> [(level or None for one-shot lookup, future)]
+        self._waiters: Dict[str, List[tuple]] = defaultdict(list)
+        self._task = None
+
+        self.stats = {
+            'ticks': 0,
+            'rpc_calls': 0,
+            'statuses_checked': 0,
+            'resolved': 0,
+            'max_outstanding': 0,
+        }
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll_loop())
+
+    async def start(self):
+        self._ensure_running()
+
+    async def _poll_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self._waiters:
+                continue
+            try:
+                await self._poll_once()
+            except Exception as e:
+                logger.debug(f"Signature poll tick failed: {e}")
+
+    async def _fetch(self, signatures: List[str]) -> list:
+        from solders.signature import Signature
+
+        self.stats['rpc_calls'] += 1
+        response = await asyncio.to_thread(
+            self.client.get_signature_statuses,
+            [Signature.from_string(s) for s in signatures]
+        )
+        if response and response.value:
+            return list(response.value)
+        return [None] * len(signatures)
+
+    async def _poll_once(self):
+        signatures = list(self._waiters.keys())
+        self.stats['ticks'] += 1
+        self.stats['max_outstanding'] = max(self.stats['max_outstanding'], len(signatures))
+
+        chunks = [
+            signatures[i:i + MAX_SIGNATURES_PER_CALL]
+            for i in range(0, len(signatures), MAX_SIGNATURES_PER_CALL)
+        ]
+        results = await asyncio.gather(*(self._fetch(chunk) for chunk in chunks), return_exceptions=True)
+
+        for chunk, statuses in zip(chunks, results):
+            if isinstance(statuses, Exception):
+                logger.debug(f"getSignatureStatuses failed: {statuses}")
+                continue
+            self.stats['statuses_checked'] += len(chunk)
+            for signature, status in zip(chunk, statuses):
+                self._fan_out(signature, status)
+
+    @staticmethod
+    def _reached(status, level: str) -> bool:
+        if status is None:
+            return False
+        if status.err is not None or level == "seen":
+            return True
+        if status.confirmation_status is None:
+            return False
+        current = str(status.confirmation_status).split('.')[-1].lower()
+        return LEVELS.get(current, -1) >= LEVELS[level]
+
+    def _fan_out(self, signature: str, status):
+        waiters = self._waiters.get(signature)
+        if not waiters:
+            return
+        remaining = []
+        for level, future in waiters:
+            if future.done():
+                continue
+            # One-shot lookups resolve every tick; level waiters once reached (or failed)
+            if level is None or self._reached(status, level):
+                future.set_result(status)
+                self.stats['resolved'] += 1
+            else:
+                remaining.append((level, future))
+        if remaining:
+            self._waiters[signature] = remaining
+        else:
+            self._waiters.pop(signature, None)
+
+    def _remove(self, signature: str, future: asyncio.Future):
+        waiters = self._waiters.get(signature)
+        if not waiters:
+            return
+        waiters[:] = [w for w in waiters if w[1] is not future]
+        if not waiters:
+            self._waiters.pop(signature, None)
+
+    async def wait(self, signature: str, commitment: str = "confirmed", timeout: float = 30.0):
+        """
+        Status once the signature reaches commitment ("seen" = any status) or fails on-chain
+        Returns the solders TransactionStatus, or None on timeout
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[signature].append((commitment, future))
+        self._ensure_running()
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._remove(signature, future)
+
+    async def lookup(self, signature: str):
+        """Current status (or None if unknown) - rides along with the next batched tick"""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[signature].append((None, future))
+        self._ensure_running()
+        try:
+            return await asyncio.wait_for(future, timeout=self.interval + 10.0)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._remove(signature, future)
+
+    def get_stats(self) -> dict:
+        s = self.stats
+        return {
+            'outstanding': len(self._waiters),
+            'ticks': s['ticks'],
+            'rpc_calls': s['rpc_calls'],
+            'avg_batch': (s['statuses_checked'] / s['rpc_calls']) if s['rpc_calls'] else 0.0,
+            'resolved': s['resolved'],
+            'max_outstanding': s['max_outstanding'],
+        }
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
@@ -50,6 +50,9 @@ class TelegramBot:
             '/set_sl': self.cmd_set_stop_loss,
             '/set_tp': self.cmd_set_take_profit,
             '/perf': self.cmd_perf,
+            '/landing': self.cmd_landing,
+            '/alt': self.cmd_alt,
+            '/nonce': self.cmd_nonce,
             '/selftest': self.cmd_selftest,  # ADDED: Self-test command
         }
         
@@ -442,6 +445,9 @@ Max Curve: {MAX_BONDING_CURVE_SOL} SOL
 /pnl - P&L summary
 /config - Settings
 /perf - Performance metrics
+/landing - TX land rates by route/tip
+/alt - Lookup table status (/alt setup to create/extend)
+/nonce - Durable nonce pool (/nonce setup | /nonce rotate)
 /force_sell all - Close all
 /force_sell <code>&lt;mint&gt;</code> - Close one
 /set_sl <code>&lt;pct&gt;</code> - Set stop loss
@@ -479,6 +485,111 @@ Avg Execution: {stats['avg_execution_time_ms']:.1f}ms
         except Exception as e:
             await self.send_message(f"❌ Error getting performance: {e}")
     
+    async def cmd_landing(self, args):
+        """Land rate and slots-to-land per route, tip level and urgency"""
+        try:
+            if not hasattr(self.bot, 'landing'):
+                await self.send_message("Landing tracker not initialized")
+                return
+
+            stats = self.bot.landing.get_stats()
+            if not stats['buckets']:
+                await self.send_message("🎯 No submissions tracked yet")
+                return
+
+            lines = ["<b>🎯 LANDING RATES</b>", "━━━━━━━━━━━━━━━━━━━━━"]
+            for row in stats['buckets']:
+                lines.append(
+                    f"{row['route']} / {row['urgency']} @ {row['tip_sol']:.4f}: "
+                    f"{row['land_rate_percent']:.0f}% ({row['landed']}/{row['resolved']}), "
+                    f"{row['avg_slots_to_land']:.1f} slots"
+                )
+            lines.append(f"Pending: {stats['pending']}")
+            lines.append("━━━━━━━━━━━━━━━━━━━━━")
+            await self.send_message("\n".join(lines))
+
+        except Exception as e:
+            await self.send_message(f"❌ Error getting landing stats: {e}")
+    
+    async def cmd_alt(self, args):
+        """Address lookup table status, or create/extend it with /alt setup"""
+        try:
+            builder = getattr(self.bot, 'local_builder', None)
+            if builder is None:
+                await self.send_message("Local builder not initialized")
+                return
+            tables = builder.lookup_tables
+
+            if args and args[0].lower() == 'setup':
+                await self.send_message("📇 Creating/extending lookup table...")
+                summary = await tables.setup()
+                created = f"Created: <code>{summary['created']}</code>\n" if summary['created'] else ""
+                await self.send_message(
+                    f"✅ Lookup table ready\n{created}"
+                    f"Address: <code>{summary['address']}</code>\n"
+                    f"Added: {summary['extended']} | Total: {summary['addresses']}"
+                )
+                return
+
+            stats = tables.get_stats()
+            if not stats['address']:
+                await self.send_message("📇 No lookup table - /alt setup to create one")
+                return
+            await self.send_message(
+                f"<b>📇 LOOKUP TABLE</b>\n"
+                f"━━━━━━━━━━━━━━━━━━━━━\n"
+                f"Address: <code>{stats['address']}</code>\n"
+                f"Loaded: {'yes' if stats['loaded'] else 'no'} ({stats['addresses']} addresses, {stats['missing']} missing)\n"
+                f"v0 TXs: {stats['v0_built']} (avg {stats['avg_v0_bytes']:.0f}B)\n"
+                f"Legacy TXs: {stats['legacy_built']} (avg {stats['avg_legacy_bytes']:.0f}B)\n"
+                f"Compile failures: {stats['compile_failures']}"
+            )
+
+        except Exception as e:
+            await self.send_message(f"❌ Lookup table error: {e}")
+    
+    async def cmd_nonce(self, args):
+        """Durable nonce pool status, /nonce setup to create accounts, /nonce rotate to advance them"""
+        try:
+            builder = getattr(self.bot, 'local_builder', None)
+            if builder is None:
+                await self.send_message("Local builder not initialized")
+                return
+            nonces = builder.nonces
+
+            action = args[0].lower() if args else ''
+            if action == 'setup':
+                await self.send_message("🔐 Creating durable nonce accounts...")
+                summary = await nonces.setup()
+                await self.send_message(
+                    f"✅ Nonce pool ready\n"
+                    f"Created: {summary['created']} | Total: {summary['accounts']}\n"
+                    f"Rent: {summary['rent_sol']:.5f} SOL per account"
+                )
+                return
+            if action == 'rotate':
+                await self.send_message("🔐 Advancing idle nonces (invalidates their signed exits)...")
+                summary = await nonces.rotate()
+                await self.send_message(
+                    f"✅ Advanced {summary['advanced']} nonce accounts | Total: {summary['accounts']}"
+                )
+                return
+
+            stats = nonces.get_stats()
+            if not stats['accounts']:
+                await self.send_message("🔐 No durable nonce accounts - /nonce setup to create them")
+                return
+            await self.send_message(
+                f"<b>🔐 NONCE POOL</b>\n"
+                f"━━━━━━━━━━━━━━━━━━━━━\n"
+                f"Accounts: {stats['accounts']} ({stats['leased']} leased, {stats['free']} free, {stats['dirty']} dirty)\n"
+                f"Leases: {stats['leases']} (misses {stats['lease_misses']})\n"
+                f"Spent: {stats['spent']} | Advanced: {stats['advances']}"
+            )
+
+        except Exception as e:
+            await self.send_message(f"❌ Nonce pool error: {e}")
+    
     async def cmd_selftest(self, args):
         """Run self-test for decimals and sell payload"""
         try:
@@ -488,7 +599,8 @@ Avg Execution: {stats['avg_execution_time_ms']:.1f}ms
             test_mint = "7GCihgDB8fe6KNjn2MYtkzZcRjQy3t9GHdC8uHYmW2hr"  # Example POPCAT
             
             # Test decimals fetching
-            decimals, source = self.bot.wallet.get_token_decimals(test_mint)
+            decimals = await self.bot.wallet.get_token_decimals_async(test_mint)
+            source = self.bot.wallet.decimals.source(test_mint)
             
             test_results = f"""
 <b>🧪 SELF-TEST RESULTS</b>
@@ -0,0 +1,281 @@
+"""
+Fan-out Transaction Submitter - Send signed TX to Jito + RPC routes concurrently
+First acceptance wins; remaining routes keep delivering in background
+"""
+
+import asyncio
+import base64
+import logging
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from endpoint_health import EndpointHealthRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class FanoutSubmitter:
+    """Submit the same signed bytes to top-N Jito regions and all RPC endpoints at once"""
+
+    def __init__(
+        self,
+        jito_pool,
+        rpc_endpoints: Optional[List[str]] = None,
+        health: EndpointHealthRegistry = None
+    ):
+        from config import RPC_ENDPOINT, BACKUP_RPC_ENDPOINTS
+
+        self.jito_pool = jito_pool
+        self.health = health or jito_pool.health
+        if rpc_endpoints is None:
+            rpc_endpoints = [RPC_ENDPOINT] + list(BACKUP_RPC_ENDPOINTS)
+        self.rpc_endpoints = [ep for ep in rpc_endpoints if ep]
+        self._rpc_session = None
+
+        # Per-route acceptance stats
+        self.route_stats: Dict[str, dict] = {}
+
+        # signature -> attribution record (first accepting route + all accept latencies)
+        self.attribution: Dict[str, dict] = {}
+        self.MAX_ATTRIBUTION = 500
+
+        # Rebroadcast pacing: endpoint -> earliest next resend (per-route cap, 429 pause)
+        self._resend_next: Dict[str, float] = {}
+        self.resend_stats = {'sends': 0, 'throttled': 0, 'rate_limited': 0}
+
+    @staticmethod
+    def _route_name(kind: str, endpoint: str) -> str:
+        return f"{kind}:{endpoint.split('/')[2].split('?')[0]}"
+
+    def _stats_for(self, route: str) -> dict:
+        if route not in self.route_stats:
+            self.route_stats[route] = {
+                'sends': 0,
+                'accepted': 0,
+                'rejected': 0,
+                'accept_ms_total': 0.0,
+                'first_accepts': 0,
+                'landed_first': 0,
+            }
+        return self.route_stats[route]
+
+    def _top_jito_endpoints(self) -> List[str]:
+        """Top-N healthy Jito regions by health score"""
+        from config import JITO_ENDPOINTS, JITO_FANOUT_REGIONS
+
+        return self.health.rank(JITO_ENDPOINTS)[:JITO_FANOUT_REGIONS]
+
+    def _get_rpc_session(self) -> aiohttp.ClientSession:
+        if self._rpc_session is None or self._rpc_session.closed:
+            self._rpc_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=16, ttl_dns_cache=300),
+                headers={"Content-Type": "application/json"},
+            )
+        return self._rpc_session
+
+    async def _send_route(self, kind: str, endpoint: str, payload: dict, timeout: float) -> Optional[tuple]:
+        """Send to a single route - returns (signature, route, accept_ms) on acceptance"""
+        route = self._route_name(kind, endpoint)
+        stats = self._stats_for(route)
+        stats['sends'] += 1
+        start = time.perf_counter()
+
+        try:
+            if kind == 'jito':
+                result = await self.jito_pool.post(endpoint, payload, timeout=timeout)
+            else:
+                session = self._get_rpc_session()
+                async with session.post(
+                    endpoint,
+                    json=payload,
+                    timeout=aiohttp.ClientTimeout(total=timeout)
+                ) as response:
+                    result = await response.json(content_type=None)
+
+            if "result" in result and result["result"]:
+                accept_ms = (time.perf_counter() - start) * 1000
+                stats['accepted'] += 1
+                stats['accept_ms_total'] += accept_ms
+                self.health.record(endpoint, accept_ms, success=True)
+                return result["result"], route, accept_ms
+
+            stats['rejected'] += 1
+            self.health.record(endpoint, (time.perf_counter() - start) * 1000, success=False)
+            error = result.get("error", result)
+            logger.debug(f"{route} rejected: {error}")
+            return None
+
+        except Exception as e:
+            stats['rejected'] += 1
+            self.health.record(endpoint, (time.perf_counter() - start) * 1000, success=False)
+            logger.debug(f"{route} send failed: {e}")
+            return None
+
+    async def submit(self, signed_tx_bytes: bytes, label: str = "tx") -> Optional[str]:
+        """
+        Fan signed TX out to all routes concurrently
+        Returns the signature from the first route that accepts it
+        """
+        from config import JITO_ENABLED
+
+        tx_base64 = base64.b64encode(signed_tx_bytes).decode('utf-8')
+        payload = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "sendTransaction",
+            "params": [tx_base64, {"encoding": "base64", "skipPreflight": True, "maxRetries": 0}]
+        }
+
+        start = time.perf_counter()
+        tasks = []
+        if JITO_ENABLED:
+            for ep in self._top_jito_endpoints():
+                # Jito rejects the RPC-only options
+                jito_payload = dict(payload, params=[tx_base64, {"encoding": "base64"}])
+                timeout = self.health.timeout_for(ep, default=1.0, floor=0.3, ceiling=2.0)
+                tasks.append(asyncio.create_task(self._send_route('jito', ep, jito_payload, timeout)))
+        for ep in self.health.rank(self.rpc_endpoints):
+            timeout = self.health.timeout_for(ep, default=2.0, floor=0.5, ceiling=3.0)
+            tasks.append(asyncio.create_task(self._send_route('rpc', ep, payload, timeout)))
+
+        if not tasks:
+            return None
+
+        winner = None
+        pending = set(tasks)
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                if result and winner is None:
+                    winner = result
+
+        if winner is None:
+            logger.warning(f"⚠️ Fan-out {label}: all {len(tasks)} routes rejected")
+            return None
+
+        sig, route, accept_ms = winner
+        self._stats_for(route)['first_accepts'] += 1
+        self._record_attribution(sig, route, accept_ms, label)
+        total_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"🚀 Fan-out {label}: first accept {route} in {total_ms:.0f}ms ({len(tasks)} routes)")
+
+        # Let the slower routes finish delivering - just record their acceptances
+        if pending:
+            asyncio.create_task(self._collect_stragglers(sig, pending))
+
+        return sig
+
+    async def resend(self, signed_tx_bytes: bytes, jito: bool = True) -> int:
+        """
+        Re-send already accepted bytes (rebroadcast) - primary RPC + top Jito regions only
+        Each route takes at most one resend per REBROADCAST_ROUTE_INTERVAL across all TXs and
+        is paused for REBROADCAST_RATE_LIMIT_PAUSE after a 429. Other responses are ignored -
+        "already processed" rejections must not count against endpoint health
+        Returns the number of routes sent to
+        """
+        from config import JITO_ENABLED, REBROADCAST_ROUTE_INTERVAL
+
+        routes = []
+        if JITO_ENABLED and jito:
+            routes += [('jito', ep) for ep in self._top_jito_endpoints()]
+        if self.rpc_endpoints:
+            routes.append(('rpc', self.rpc_endpoints[0]))
+
+        now = time.time()
+        due = [(kind, ep) for kind, ep in routes if now >= self._resend_next.get(ep, 0)]
+        self.resend_stats['throttled'] += len(routes) - len(due)
+        if not due:
+            return 0
+        for _, ep in due:
+            self._resend_next[ep] = now + REBROADCAST_ROUTE_INTERVAL
+
+        tx_base64 = base64.b64encode(signed_tx_bytes).decode('utf-8')
+        await asyncio.gather(*(self._resend_route(kind, ep, tx_base64) for kind, ep in due), return_exceptions=True)
+        self.resend_stats['sends'] += len(due)
+        return len(due)
+
+    async def _resend_route(self, kind: str, endpoint: str, tx_base64: str):
+        from config import REBROADCAST_RATE_LIMIT_PAUSE
+
+        if kind == 'jito':
+            result = await self.jito_pool.post(
+                endpoint,
+                {"jsonrpc": "2.0", "id": 1, "method": "sendTransaction", "params": [tx_base64, {"encoding": "base64"}]},
+                timeout=1.0
+            )
+            error = result.get("error") if isinstance(result, dict) else None
+            rate_limited = isinstance(error, dict) and (
+                error.get("code") == 429 or "rate limit" in str(error.get("message", "")).lower()
+            )
+        else:
+            session = self._get_rpc_session()
+            async with session.post(
+                endpoint,
+                json={
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "sendTransaction",
+                    "params": [tx_base64, {"encoding": "base64", "skipPreflight": True, "maxRetries": 0}]
+                },
+                timeout=aiohttp.ClientTimeout(total=1.0)
+            ) as response:
+                rate_limited = response.status == 429
+
+        if rate_limited:
+            self._resend_next[endpoint] = time.time() + REBROADCAST_RATE_LIMIT_PAUSE
+            self.resend_stats['rate_limited'] += 1
+            logger.warning(
+                f"📡 {self._route_name(kind, endpoint)} rate limited rebroadcasts - "
+                f"pausing it for {REBROADCAST_RATE_LIMIT_PAUSE:.0f}s"
+            )
+
+    def _record_attribution(self, sig: str, route: str, accept_ms: float, label: str):
+        self.attribution[sig] = {
+            'label': label,
+            'first_route': route,
+            'accepts': {route: accept_ms},
+            'submitted_at': time.time(),
+            'landed': None,
+        }
+        if len(self.attribution) > self.MAX_ATTRIBUTION:
+            oldest = next(iter(self.attribution))
+            del self.attribution[oldest]
+
+    async def _collect_stragglers(self, sig: str, pending: set):
+        for task in asyncio.as_completed(pending):
+            try:
+                result = await task
+            except Exception:
+                continue
+            if result and sig in self.attribution:
+                _, route, accept_ms = result
+                self.attribution[sig]['accepts'][route] = accept_ms
+
+    def record_landed(self, sig: str, landed: bool = True):
+        """Attribute a landed signature to the route that accepted it first"""
+        record = self.attribution.get(sig)
+        if not record or record['landed'] is not None:
+            return
+        record['landed'] = landed
+        if landed:
+            self._stats_for(record['first_route'])['landed_first'] += 1
+
+    def get_stats(self) -> dict:
+        """Per-route acceptance latency and landing attribution"""
+        routes = {}
+        for route, s in self.route_stats.items():
+            routes[route] = {
+                'sends': s['sends'],
+                'accept_rate_percent': (s['accepted'] / s['sends'] * 100) if s['sends'] else 0.0,
+                'avg_accept_ms': (s['accept_ms_total'] / s['accepted']) if s['accepted'] else 0.0,
+                'first_accepts': s['first_accepts'],
+                'landed_first': s['landed_first'],
+            }
+        return {'routes': routes, 'tracked_signatures': len(self.attribution), 'resends': dict(self.resend_stats)}
+
+    async def close(self):
+        if self._rpc_session and not self._rpc_session.closed:
+            await self._rpc_session.close()
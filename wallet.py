@@ -1,5 +1,5 @@
 """
-Wallet Management - LATENCY OPTIMIZED: Cached decimals + async wrapper
+Wallet Management - LATENCY OPTIMIZED: Batched decimals resolver + token account index
 TOKEN-2022 SUPPORT ADDED: Now scans both TOKEN_PROGRAM_ID and TOKEN_2022_PROGRAM_ID
 FIXED: Proper ATA derivation for both token programs + transaction confirmation waits
 """
@@ -10,15 +10,13 @@ import logging
 import json
 import struct
 import time
-import asyncio
-from functools import lru_cache
 from typing import Optional, Dict, List, Tuple
 from solders.keypair import Keypair
 from solders.pubkey import Pubkey
 from solana.rpc.api import Client
-from solana.rpc.commitment import Confirmed
 from spl.token.instructions import get_associated_token_address
 
+from decimals_resolver import DecimalsResolver
 from config import (
     PRIVATE_KEY, RPC_ENDPOINT, TOKEN_PROGRAM_ID, TOKEN_2022_PROGRAM_ID,
     MIN_SOL_BALANCE, BUY_AMOUNT_SOL, MAX_POSITIONS
@@ -26,6 +24,8 @@ from config import (
 
 logger = logging.getLogger(__name__)
 
+MAX_ACCOUNTS_PER_CALL = 100  # getMultipleAccounts limit
+
 class WalletManager:
     """Manages wallet operations with deterministic verification"""
     
@@ -46,6 +46,15 @@ class WalletManager:
             # Track pre-trade balance for accurate P&L calculation
             self.last_balance_before_trade = None
 
+            # Streamed balances (BalanceStream) - reads fall back to RPC when stale
+            self.balance_stream = None
+
+            # mint -> {'account', 'program_id', 'decimals'} for our ATAs
+            self.token_index: Dict[str, dict] = {}
+
+            # Token decimals (CreateV2 fast path, batched RPC, persisted)
+            self.decimals = DecimalsResolver(self.client)
+
             # Verify wallet
             self._verify_wallet()
 
@@ -79,7 +88,11 @@ class WalletManager:
             raise
     
     def get_sol_balance(self) -> float:
-        """Get current SOL balance"""
+        """Get current SOL balance (streamed value when fresh, RPC otherwise)"""
+        if self.balance_stream:
+            streamed = self.balance_stream.sol_balance()
+            if streamed is not None:
+                return streamed
         try:
             response = self.client.get_balance(self.pubkey)
             return response.value / 1e9
@@ -87,106 +100,131 @@ class WalletManager:
             logger.error(f"Failed to get SOL balance: {e}")
             return 0.0
     
+    def _derive_ata(self, mint_pubkey: Pubkey, program_id: Pubkey) -> Pubkey:
+        """ATA for our wallet under the given token program (SPL or Token-2022)"""
+        if program_id == TOKEN_PROGRAM_ID:
+            return get_associated_token_address(self.pubkey, mint_pubkey)
+        from spl.token.constants import ASSOCIATED_TOKEN_PROGRAM_ID as ATA_PROGRAM
+        seeds = [bytes(self.pubkey), bytes(program_id), bytes(mint_pubkey)]
+        return Pubkey.find_program_address(seeds, ATA_PROGRAM)[0]
+
+    def register_token_account(self, mint: str, program_id: Pubkey = TOKEN_2022_PROGRAM_ID, decimals: int = 6):
+        """Index the ATA for a mint we are buying - no RPC (PumpFun CreateV2 mints are Token-2022)"""
+        if mint in self.token_index:
+            return self.token_index[mint]
+        entry = {
+            'account': self._derive_ata(Pubkey.from_string(mint), program_id),
+            'program_id': program_id,
+            'decimals': decimals,
+        }
+        self.token_index[mint] = entry
+        return entry
+
+    def get_token_balances_raw(self, mints: List[str], commitment=None) -> Dict[str, Tuple[int, int]]:
+        """
+        Raw balances for many mints in batched getMultipleAccounts calls
+        Indexed mints cost one account each; unindexed mints probe both SPL and Token-2022 ATAs
+        in the same batch and are indexed from whichever exists
+        Returns: {mint: (raw_amount, decimals)} - missing ATA = (0, decimals)
+        """
+        from solana.rpc.commitment import Processed
+
+        candidates = []  # (mint, account, program_id)
+        for mint in mints:
+            entry = self.token_index.get(mint)
+            if entry:
+                candidates.append((mint, entry['account'], entry['program_id']))
+            else:
+                mint_pubkey = Pubkey.from_string(mint)
+                for program_id in (TOKEN_PROGRAM_ID, TOKEN_2022_PROGRAM_ID):
+                    candidates.append((mint, self._derive_ata(mint_pubkey, program_id), program_id))
+
+        balances: Dict[str, Tuple[int, int]] = {}
+        found = []  # (mint, account, program_id, raw) in batch order
+        for i in range(0, len(candidates), MAX_ACCOUNTS_PER_CALL):
+            chunk = candidates[i:i + MAX_ACCOUNTS_PER_CALL]
+            response = self.client.get_multiple_accounts(
+                [account for _, account, _ in chunk],
+                commitment=commitment or Processed
+            )
+            for (mint, account, program_id), info in zip(chunk, response.value or []):
+                if info is None or len(bytes(info.data)) < 72:
+                    continue
+                found.append((mint, account, program_id, struct.unpack("<Q", bytes(info.data)[64:72])[0]))
+
+        new_mints = [mint for mint, _, _, _ in found if mint not in self.token_index]
+        decimals_by_mint = self.decimals.fetch_sync(new_mints) if new_mints else {}
+        for mint, account, program_id, raw in found:
+            if mint not in self.token_index:
+                self.token_index[mint] = {
+                    'account': account,
+                    'program_id': program_id,
+                    'decimals': decimals_by_mint.get(mint, 6),
+                }
+            balances[mint] = (raw, self.token_index[mint]['decimals'])
+
+        for mint in mints:
+            if mint not in balances:
+                entry = self.token_index.get(mint)
+                balances[mint] = (0, entry['decimals'] if entry else 6)
+        return balances
+
+    def get_token_balances(self, mints: List[str], commitment=None) -> Dict[str, float]:
+        """UI balances for many mints (e.g. every open position) in one batched read"""
+        raw = self.get_token_balances_raw(mints, commitment)
+        return {mint: amount / (10 ** decimals) for mint, (amount, decimals) in raw.items()}
+
     def _get_token_account_for_mint(self, mint: str, force_check: bool = False):
         """
-        Get the correct ATA for a mint, trying both SPL and Token-2022 programs
-        HELIUS OPTIMIZED: Uses 'processed' commitment for instant reads
-        Returns: (token_account_pubkey, program_id) or (None, None) if not found
+        Get the correct ATA for a mint (SPL or Token-2022) from the token index
+        Unindexed mints are resolved with one getMultipleAccounts covering both programs
+        Returns: (token_account_pubkey, program_id)
         
         Args:
             mint: Token mint address
-            force_check: If True, always check on-chain (no assumptions)
+            force_check: If True, re-resolve on-chain even if indexed
         """
-        mint_pubkey = Pubkey.from_string(mint)
-        
-        # HELIUS OPTIMIZATION: Use faster commitment for balance checks
-        from solana.rpc.commitment import Processed
-        
-        # Try classic SPL first (most common)
-        try:
-            ata_classic = get_associated_token_address(self.pubkey, mint_pubkey)
-            response = self.client.get_account_info(ata_classic, commitment=Processed)
-            if response.value:
-                logger.debug(f"✅ Found classic SPL ATA for {mint[:8]}...")
-                return ata_classic, TOKEN_PROGRAM_ID
-        except:
-            pass
-        
-        # Try Token-2022 (newer tokens)
+        if force_check:
+            self.token_index.pop(mint, None)
+
+        entry = self.token_index.get(mint)
+        if entry:
+            return entry['account'], entry['program_id']
+
         try:
-            # Token-2022 uses the same ATA derivation but different program ID
-            from spl.token.constants import ASSOCIATED_TOKEN_PROGRAM_ID as ATA_PROGRAM
-            
-            # Derive ATA for Token-2022
-            seeds = [
-                bytes(self.pubkey),
-                bytes(TOKEN_2022_PROGRAM_ID),
-                bytes(mint_pubkey)
-            ]
-            ata_2022 = Pubkey.find_program_address(seeds, ATA_PROGRAM)[0]
-            
-            response = self.client.get_account_info(ata_2022, commitment=Processed)
-            if response.value:
-                logger.debug(f"✅ Found Token-2022 ATA for {mint[:8]}...")
-                return ata_2022, TOKEN_2022_PROGRAM_ID
-        except:
-            pass
-        
+            self.get_token_balances_raw([mint])
+        except Exception as e:
+            logger.debug(f"ATA resolution failed for {mint[:8]}...: {e}")
+
+        entry = self.token_index.get(mint)
+        if entry:
+            return entry['account'], entry['program_id']
+
         # If neither exists, return classic SPL as default (will be created on first tx)
         logger.debug(f"⚠️ No existing ATA found for {mint[:8]}..., using classic SPL default")
-        return get_associated_token_address(self.pubkey, mint_pubkey), TOKEN_PROGRAM_ID
+        return get_associated_token_address(self.pubkey, Pubkey.from_string(mint)), TOKEN_PROGRAM_ID
     
     def get_token_balance(self, mint: str, max_retries: int = 3, retry_delay: float = 0.5) -> float:
         """
         Get balance for a specific token - returns UI amount (human readable)
-        HELIUS OPTIMIZED: Uses commitment levels for faster reads
         Strategy:
-        1. Try with 'processed' commitment (fastest, ~400ms)
-        2. Try with 'confirmed' commitment (fast, ~1-2s)
+        1. Streamed balance when fresh and non-zero (zero may just be lagging a buy)
+        2. Indexed ATA read via getMultipleAccounts at 'processed', retried
         3. Fall back to full wallet scan
         """
+        if self.balance_stream:
+            streamed = self.balance_stream.token_balance(mint)
+            if streamed:
+                return streamed
+
         for attempt in range(max_retries):
-            # Use faster commitment on early attempts
-            commitment = "processed" if attempt < 3 else Confirmed
-            
             try:
-                # Get the correct ATA (tries both SPL and Token-2022)
-                token_account, program_id = self._get_token_account_for_mint(mint)
-                
-                # HELIUS OPTIMIZATION: Use faster commitment levels
-                from solana.rpc.commitment import Processed
-                commitment_level = Processed if attempt < 3 else Confirmed
-                
-                response = self.client.get_token_account_balance(
-                    token_account,
-                    commitment=commitment_level
-                )
-                
-                if response.value:
-                    ui_amount = response.value.ui_amount
-                    if ui_amount and float(ui_amount) > 0:
-                        if attempt > 0:
-                            logger.info(f"✅ Got balance on retry {attempt + 1}: {float(ui_amount):,.2f} (commitment: {commitment_level})")
-                        return float(ui_amount)
-                    else:
-                        raw_amount = response.value.amount
-                        decimals = response.value.decimals
-                        if raw_amount and decimals:
-                            calculated = float(int(raw_amount) / (10 ** int(decimals)))
-                            if calculated > 0:
-                                if attempt > 0:
-                                    logger.info(f"✅ Calculated balance on retry {attempt + 1}: {calculated:,.2f}")
-                                return calculated
-                
-                # Every 2nd attempt after the first, try full wallet scan
-                if attempt > 0 and attempt % 2 == 0:
-                    logger.debug(f"🔄 Attempt {attempt + 1}: Trying full wallet scan...")
-                    all_accounts = self.get_all_token_accounts()
-                    if mint in all_accounts and all_accounts[mint]['balance'] > 0:
-                        balance = all_accounts[mint]['balance']
-                        logger.info(f"✅ Found via mid-retry scan: {balance:,.2f} tokens")
-                        return balance
-                
+                balance = self.get_token_balances([mint]).get(mint, 0.0)
+                if balance > 0:
+                    if attempt > 0:
+                        logger.info(f"✅ Got balance on retry {attempt + 1}: {balance:,.2f}")
+                    return balance
+
                 if attempt < max_retries - 1:
                     logger.debug(f"⏳ No balance yet (attempt {attempt + 1}/{max_retries}), waiting {retry_delay}s...")
                     time.sleep(retry_delay)
@@ -217,17 +255,13 @@ class WalletManager:
     
     def get_token_balance_raw(self, mint: str) -> int:
         """Get RAW balance for a specific token (for selling to PumpPortal)"""
+        if self.balance_stream:
+            streamed = self.balance_stream.token_balance(mint)
+            if streamed:
+                return self.balance_stream.tokens[mint]['raw']
         try:
-            # Get the correct ATA (tries both SPL and Token-2022)
-            token_account, program_id = self._get_token_account_for_mint(mint)
-            
-            response = self.client.get_token_account_balance(token_account)
-            if response.value:
-                raw_amount = response.value.amount
-                if raw_amount:
-                    return int(raw_amount)
-                return 0
-            return 0
+            raw_amount, _ = self.get_token_balances_raw([mint])[mint]
+            return raw_amount
             
         except Exception as e:
             logger.debug(f"No balance for token {mint[:8]}...")
@@ -289,6 +323,7 @@ class WalletManager:
 
             # 2. Base64 fallback (if jsonParsed fails completely)
             logger.debug("⏳ Falling back to base64 parsing...")
+            raw_accounts = []  # (mint, raw_amount, account pubkey, program id)
             for pid in program_ids:
                 try:
                     response = self.client.get_token_accounts_by_owner(
@@ -316,18 +351,7 @@ class WalletManager:
 
                                 mint = str(Pubkey(mint_bytes))
                                 raw_amount = struct.unpack("<Q", amount_bytes)[0]
-                                decimals = self.get_token_decimals(mint)
-                                ui_amount = raw_amount / (10 ** decimals)
-
-                                # Only add if balance > 0 OR if we don't have it yet
-                                if mint not in token_accounts or ui_amount > 0:
-                                    token_accounts[mint] = {
-                                        "pubkey": str(account.pubkey),
-                                        "balance": float(ui_amount),
-                                        "decimals": decimals,
-                                        "raw_amount": str(raw_amount),
-                                        "program_id": str(pid)
-                                    }
+                                raw_accounts.append((mint, raw_amount, str(account.pubkey), str(pid)))
                             except Exception as e:
                                 logger.debug(f"Failed to parse base64 account: {e}")
                                 continue
@@ -335,6 +359,22 @@ class WalletManager:
                     logger.debug(f"Base64 query failed for {str(pid)[:8]}...: {e}")
                     continue
 
+            # Decimals for every mint in one batched lookup
+            decimals_by_mint = self.decimals.fetch_sync(m for m, _, _, _ in raw_accounts)
+            for mint, raw_amount, pubkey, pid in raw_accounts:
+                decimals = decimals_by_mint.get(mint, 6)
+                ui_amount = raw_amount / (10 ** decimals)
+
+                # Only add if balance > 0 OR if we don't have it yet
+                if mint not in token_accounts or ui_amount > 0:
+                    token_accounts[mint] = {
+                        "pubkey": pubkey,
+                        "balance": float(ui_amount),
+                        "decimals": decimals,
+                        "raw_amount": str(raw_amount),
+                        "program_id": pid
+                    }
+
             if token_accounts:
                 logger.debug(f"✅ Found {len(token_accounts)} token accounts via base64 fallback")
             else:
@@ -409,74 +449,16 @@ class WalletManager:
                 'is_profit': False
             }
     
-    @lru_cache(maxsize=4096)
     def get_token_decimals(self, mint: str) -> int:
         """
-        LATENCY OPTIMIZED: Cached token decimals (saves 0.1-0.2s per call)
-        Get the decimals for a specific token mint.
-        Returns: decimals (int)
+        Decimals for a mint (sync) - cache / CreateV2 hit is free, a miss is one batched lookup
+        Prefer get_token_decimals_async (or decimals.get + prefetch) on latency-sensitive paths
         """
-        try:
-            mint_pubkey = Pubkey.from_string(mint)
-            
-            response = self.client.get_account_info(mint_pubkey)
-            if response.value and response.value.data:
-                mint_data = response.value.data
-                
-                if isinstance(mint_data, str):
-                    try:
-                        mint_bytes = base64.b64decode(mint_data)
-                    except:
-                        logger.warning(f"Failed to decode base64 data for {mint[:8]}...")
-                        logger.debug(f"Token {mint[:8]}... defaulting to 6 decimals (source: fallback)")
-                        return 6
-                elif isinstance(mint_data, bytes):
-                    mint_bytes = mint_data
-                elif isinstance(mint_data, list) and len(mint_data) == 2:
-                    if mint_data[1] == 'base64':
-                        mint_bytes = base64.b64decode(mint_data[0])
-                    else:
-                        logger.warning(f"Unknown encoding: {mint_data[1]}")
-                        logger.debug(f"Token {mint[:8]}... defaulting to 6 decimals (source: fallback)")
-                        return 6
-                elif isinstance(mint_data, dict) and 'parsed' in mint_data:
-                    parsed_info = mint_data.get('parsed', {}).get('info', {})
-                    decimals = parsed_info.get('decimals', 6)
-                    logger.info(f"Token {mint[:8]}... has {decimals} decimals (source: parsed)")
-                    return decimals
-                else:
-                    logger.warning(f"Unknown data format for {mint[:8]}...")
-                    logger.debug(f"Token {mint[:8]}... defaulting to 6 decimals (source: fallback)")
-                    return 6
-                
-                if len(mint_bytes) > 44:
-                    decimals = mint_bytes[44]
-                    
-                    if decimals > 12:
-                        logger.warning(f"Suspicious decimals value {decimals} for {mint[:8]}..., using fallback")
-                        logger.debug(f"Token {mint[:8]}... defaulting to 6 decimals (source: fallback)")
-                        return 6
-                    
-                    logger.info(f"Token {mint[:8]}... has {decimals} decimals (source: onchain)")
-                    return decimals
-                else:
-                    logger.warning(f"Mint data too short ({len(mint_bytes)} bytes) for {mint[:8]}...")
-                    logger.debug(f"Token {mint[:8]}... defaulting to 6 decimals (source: fallback)")
-                    return 6
-            
-            logger.debug(f"Could not fetch decimals for {mint[:8]}..., defaulting to 6 (source: fallback)")
-            return 6
-            
-        except Exception as e:
-            logger.debug(f"Failed to get token decimals: {e}, defaulting to 6 (source: fallback)")
-            return 6
+        return self.decimals.fetch_sync([mint]).get(mint, 6)
     
     async def get_token_decimals_async(self, mint: str) -> int:
-        """
-        LATENCY OPTIMIZED: Async wrapper for get_token_decimals
-        Allows parallel execution with other async operations
-        """
-        return await asyncio.to_thread(self.get_token_decimals, mint)
+        """Decimals for a mint - concurrent misses share one getMultipleAccounts call"""
+        return await self.decimals.resolve(mint)
     
     def log_wallet_status(self):
         """Log current wallet status"""